@@ -0,0 +1,296 @@
+"""Benchmarks of the engines computing generations.
+
+Every case runs a simulation for a number of generations (or until a time limit is reached) and
+measures its throughput, in generations and cells per second. Cases cover engines, grid sizes,
+initial densities of random grids, structures of the catalog and numbers of jobs. Two benchmarks
+are run:
+
+- ``kernel``: ``update_positions`` and ``update_grid`` called directly, in a single process;
+- ``generate``: the whole ``_generate_grid`` loop used by the ``show`` and ``run`` commands.
+
+The time needed to import the app in a new interpreter (``import``) is measured too, since it is
+paid every time the ``conway`` command is launched.
+
+Results are stored in a JSON file. Given the results of a previous version with ``--compare``, the
+throughput of every case is compared, and the script fails if one of them regressed.
+
+Usage::
+
+    python scripts/benchmark.py --size 50 --size 1000 --engine numpy --engine bitpacked --jobs 1
+    python scripts/benchmark.py --output new.json --compare old.json
+"""
+
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterator, Optional
+
+import numpy as np
+import typer
+
+import conway
+from conway.cli import _generate_grid
+from conway.engine.engine import Engine
+from conway.grid.cell import find_living_cells
+from conway.grid.grid import Grid, GridInitialization, update_grid, update_positions
+
+_JOBS_ENGINES = {Engine.SETS, Engine.SHARED}
+_CASE_KEYS = ("benchmark", "engine", "grid_size", "initialization", "density", "jobs")
+
+
+def _random_grid(grid_size: int, density: float, seed: int) -> np.ndarray:
+    """Creates a random grid.
+
+    :param grid_size: size of the grid.
+    :param density: probability of every cell to be alive.
+    :param seed: seed of the random generator.
+    :returns: grid array.
+    """
+    rng = np.random.default_rng(seed)
+    return (rng.random((grid_size, grid_size)) < density).astype(np.int64)
+
+
+def _grids(
+    grid_sizes: list[int], densities: list[float], structures: list[str], seed: int
+) -> Iterator[tuple[int, str, Optional[float], np.ndarray]]:
+    """Yields the initial grids of the cases.
+
+    :param grid_sizes: sizes of the grids.
+    :param densities: densities of the random grids.
+    :param structures: structures of the catalog put in the middle of the grids.
+    :param seed: seed of the random grids.
+    :yield: grid size, initialization, density (None for structures) and grid array.
+    """
+    for grid_size in grid_sizes:
+        for density in densities:
+            yield grid_size, GridInitialization.RANDOM.value, density, _random_grid(
+                grid_size, density, seed
+            )
+        for structure in structures:
+            yield grid_size, structure, None, Grid(grid_size).grid_init(structure)
+
+
+def _time_kernel(array: np.ndarray, generations: int, max_seconds: float) -> tuple[int, float]:
+    """Times ``update_positions`` and ``update_grid``.
+
+    :param array: initial grid array, updated in place.
+    :param generations: number of generations to compute.
+    :param max_seconds: time after which no generation is started anymore.
+    :returns: number of generations computed and time spent.
+    """
+    living_cells = find_living_cells(array)
+    computed = 0
+    start = time.perf_counter()
+    while computed < generations and time.perf_counter() - start < max_seconds:
+        living_cells, prev_living_cells = update_positions(array, living_cells, living_cells.copy())
+        array = update_grid(array, living_cells, prev_living_cells)
+        computed += 1
+    return computed, time.perf_counter() - start
+
+
+def _time_generate(
+    array: np.ndarray, engine: Engine, jobs: int, generations: int, max_seconds: float
+) -> tuple[int, float]:
+    """Times the ``_generate_grid`` loop. The first frame (initial grid) isn't timed, so that the
+    start of the workers isn't either.
+
+    :param array: initial grid array, updated in place.
+    :param engine: engine computing the generations.
+    :param jobs: number of workers (jobs).
+    :param generations: number of generations to compute.
+    :param max_seconds: time after which no generation is started anymore.
+    :returns: number of generations computed and time spent.
+    """
+    frames = _generate_grid(array, jobs, engine)
+    try:
+        next(frames, None)
+        computed = 0
+        start = time.perf_counter()
+        for _ in frames:
+            computed += 1
+            if computed >= generations or time.perf_counter() - start >= max_seconds:
+                break
+        return computed, time.perf_counter() - start
+    finally:
+        close = getattr(frames, "close", None)
+        if close is not None:
+            close()
+
+
+def _time_import() -> float:
+    """Times the import of the app (and of its command line interface) in a new interpreter.
+
+    :returns: time spent importing, in seconds.
+    """
+    code = (
+        "import time; start = time.perf_counter(); import conway.cli; "
+        "print(time.perf_counter() - start)"
+    )
+    process = subprocess.run(
+        [sys.executable, "-c", code], check=True, capture_output=True, text=True
+    )
+    return float(process.stdout)
+
+
+def _result(case: dict, array: np.ndarray, timings: list[tuple[int, float]]) -> dict[str, object]:
+    """Gets the result of a case from its best repetition.
+
+    :param case: description of the case.
+    :param array: initial grid array.
+    :param timings: number of generations computed and time spent by every repetition.
+    :returns: result of the case.
+    """
+    computed, seconds = max(timings, key=lambda timing: timing[0] / max(timing[1], 1e-9))
+    generations_per_second = computed / max(seconds, 1e-9)
+    return {
+        **case,
+        "living_cells": int(np.count_nonzero(array)),
+        "generations": computed,
+        "seconds": seconds,
+        "generations_per_second": generations_per_second,
+        "cells_per_second": generations_per_second * array.size,
+    }
+
+
+def _throughput(result: dict) -> float:
+    """Gets the throughput of a case.
+
+    :param result: result of a case.
+    :returns: generations per second, or imports per second for the import case.
+    """
+    if result["benchmark"] == "import":
+        return 1 / max(result["seconds"], 1e-9)
+    return result["generations_per_second"]
+
+
+def _key(result: dict) -> tuple:
+    """Gets the key identifying the case of a result.
+
+    :param result: result of a case.
+    :returns: key of the case.
+    """
+    return tuple(result[key] for key in _CASE_KEYS)
+
+
+def _compare(results: list[dict], baseline: Path, tolerance: float) -> bool:
+    """Compares results with the ones of a previous run.
+
+    :param results: results of the cases.
+    :param baseline: file of the results of a previous run.
+    :param tolerance: relative loss of throughput above which a case regressed.
+    :returns: whether no case regressed.
+    """
+    previous = {_key(result): result for result in json.loads(baseline.read_text())["results"]}
+    success = True
+    for result in results:
+        old = previous.get(_key(result))
+        if old is None or not _throughput(old):
+            continue
+        ratio = _throughput(result) / _throughput(old)
+        regressed = ratio < 1 - tolerance
+        success &= not regressed
+        typer.echo(
+            f"{'REGRESSION ' if regressed else ''}{' '.join(map(str, _key(result)))}: "
+            f"{ratio:.2f}x"
+        )
+    return success
+
+
+def main(  # pylint: disable=too-many-arguments,too-many-locals
+    size: list[int] = typer.Option([50, 200, 1000, 4000], help="Size of the grids."),
+    density: list[float] = typer.Option([0.2], help="Densities of the random grids."),
+    structure: list[str] = typer.Option([], help="Structures of the catalog to benchmark."),
+    engine: list[Engine] = typer.Option(
+        [engine for engine in Engine if engine != Engine.AUTO], help="Engines to benchmark."
+    ),
+    jobs: list[int] = typer.Option([1, 2, 4, 8], help="Numbers of jobs (sets and shared engines)."),
+    generations: int = typer.Option(100, help="Number of generations of every case."),
+    max_seconds: float = typer.Option(10.0, help="Maximum duration of a repetition of a case."),
+    repeat: int = typer.Option(3, help="Number of repetitions of every case (best is kept)."),
+    kernel: bool = typer.Option(True, help="Also benchmark update_positions and update_grid."),
+    import_time: bool = typer.Option(True, help="Also benchmark the import of the app."),
+    seed: int = typer.Option(0, help="Seed of the random grids."),
+    output: Path = typer.Option(Path("benchmark.json"), help="File of the results."),
+    compare: Optional[Path] = typer.Option(None, help="File of the results to compare with."),
+    tolerance: float = typer.Option(0.1, help="Relative loss of throughput of a regression."),
+) -> None:
+    """Runs the benchmarks and stores their results."""
+    jobs = [job for job in jobs if job <= (os.cpu_count() or 1)] or [1]
+    results = []
+    if import_time:
+        seconds = min(_time_import() for _ in range(repeat))
+        results.append(
+            {
+                **dict.fromkeys(_CASE_KEYS),
+                "benchmark": "import",
+                "seconds": seconds,
+            }
+        )
+        typer.echo(f"{'import':8} {seconds * 1000:.1f}ms")
+
+    for grid_size, initialization, grid_density, array in _grids(size, density, structure, seed):
+        case = {
+            "grid_size": grid_size,
+            "initialization": initialization,
+            "density": grid_density,
+        }
+        cases = [("kernel", None, 1)] if kernel else []
+        for case_engine in engine:
+            cases_jobs = jobs if case_engine in _JOBS_ENGINES else jobs[:1]
+            cases.extend(("generate", case_engine, job) for job in cases_jobs)
+
+        for benchmark, case_engine, job in cases:
+            timings = []
+            for _ in range(repeat):
+                grid_array = array.copy()
+                if case_engine is None:
+                    timings.append(_time_kernel(grid_array, generations, max_seconds))
+                else:
+                    timings.append(
+                        _time_generate(grid_array, case_engine, job, generations, max_seconds)
+                    )
+            result = _result(
+                {
+                    "benchmark": benchmark,
+                    "engine": None if case_engine is None else case_engine.value,
+                    **case,
+                    "jobs": job,
+                },
+                array,
+                timings,
+            )
+            results.append(result)
+            typer.echo(
+                f"{benchmark:8} {result['engine'] or '-':10} size={grid_size:<5} "
+                f"init={initialization:<15} density={grid_density} jobs={job}: "
+                f"{result['generations_per_second']:10.1f} generations/s "
+                f"{result['cells_per_second']:10.4g} cells/s"
+            )
+
+    output.write_text(
+        json.dumps(
+            {
+                "version": conway.__version__,
+                "date": datetime.now(timezone.utc).isoformat(),
+                "python": platform.python_version(),
+                "numpy": np.__version__,
+                "platform": platform.platform(),
+                "cpu_count": os.cpu_count(),
+                "results": results,
+            },
+            indent=2,
+        )
+    )
+    typer.echo(f"Results written to {output}")
+
+    if compare is not None and not _compare(results, compare, tolerance):
+        raise typer.Exit(code=1)
+
+
+if __name__ == "__main__":
+    typer.run(main)
@@ -1,10 +1,10 @@
 """App entry point."""
 
-from .cli import run
-
 
 def main() -> None:
-    """App entry point."""
+    """App entry point. The app is only imported when run, so that importing this module is fast."""
+    from .cli import run  # pylint: disable=import-outside-toplevel
+
     run()
 
 
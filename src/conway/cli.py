@@ -1,107 +1,426 @@
-"""This module contains the core of the app."""
+"""This module contains the core of the app.
 
-import random
-from multiprocessing import Pool, cpu_count
-from typing import Generator
+Modules that are slow to import (matplotlib, multiprocessing, asyncio, the engines, ...) are only
+imported by the commands that need them, so that starting the app (e.g. ``conway --help``) stays
+fast. Besides the commands showing, running and exporting a simulation, defined here, the commands
+are defined in ``conway.commands``.
+"""
+
+# pylint: disable=import-outside-toplevel
+
+import itertools
+import math
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Generator, Optional
 
 import numpy as np
 import typer
-from matplotlib import pyplot as plt, animation
 
-from .grid.cell import find_living_cells
-from .grid.grid import Grid, GridInitialization, update_grid, update_positions
+from .commands.distributed import distributed, worker
+from .commands.ensemble import ensemble
+from .commands.generation import generate_grid, report_cycle
+from .commands.mapped import mapped
+from .commands.options import (
+    ENGINE_OPTION,
+    GRID_SIZE_OPTION,
+    INITIALIZATION_OPTION,
+    JOBS_OPTION,
+    PATTERN_OPTION,
+    RULE_OPTION,
+    STATS_OPTION,
+    STATS_OUTPUT_OPTION,
+    TILE_SIZE_OPTION,
+    check_jobs,
+    create_grid,
+    monitoring,
+    profiling,
+)
+from .commands.streaming import serve, watch
+from .engine.cycle import CycleDetector
+from .engine.engine import Engine
+from .engine.rule import CONWAY, Rule, parse_rule
+from .engine.statistics import Statistics, StatisticsTracker
+from .grid.grid import GridInitialization
+from .profiling.profiler import Profiler
+from .storage.export import ExportFormat
+from .storage.recording import RecordingWriter
 
+if TYPE_CHECKING:
+    from .storage.checkpoint import Checkpoint
 
-def _create_subsets(main_set: set[tuple], nb_subsets: int) -> list[set[tuple]]:
-    """Creates ``nb_subsets`` subsets from ``main_set``.
 
-    :param main_set: sets to create subsets from.
-    :param nb_subsets: number of subsets to create.
-    :return: list of subsets.
+def conway(  # pylint: disable=too-many-arguments,too-many-locals
+    grid_size: int = GRID_SIZE_OPTION,
+    initialization: GridInitialization = INITIALIZATION_OPTION,
+    pattern: Optional[list[str]] = PATTERN_OPTION,
+    jobs: str = JOBS_OPTION,
+    fps: float = typer.Option(1, help="Number of frames per second."),
+    engine: Engine = ENGINE_OPTION,
+    rule: str = RULE_OPTION,
+    step: int = typer.Option(1, help="Number of generations between two frames."),
+    tile_size: Optional[int] = TILE_SIZE_OPTION,
+    detect_cycles: bool = typer.Option(
+        False, help="Stop the animation when the grid becomes stable or starts oscillating."
+    ),
+    drop_frames: bool = typer.Option(
+        False,
+        help="Compute generations as fast as possible and only display the latest one at each "
+        "frame, instead of displaying every generation.",
+    ),
+    stats: bool = STATS_OPTION,
+    stats_output: Optional[Path] = STATS_OUTPUT_OPTION,
+) -> None:
+    """Creates a grid and initializes it with a structure (or with random cells). Animates the grid
+    according to Conway's rules.
+
+    :param grid_size: size of the grid to create.
+    :param initialization: type of initialization (random or a specific structure).
+    :param pattern: pattern files drawn on an empty grid instead of the initialization.
+    :param jobs: number of workers (jobs) to use.
+    :param fps: number of frames per second.
+    :param engine: engine used to compute generations.
+    :param rule: Life-like rule.
+    :param step: number of generations between two frames.
+    :param tile_size: size of the tiles used to skip quiescent regions.
+    :param detect_cycles: whether to stop when the grid enters a cycle.
+    :param drop_frames: whether to drop the generations computed between two frames.
+    :param stats: whether to print statistics about the computation of the generations.
+    :param stats_output: file to write the statistics of every generation into.
     """
-    subsets: list[set[tuple]] = []
-    subset_size = len(main_set) // nb_subsets
-    for _ in range(nb_subsets - 1):
-        subset: set[tuple] = set(random.sample(main_set, subset_size))
-        main_set -= subset
-        subsets.append(subset)
-    subsets.append(main_set)
-    return subsets
+    from .display.renderer import FrameProducer, Renderer
+
+    nb_jobs = check_jobs(jobs)
 
+    grid_array: np.ndarray = create_grid(grid_size, initialization, pattern)
 
-def _generate_grid(
+    cycle_detector = CycleDetector(grid_array.shape) if detect_cycles else None
+    with profiling(stats, stats_output) as profiler:
+        generator = generate_grid(
+            grid_array=grid_array,
+            jobs=nb_jobs,
+            engine=engine,
+            step=step,
+            tile_size=tile_size,
+            cycle_detector=cycle_detector,
+            profiler=profiler,
+            rule=parse_rule(rule),
+        )
+        if cycle_detector is not None:
+            generator = report_cycle(generator, cycle_detector)
+        Renderer(FrameProducer(generator, drop_frames=drop_frames), fps, profiler).show()
+
+
+def _run_generations(  # pylint: disable=too-many-arguments,too-many-locals
     grid_array: np.ndarray,
-    jobs: int,
-) -> Generator[np.ndarray, None, None]:
-    """Yields a new grid accordingly to Conway's rules.
+    generations: int,
+    jobs: Optional[int],
+    engine: Engine = Engine.SETS,
+    tile_size: Optional[int] = None,
+    cycle_detector: Optional[CycleDetector] = None,
+    snapshot_every: Optional[int] = None,
+    recorder: Optional[RecordingWriter] = None,
+    profiler: Optional[Profiler] = None,
+    rule: Rule = CONWAY,
+    on_statistics: Optional[Callable[[Statistics], None]] = None,
+    first_generation: int = 0,
+) -> Generator[tuple[int, np.ndarray], None, None]:
+    """Computes a number of generations as fast as possible.
+
+    If the grid dies, its final (empty) state is yielded right away. If it enters a cycle (only
+    when ``cycle_detector`` is given), the last generation is reached by only computing the
+    generations needed to be in the same phase of the cycle, and no snapshot is yielded (nor
+    recorded) after the cycle was detected.
 
     :param grid_array: array to update.
-    :param jobs: numbers of workers (jobs) to use.
-    :yield: updated grid.
+    :param generations: number of generations to compute.
+    :param jobs: numbers of workers (jobs) to use, or None to use the fastest number.
+    :param engine: engine used to compute the generations.
+    :param tile_size: size of the tiles used to skip quiescent regions.
+    :param cycle_detector: cycle detector used to skip the generations of a cycle (ignored by the
+        hashlife engine, which computes the whole plane).
+    :param snapshot_every: if given, the grid is also yielded every ``snapshot_every`` generations.
+    :param recorder: if given, every generation is written into this recording.
+    :param profiler: if given, every computed generation is profiled.
+    :param rule: rule.
+    :param on_statistics: if given, function called with the statistics of every computed
+        generation.
+    :param first_generation: generation of the initial grid (e.g. of a resumed simulation), from
+        which snapshots are scheduled so that they are taken at multiples of ``snapshot_every``.
+    :yield: number of generations computed and grid, for every snapshot and for the last
+        generation.
+    """
+    # Snapshots are taken when first_generation + generation is a multiple of snapshot_every.
+    step = math.gcd(generations, snapshot_every or generations, first_generation) or 1
+    if recorder is not None or on_statistics is not None:
+        step = 1
+    if engine == Engine.HASHLIFE:
+        cycle_detector = None
+    tracker = StatisticsTracker(grid_array.shape) if on_statistics is not None else None
+
+    frames = generate_grid(
+        grid_array, jobs, engine, step, tile_size, cycle_detector, profiler, rule, tracker
+    )
+    for index, frame in enumerate(frames):
+        generation = index * step
+        if recorder is not None:
+            recorder.write(frame)
+        if on_statistics is not None and tracker is not None:
+            on_statistics(tracker.collect())
+        if generation >= generations:
+            yield generations, frame
+            return
+        if snapshot_every and (first_generation + generation) % snapshot_every == 0:
+            yield generation, frame
+
+    if cycle_detector is not None and cycle_detector.cycle is not None:
+        remaining = cycle_detector.steps_to(generations)
+        frames = generate_grid(grid_array, jobs, engine, tile_size=tile_size, rule=rule)
+        for _ in itertools.islice(frames, remaining + 1):
+            pass
+    yield generations, grid_array
+
+
+def _load_latest_checkpoint(checkpoints: Path) -> "Checkpoint":
+    """Loads the latest checkpoint of a directory.
+
+    :param checkpoints: directory of the checkpoints.
+    :returns: latest checkpoint.
     """
-    living_cells: set[tuple] = find_living_cells(grid_array)
-    living_cells_subsets = _create_subsets(living_cells.copy(), jobs)
+    from .storage.checkpoint import latest_checkpoint, load_checkpoint, set_random_state
 
-    with Pool(jobs) as pool:
-        while grid_array.any():
-            yield grid_array
+    path = latest_checkpoint(checkpoints)
+    if path is None:
+        raise ValueError(f"No checkpoint to resume from in '{checkpoints}'")
+    checkpoint = load_checkpoint(path)
+    set_random_state(checkpoint.random_state)
+    return checkpoint
 
-            args = [(grid_array, living_cells, subset) for subset in living_cells_subsets]
 
-            result = pool.starmap(update_positions, args)
+def simulate(  # pylint: disable=too-many-arguments,too-many-locals,too-many-branches
+    grid_size: int = GRID_SIZE_OPTION,
+    initialization: GridInitialization = INITIALIZATION_OPTION,
+    pattern: Optional[list[str]] = PATTERN_OPTION,
+    jobs: str = JOBS_OPTION,
+    engine: Engine = ENGINE_OPTION,
+    rule: str = RULE_OPTION,
+    tile_size: Optional[int] = TILE_SIZE_OPTION,
+    generations: int = typer.Option(100, help="Number of generations to compute."),
+    output: Optional[Path] = typer.Option(None, help="Numpy file (.npy) of the final grid."),
+    snapshot_every: Optional[int] = typer.Option(
+        None, help="Number of generations between two snapshots."
+    ),
+    snapshots: Path = typer.Option(Path("snapshots"), help="Directory of the snapshots."),
+    detect_cycles: bool = typer.Option(
+        False, help="Skip the useless generations once the grid enters a cycle."
+    ),
+    record: Optional[Path] = typer.Option(
+        None, help="Recording file of every generation (until a cycle is detected, if enabled)."
+    ),
+    keyframe_every: int = typer.Option(
+        100, help="Number of generations between two keyframes of the recording."
+    ),
+    stats: bool = STATS_OPTION,
+    stats_output: Optional[Path] = STATS_OUTPUT_OPTION,
+    checkpoint_every: Optional[int] = typer.Option(
+        None, help="Number of generations between two checkpoints."
+    ),
+    checkpoints: Path = typer.Option(Path("checkpoints"), help="Directory of the checkpoints."),
+    resume: bool = typer.Option(
+        False,
+        help="Resume from the latest checkpoint, with the grid, engine, rule and tile size it was "
+        "saved with.",
+    ),
+    monitor: Optional[Path] = typer.Option(
+        None,
+        help="CSV (.csv) or JSON-lines file of the population, births, deaths, bounding box and "
+        "highest density of every generation, updated from the cells changing state only.",
+    ),
+) -> None:
+    """Creates a grid and initializes it with a structure (or with random cells). Computes a number
+    of generations without displaying them, and prints the throughput.
+
+    :param grid_size: size of the grid to create.
+    :param initialization: type of initialization (random or a specific structure).
+    :param pattern: pattern files drawn on an empty grid instead of the initialization.
+    :param jobs: number of workers (jobs) to use.
+    :param engine: engine used to compute generations.
+    :param rule: Life-like rule.
+    :param tile_size: size of the tiles used to skip quiescent regions.
+    :param generations: number of generations to compute.
+    :param output: file to save the final grid into.
+    :param snapshot_every: number of generations between two snapshots.
+    :param snapshots: directory to save the snapshots into.
+    :param detect_cycles: whether to skip generations once the grid enters a cycle.
+    :param record: file to record every generation into.
+    :param keyframe_every: number of generations between two keyframes of the recording.
+    :param stats: whether to print statistics about the computation of the generations.
+    :param stats_output: file to write the statistics of every generation into.
+    :param checkpoint_every: number of generations between two checkpoints.
+    :param checkpoints: directory of the checkpoints.
+    :param resume: whether to resume from the latest checkpoint.
+    :param monitor: file to write the statistics of every generation into.
+    """
+    from .storage.checkpoint import CheckpointWriter
 
-            living_cells = set()
-            prev_living_cells = set()
-            for res in result:
-                living_cells.update(res[0])
-                prev_living_cells.update(res[1])
+    nb_jobs = check_jobs(jobs)
+    if snapshot_every is not None:
+        snapshots.mkdir(parents=True, exist_ok=True)
+    if checkpoint_every is not None and engine in (Engine.HASHLIFE, Engine.SPARSE):
+        raise ValueError(f"The {engine.value} engine doesn't support checkpoints")
 
-            grid_array = update_grid(grid_array, living_cells, prev_living_cells)
+    first_generation = 0
+    if resume:
+        if record is not None:
+            raise ValueError("A recording can't be resumed")
+        checkpoint = _load_latest_checkpoint(checkpoints)
+        first_generation = checkpoint.generation
+        grid_array: np.ndarray = checkpoint.grid.astype(np.int64)
+        engine = Engine(checkpoint.parameters["engine"])
+        rule = checkpoint.parameters["rule"]
+        tile_size = checkpoint.parameters["tile_size"]
+        typer.echo(f"Resuming from generation {first_generation}")
+    else:
+        grid_array = create_grid(grid_size, initialization, pattern)
+    parameters = {"engine": engine.value, "rule": rule, "tile_size": tile_size}
 
-            living_cells_subsets = _create_subsets(living_cells.copy(), jobs)
+    cycle_detector = CycleDetector(grid_array.shape) if detect_cycles else None
+    recorder = RecordingWriter(record, grid_array.shape, keyframe_every) if record else None
+    checkpoint_writer = CheckpointWriter(checkpoints) if checkpoint_every else None
+    # Frames are yielded at multiples of both intervals, counted from the first generation.
+    every = math.gcd(snapshot_every or 0, checkpoint_every or 0) or None
 
+    start = time.perf_counter()
+    try:
+        with profiling(stats, stats_output) as profiler, monitoring(
+            monitor, first_generation
+        ) as on_statistics:
+            for index, frame in _run_generations(
+                grid_array,
+                max(generations - first_generation, 0),
+                nb_jobs,
+                engine,
+                tile_size,
+                cycle_detector,
+                every,
+                recorder,
+                profiler,
+                parse_rule(rule),
+                on_statistics,
+                first_generation,
+            ):
+                generation = first_generation + index
+                if snapshot_every is not None and generation % snapshot_every == 0:
+                    np.save(snapshots / f"generation_{generation:08d}.npy", frame.astype(np.uint8))
+                if checkpoint_writer is not None and checkpoint_every is not None and index > 0:
+                    if generation % checkpoint_every == 0 or generation >= generations:
+                        checkpoint_writer.write(generation, frame, parameters)
+                if generation >= generations and output is not None:
+                    np.save(output, frame.astype(np.uint8))
+    finally:
+        if recorder is not None:
+            recorder.close()
+        if checkpoint_writer is not None:
+            checkpoint_writer.close()
+    elapsed = time.perf_counter() - start
+    generations = max(generations - first_generation, 0)
 
-def _animate(frames: np.ndarray) -> None:
-    """Plot frames."""
-    plt.clf()
-    plt.imshow(frames, cmap="binary")
+    if cycle_detector is not None and cycle_detector.cycle is not None:
+        typer.echo(
+            f"Cycle of period {cycle_detector.cycle.period} entered at generation "
+            f"{cycle_detector.cycle.start}"
+        )
+    typer.echo(
+        f"{generations} generations computed in {elapsed:.3f}s: "
+        f"{generations / elapsed:.1f} generations/s, "
+        f"{generations * grid_array.size / elapsed:.4g} cells/s"
+    )
 
 
-def conway(
-    grid_size: int = typer.Option(50, help="Size of the grid created."),
-    initialization: GridInitialization = typer.Option(
-        GridInitialization.RANDOM.value, help="Type of initialization."
+def export(  # pylint: disable=too-many-arguments,too-many-locals
+    output: Path = typer.Argument(..., help="Exported file."),
+    grid_size: int = GRID_SIZE_OPTION,
+    initialization: GridInitialization = INITIALIZATION_OPTION,
+    pattern: Optional[list[str]] = PATTERN_OPTION,
+    jobs: str = JOBS_OPTION,
+    engine: Engine = ENGINE_OPTION,
+    rule: str = RULE_OPTION,
+    step: int = typer.Option(1, help="Number of generations between two frames."),
+    tile_size: Optional[int] = TILE_SIZE_OPTION,
+    detect_cycles: bool = typer.Option(
+        False, help="Stop the export when the grid becomes stable or starts oscillating."
     ),
-    jobs: int = typer.Option(
-        1, help="Number of subprocesses used. If value is -1, all cpus are used."
+    frames: int = typer.Option(100, help="Maximum number of frames exported."),
+    export_format: ExportFormat = typer.Option(
+        ExportFormat.GIF.value,
+        "--format",
+        help="Format of the exported file: animated GIF, or raw 8-bit gray frames.",
+    ),
+    scale: int = typer.Option(
+        1, help="Size of the square blocks of cells shown by a single pixel."
+    ),
+    fps: float = typer.Option(10, help="Number of frames per second of the GIF."),
+    background: bool = typer.Option(
+        False, help="Encode the frames in a background thread while the simulation runs."
     ),
-    fps: float = typer.Option(1, help="Number of frames per second."),
 ) -> None:
-    """Creates a grid and initializes it with a structure (or with random cells). Animates the grid
-    according to Conway's rules.
+    """Creates a grid and initializes it with a structure (or with random cells). Exports its
+    generations into a file, frame by frame.
 
+    :param output: file to export the generations into.
     :param grid_size: size of the grid to create.
     :param initialization: type of initialization (random or a specific structure).
+    :param pattern: pattern files drawn on an empty grid instead of the initialization.
     :param jobs: number of workers (jobs) to use.
-    :param fps: number of frames per second.
+    :param engine: engine used to compute generations.
+    :param rule: Life-like rule.
+    :param step: number of generations between two frames.
+    :param tile_size: size of the tiles used to skip quiescent regions.
+    :param detect_cycles: whether to stop when the grid enters a cycle.
+    :param frames: maximum number of frames to export.
+    :param export_format: format of the exported file.
+    :param scale: size of the blocks of cells shown by a single pixel.
+    :param fps: number of frames per second of the GIF.
+    :param background: whether to encode the frames in a background thread.
     """
-    nb_cpu = cpu_count()
-    if jobs > nb_cpu:
-        raise ValueError(f"Maximum of jobs possible is {nb_cpu} but {jobs} were given")
-    if jobs == -1:
-        jobs = nb_cpu
+    from .storage.export import BackgroundWriter, open_writer
+
+    nb_jobs = check_jobs(jobs)
+
+    grid_array: np.ndarray = create_grid(grid_size, initialization, pattern)
+    cycle_detector = CycleDetector(grid_array.shape) if detect_cycles else None
+    generator = generate_grid(
+        grid_array=grid_array,
+        jobs=nb_jobs,
+        engine=engine,
+        step=step,
+        tile_size=tile_size,
+        cycle_detector=cycle_detector,
+        rule=parse_rule(rule),
+    )
+    if cycle_detector is not None:
+        generator = report_cycle(generator, cycle_detector)
 
-    grid: Grid = Grid(grid_size)
-    grid_array: np.ndarray = grid.grid_init(initialization.value)
+    frame_writer = open_writer(output, grid_array.shape, export_format, scale, fps)
+    writer = BackgroundWriter(frame_writer) if background else frame_writer
+    with writer:
+        for frame in itertools.islice(generator, frames):
+            writer.write(frame)
 
-    generator = _generate_grid(grid_array=grid_array, jobs=jobs)
-    fig = plt.figure()
-    _ = animation.FuncAnimation(fig, _animate, frames=generator, repeat=False, interval=1000 // fps)
-    plt.show()
+    height, width = frame_writer.shape
+    typer.echo(f"{frame_writer.nb_frames} frames of {width}x{height} pixels exported to {output}")
 
 
 def run() -> None:
     """Typer entrypoint."""
     app = typer.Typer(no_args_is_help=True)
-    app.command(name="conway")(conway)
+    app.command(name="show")(conway)
+    app.command(name="run")(simulate)
+    app.command(name="export")(export)
+    app.command(name="ensemble")(ensemble)
+    app.command(name="mapped")(mapped)
+    app.command(name="serve")(serve)
+    app.command(name="watch")(watch)
+    app.command(name="worker")(worker)
+    app.command(name="distributed")(distributed)
     app()
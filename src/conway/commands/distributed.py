@@ -0,0 +1,106 @@
+"""This module contains the commands computing a grid split into blocks between workers."""
+
+# pylint: disable=import-outside-toplevel
+
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Optional
+
+import numpy as np
+import typer
+
+from ..engine.rule import parse_rule
+from ..grid.grid import GridInitialization
+from .options import (
+    GRID_SIZE_OPTION,
+    INITIALIZATION_OPTION,
+    PATTERN_OPTION,
+    RULE_OPTION,
+    create_grid,
+)
+
+if TYPE_CHECKING:
+    from multiprocessing import Process
+
+
+def worker(
+    host: str = typer.Option("0.0.0.0", help="Host to listen on."),
+    port: int = typer.Option(8766, help="Port to listen on."),
+    sessions: Optional[int] = typer.Option(
+        None, help="Number of simulations after which the worker stops (never if not given)."
+    ),
+) -> None:
+    """Starts a worker computing a block of the grids of distributed simulations (see the
+    distributed command).
+
+    :param host: host to listen on.
+    :param port: port to listen on.
+    :param sessions: number of simulations after which the worker stops.
+    """
+    from ..distributed.worker import serve as serve_blocks
+
+    typer.echo(f"Worker listening on {host}:{port}")
+    serve_blocks(host, port, sessions)
+
+
+def distributed(  # pylint: disable=too-many-arguments,too-many-locals
+    grid_size: int = GRID_SIZE_OPTION,
+    initialization: GridInitialization = INITIALIZATION_OPTION,
+    pattern: Optional[list[str]] = PATTERN_OPTION,
+    rule: str = RULE_OPTION,
+    worker_address: Optional[list[str]] = typer.Option(
+        None, "--worker", help="Address (HOST:PORT) of a worker, one per block of the grid."
+    ),
+    local_workers: int = typer.Option(
+        0, help="Number of workers started on this machine, if no worker address is given."
+    ),
+    generations: int = typer.Option(100, help="Number of generations to compute."),
+    stats_every: Optional[int] = typer.Option(
+        None, help="Number of generations between two prints of the population."
+    ),
+    output: Optional[Path] = typer.Option(None, help="Numpy file (.npy) of the final grid."),
+) -> None:
+    """Creates a grid and initializes it with a structure (or with random cells). Splits it into
+    blocks computed by several workers, which only exchange the cells on the boundaries of their
+    blocks at every generation.
+
+    :param grid_size: size of the grid to create.
+    :param initialization: type of initialization (random or a specific structure).
+    :param pattern: pattern files drawn on an empty grid instead of the initialization.
+    :param rule: Life-like rule.
+    :param worker_address: addresses of the workers.
+    :param local_workers: number of workers started on this machine.
+    :param generations: number of generations to compute.
+    :param stats_every: number of generations between two prints of the population.
+    :param output: numpy file of the final grid.
+    """
+    from ..distributed.coordinator import Coordinator
+    from ..distributed.worker import start_local_workers
+
+    processes: list["Process"] = []
+    addresses = list(worker_address or [])
+    if not addresses:
+        if local_workers < 1:
+            raise typer.BadParameter("Give the address of workers or a number of local workers")
+        processes, addresses = start_local_workers(local_workers)
+
+    grid_array: np.ndarray = create_grid(grid_size, initialization, pattern)
+    start = time.perf_counter()
+    with Coordinator(addresses, grid_array, rule=parse_rule(rule)) as coordinator:
+        typer.echo(f"Grid split into {coordinator.layout[0]}x{coordinator.layout[1]} blocks")
+        every = stats_every or generations
+        while coordinator.generation < generations:
+            population = coordinator.step(min(every, generations - coordinator.generation))
+            if stats_every:
+                typer.echo(f"Generation {coordinator.generation}: population {population}")
+        elapsed = time.perf_counter() - start
+        if output is not None:
+            np.save(output, coordinator.gather())
+    for process in processes:
+        process.join()
+
+    typer.echo(
+        f"{generations} generations computed in {elapsed:.3f}s: "
+        f"{generations / elapsed:.1f} generations/s, "
+        f"{generations * grid_size * grid_size / elapsed:.4g} cells/s"
+    )
@@ -0,0 +1,110 @@
+"""This module contains the command simulating many random boards together."""
+
+# pylint: disable=import-outside-toplevel
+
+import csv
+import time
+from contextlib import nullcontext
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+import typer
+
+from ..engine.rule import parse_rule
+from ..storage.pattern import place_pattern
+from .options import GRID_SIZE_OPTION, RULE_OPTION
+
+
+def ensemble(  # pylint: disable=too-many-arguments,too-many-locals
+    boards: int = typer.Option(1000, help="Number of random boards simulated."),
+    grid_size: int = GRID_SIZE_OPTION,
+    density: float = typer.Option(0.2, help="Probability of every cell to be alive at first."),
+    rule: str = RULE_OPTION,
+    max_generations: int = typer.Option(10_000, help="Maximum number of generations per board."),
+    batch_size: int = typer.Option(1024, help="Maximum number of boards computed together."),
+    max_period: int = typer.Option(64, help="Longest period of the cycles detected."),
+    seed: Optional[int] = typer.Option(None, help="Seed of the random boards."),
+    output: Optional[Path] = typer.Option(None, help="CSV file of the summary of every board."),
+    census: bool = typer.Option(
+        False, help="Count the objects (blocks, blinkers, gliders...) of the final boards."
+    ),
+    catalog: Optional[list[Path]] = typer.Option(
+        None, help="Pattern file of an object to recognize in the census, named after the file."
+    ),
+) -> None:
+    """Simulates many random boards together, until each of them dies or enters a cycle, and prints
+    statistics about them.
+
+    :param boards: number of boards to simulate.
+    :param grid_size: size of the boards.
+    :param density: probability of every cell of the initial boards to be alive.
+    :param rule: Life-like rule.
+    :param max_generations: maximum number of generations of every board.
+    :param batch_size: maximum number of boards computed together.
+    :param max_period: longest period of the cycles detected.
+    :param seed: seed of the random boards.
+    :param output: file to write the summary of every board into.
+    :param census: whether to count the objects of the final boards.
+    :param catalog: pattern files of the objects to recognize, besides the known structures.
+    """
+    from collections import Counter
+
+    from ..engine.ensemble import BoardStatus, BoardSummary, simulate_ensemble
+    from ..grid.census import census as count_objects
+    from ..grid.census import structures_catalog
+    from ..storage.pattern import read_header
+
+    objects_catalog = structures_catalog()
+    for pattern_file in catalog or []:
+        header = read_header(pattern_file)
+        pattern_array = np.zeros((header.height, header.width), dtype=np.uint8)
+        place_pattern(pattern_array, pattern_file, (0, 0))
+        objects_catalog.add(pattern_file.stem, pattern_array)
+    objects: Counter[str] = Counter()
+
+    def add_objects(_: BoardSummary, board: np.ndarray) -> None:
+        objects.update(count_objects(board, objects_catalog))
+
+    summaries: list[BoardSummary] = []
+    start = time.perf_counter()
+    with open(output, "w", newline="", encoding="utf-8") if output else nullcontext() as file:
+        writer = csv.writer(file) if file is not None else None
+        if writer is not None:
+            writer.writerow(BoardSummary._fields)
+        for summary in simulate_ensemble(
+            boards,
+            grid_size,
+            density,
+            max_generations,
+            batch_size,
+            max_period,
+            seed,
+            parse_rule(rule),
+            add_objects if census else None,
+        ):
+            summaries.append(summary)
+            if writer is not None:
+                writer.writerow(
+                    [field.value if isinstance(field, BoardStatus) else field for field in summary]
+                )
+    elapsed = time.perf_counter() - start
+
+    typer.echo(f"{len(summaries)} boards simulated in {elapsed:.3f}s")
+    for status in BoardStatus:
+        selected = [summary for summary in summaries if summary.status == status]
+        if not selected:
+            continue
+        generations = np.array([summary.generation for summary in selected])
+        populations = np.array([summary.final_population for summary in selected])
+        share = 100 * len(selected) / len(summaries)
+        typer.echo(
+            f"{status.value:>11}: {len(selected)} boards ({share:.1f}%), "
+            f"generation {generations.mean():.1f} on average "
+            f"(median {np.median(generations):.0f}), "
+            f"final population {populations.mean():.1f} on average"
+        )
+    if census:
+        typer.echo(f"Objects of the final boards ({sum(objects.values())} in total):")
+        for name, count in objects.most_common():
+            typer.echo(f"{name:>20}: {count}")
@@ -0,0 +1,261 @@
+"""This module contains the generation of the grids of the commands, by every engine.
+
+The engines are only imported when a grid is generated with them, so that starting the app stays
+fast.
+"""
+
+# pylint: disable=import-outside-toplevel
+
+import itertools
+import time
+from typing import Generator, Iterator, Optional
+
+import numpy as np
+import typer
+
+from ..engine.changes import ChangeTracker, ChangeTrackers, track_changes
+from ..engine.cycle import CycleDetector, track_cycles
+from ..engine.engine import Engine
+from ..engine.rule import CONWAY, Rule
+from ..grid.cell import find_living_cells
+from ..grid.grid import update_grid, update_positions
+from ..profiling.profiler import NullProfiler, Phase, Profiler, profile_frames
+
+
+def _create_subsets(main_set: set[tuple], nb_subsets: int) -> list[set[tuple]]:
+    """Creates ``nb_subsets`` subsets from ``main_set``.
+
+    :param main_set: sets to create subsets from.
+    :param nb_subsets: number of subsets to create.
+    :return: list of subsets.
+    """
+    cells = list(main_set)
+    return [set(cells[i::nb_subsets]) for i in range(nb_subsets)]
+
+
+def _timed_update_positions(
+    array: np.ndarray,
+    living_cells: set[tuple],
+    subset_living_cells: set[tuple],
+    rule: Rule = CONWAY,
+) -> tuple[set[tuple], set[tuple], float]:
+    """Updates the positions of a subset of living cells, timing the update.
+
+    :param array: grid array.
+    :param living_cells: living cells positions.
+    :param subset_living_cells: subset of living cells positions.
+    :param rule: rule.
+    :returns: positions of the living cells, and time spent.
+    """
+    start = time.perf_counter()
+    return (
+        *update_positions(array, living_cells, subset_living_cells, rule),
+        time.perf_counter() - start,
+    )
+
+
+def _generate_sets(
+    grid_array: np.ndarray,
+    jobs: int,
+    profiler: Optional[Profiler] = None,
+    rule: Rule = CONWAY,
+    tracker: Optional[ChangeTracker] = None,
+) -> Generator[np.ndarray, None, None]:
+    """Yields a new grid accordingly to Conway's rules, computed cell by cell with sets of
+    positions split between ``jobs`` workers.
+
+    :param grid_array: array to update.
+    :param jobs: numbers of workers (jobs) to use.
+    :param profiler: profiler timing the phases of every generation.
+    :param rule: rule.
+    :param tracker: if given, tracker updated with the cells born and dead.
+    :yield: updated grid.
+    """
+    if profiler is None:
+        profiler = NullProfiler()
+    if tracker is not None:
+        tracker.reset(grid_array)
+
+    living_cells: set[tuple] = find_living_cells(grid_array)
+    living_cells_subsets = _create_subsets(living_cells.copy(), jobs)
+
+    from multiprocessing import Pool
+
+    with Pool(jobs) as pool:
+        while living_cells:
+            yield grid_array
+
+            args = [(grid_array, living_cells, subset, rule) for subset in living_cells_subsets]
+
+            result: list[tuple]
+            if profiler.enabled:
+                start = time.perf_counter()
+                result = pool.starmap(_timed_update_positions, args)
+                profiler.add_workers([res[2] for res in result], time.perf_counter() - start)
+            else:
+                result = pool.starmap(update_positions, args)
+
+            with profiler.phase(Phase.MERGE):
+                living_cells = set()
+                prev_living_cells = set()
+                for res in result:
+                    living_cells.update(res[0])
+                    prev_living_cells.update(res[1])
+
+            with profiler.phase(Phase.UPDATE_GRID):
+                grid_array = update_grid(grid_array, living_cells, prev_living_cells)
+
+            if tracker is not None:
+                tracker.update_cells(
+                    living_cells - prev_living_cells, prev_living_cells - living_cells
+                )
+
+            with profiler.phase(Phase.SUBSETS):
+                living_cells_subsets = _create_subsets(living_cells.copy(), jobs)
+
+
+def _generate_autotuned(  # pylint: disable=too-many-arguments
+    grid_array: np.ndarray,
+    jobs: Optional[int],
+    engine: Engine = Engine.AUTO,
+    tile_size: Optional[int] = None,
+    rule: Rule = CONWAY,
+    tracker: Optional[ChangeTracker] = None,
+) -> Iterator[np.ndarray]:
+    """Yields a new grid accordingly to Conway's rules, computed with the fastest engine and/or
+    number of jobs, measured on the grid (see ``conway.engine.autotune``).
+
+    :param grid_array: array to update.
+    :param jobs: numbers of workers (jobs) to use, or None to choose it.
+    :param engine: engine used to compute the generations, or ``Engine.AUTO`` to choose it.
+    :param tile_size: size of the tiles used to skip quiescent regions.
+    :param rule: rule.
+    :param tracker: if given, tracker updated with the cells changed by the chosen engines.
+    :yield: updated grid.
+    """
+    from ..engine import autotune
+
+    def generate(array: np.ndarray, choice: autotune.Choice) -> Iterator[np.ndarray]:
+        return generate_grid(array, choice.jobs, choice.engine, tile_size=tile_size, rule=rule)
+
+    def generate_tracked(array: np.ndarray, choice: autotune.Choice) -> Iterator[np.ndarray]:
+        return generate_grid(
+            array, choice.jobs, choice.engine, tile_size=tile_size, rule=rule, tracker=tracker
+        )
+
+    def report(generation: int, choice: autotune.Choice) -> None:
+        typer.echo(
+            f"Generation {generation}: using the {choice.engine.value} engine with "
+            f"{choice.jobs} job(s)"
+        )
+
+    choices = autotune.candidates(None if engine == Engine.AUTO else engine, jobs, rule)
+    tuner = autotune.Autotuner(generate, choices, key_suffix=f"{rule}/{tile_size}")
+    return autotune.generate(grid_array, tuner, on_choice=report, run=generate_tracked)
+
+
+def generate_grid(  # pylint: disable=too-many-arguments,too-many-locals,too-many-branches
+    grid_array: np.ndarray,
+    jobs: Optional[int],
+    engine: Engine = Engine.SETS,
+    step: int = 1,
+    tile_size: Optional[int] = None,
+    cycle_detector: Optional[CycleDetector] = None,
+    profiler: Optional[Profiler] = None,
+    rule: Rule = CONWAY,
+    tracker: Optional[ChangeTracker] = None,
+) -> Iterator[np.ndarray]:
+    """Yields a new grid accordingly to Conway's rules.
+
+    :param grid_array: array to update.
+    :param jobs: numbers of workers (jobs) to use, or None to use the fastest number.
+    :param engine: engine used to compute the generations (``Engine.AUTO`` to use the fastest).
+    :param step: number of generations between two yielded grids.
+    :param tile_size: size of the tiles used to skip quiescent regions (numpy and shared engines
+        only), or None to compute every cell at each generation.
+    :param cycle_detector: if given, generation stops when the grid enters a cycle. With the
+        hashlife engine, states are only compared every ``step`` generations.
+    :param profiler: if given, every generation is profiled (only every ``step`` generations
+        with the hashlife engine).
+    :param rule: rule (only Conway's rule is supported by the bitpacked, hashlife and sparse
+        engines, and cells can't be born without living neighbors with the sets engine or tiles).
+    :param tracker: if given, tracker updated with the cells changing state at every generation
+        (only every ``step`` generations with the hashlife engine), e.g. statistics.
+    :yield: updated grid.
+    """
+    if rule != CONWAY and engine in (Engine.BITPACKED, Engine.HASHLIFE, Engine.SPARSE):
+        raise ValueError(f"The {engine.value} engine only supports the rule {CONWAY}")
+    if 0 in rule.birth and engine == Engine.SETS:
+        raise ValueError(f"The {engine.value} engine doesn't support the rule {rule}")
+
+    # Statistics and cycle detection are both updated from the cells changing state.
+    trackers = [changes for changes in (tracker, cycle_detector) if changes is not None]
+    tracker = ChangeTrackers(trackers) if len(trackers) > 1 else next(iter(trackers), None)
+
+    if engine == Engine.HASHLIFE:
+        from ..engine import hashlife
+
+        frames: Iterator[np.ndarray] = hashlife.generate(grid_array, step=step)
+        if tracker is not None:
+            frames = track_changes(frames, tracker, step)
+        if profiler is not None:
+            frames = profile_frames(frames, profiler, step)
+        return frames if cycle_detector is None else track_cycles(frames, cycle_detector)
+
+    generator: Iterator[np.ndarray]
+    # Every engine but the sparse one reports its changes, its frames are compared instead.
+    reports_changes = True
+    if engine == Engine.AUTO:
+        generator = _generate_autotuned(grid_array, jobs, engine, tile_size, rule, tracker)
+    elif engine == Engine.NUMPY and tile_size is not None:
+        from ..engine import tiled
+
+        generator = tiled.generate(grid_array, tile_size, rule, tracker)
+    elif engine == Engine.NUMPY:
+        from ..engine import vectorized
+
+        generator = vectorized.generate(grid_array, rule, tracker)
+    elif engine == Engine.BITPACKED:
+        from ..engine import bitpacked
+
+        generator = bitpacked.generate(grid_array, tracker)
+    elif engine == Engine.SPARSE:
+        from ..engine import sparse
+
+        generator = sparse.generate(grid_array)
+        reports_changes = False
+    elif jobs is None:
+        # The fastest number of jobs of the sets and shared engines is measured.
+        generator = _generate_autotuned(grid_array, jobs, engine, tile_size, rule, tracker)
+    elif engine == Engine.SHARED:
+        from ..engine import shared
+
+        generator = shared.generate(grid_array, jobs, tile_size, rule, tracker)
+    else:
+        generator = _generate_sets(grid_array, jobs, profiler, rule, tracker)
+
+    if tracker is not None and not reports_changes:
+        generator = track_changes(generator, tracker)
+    if profiler is not None:
+        # The sets engine times its own phases.
+        generator = profile_frames(generator, profiler, time_steps=engine != Engine.SETS)
+    if cycle_detector is not None:
+        generator = track_cycles(generator, cycle_detector)
+    return generator if step == 1 else itertools.islice(generator, None, None, step)
+
+
+def report_cycle(
+    frames: Iterator[np.ndarray], cycle_detector: CycleDetector
+) -> Generator[np.ndarray, None, None]:
+    """Yields frames, and prints the cycle entered by the simulation once frames are exhausted.
+
+    :param frames: frames of the simulation.
+    :param cycle_detector: cycle detector used by the simulation.
+    :yield: frames.
+    """
+    yield from frames
+    if cycle_detector.cycle is not None:
+        typer.echo(
+            f"Cycle of period {cycle_detector.cycle.period} entered at generation "
+            f"{cycle_detector.cycle.start}"
+        )
@@ -0,0 +1,68 @@
+"""This module contains the command computing a grid stored in memory-mapped files."""
+
+# pylint: disable=import-outside-toplevel
+
+import time
+from pathlib import Path
+from typing import Optional
+
+import typer
+
+from ..engine.rule import parse_rule
+from .options import GRID_SIZE_OPTION, PATTERN_OPTION, parse_pattern
+
+
+def mapped(  # pylint: disable=too-many-arguments,too-many-locals
+    directory: Path = typer.Argument(..., help="Directory of the memory-mapped grid."),
+    grid_size: int = GRID_SIZE_OPTION,
+    density: float = typer.Option(0.2, help="Probability of every cell to be alive at first."),
+    pattern: Optional[list[str]] = PATTERN_OPTION,
+    seed: Optional[int] = typer.Option(None, help="Seed of the random grid."),
+    packed: bool = typer.Option(
+        False, help="Store 64 cells per word instead of one per byte (Conway's rule only)."
+    ),
+    band_rows: int = typer.Option(1024, help="Number of rows computed at once."),
+    rule: Optional[str] = typer.Option(
+        None,
+        help="Life-like rule, e.g. B3/S23 (Conway's, the default for a new grid). A grid is "
+        "continued with the rule it was created with, which must match if given.",
+    ),
+    generations: int = typer.Option(100, help="Number of generations to compute."),
+) -> None:
+    """Computes a number of generations of a grid stored in memory-mapped files, band by band, so
+    that grids larger than the memory can be computed. If the directory already holds a grid, its
+    computation is continued; otherwise a random grid (or a grid of patterns) is created.
+
+    :param directory: directory of the memory-mapped files.
+    :param grid_size: size of the grid to create.
+    :param density: probability of every cell of the created grid to be alive.
+    :param pattern: pattern files drawn on an empty grid instead of random cells.
+    :param seed: seed of the random grid.
+    :param packed: whether to store 64 cells per word.
+    :param band_rows: number of rows computed at once.
+    :param rule: Life-like rule (the rule of the grid if it is continued).
+    :param generations: number of generations to compute.
+    """
+    from ..engine.mapped import MappedGrid, is_mapped
+
+    parsed_rule = parse_rule(rule) if rule is not None else None
+    if is_mapped(directory):
+        grid = MappedGrid(directory, band_rows=band_rows, rule=parsed_rule)
+    else:
+        grid = MappedGrid(directory, (grid_size, grid_size), packed, band_rows, parsed_rule)
+        if pattern:
+            for pattern_option in pattern:
+                grid.place_pattern(*parse_pattern(pattern_option))
+        else:
+            grid.fill_random(density, seed)
+
+    start = time.perf_counter()
+    grid.step(generations)
+    elapsed = time.perf_counter() - start
+
+    typer.echo(
+        f"{generations} generations computed in {elapsed:.3f}s: "
+        f"{generations / elapsed:.1f} generations/s, "
+        f"{generations * grid.shape[0] * grid.shape[1] / elapsed:.4g} cells/s"
+    )
+    typer.echo(f"Generation {grid.generation} saved to {grid.path}")
@@ -0,0 +1,163 @@
+"""This module contains the options and helpers shared by the commands of the app."""
+
+# pylint: disable=import-outside-toplevel
+
+import re
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import Callable, Iterator, Optional
+
+import numpy as np
+import typer
+
+from ..engine.engine import Engine
+from ..engine.rule import CONWAY
+from ..engine.statistics import Statistics, StatisticsFormat, StatisticsWriter
+from ..grid.grid import Grid, GridInitialization
+from ..profiling.profiler import Profiler
+from ..storage.pattern import place_pattern
+
+GRID_SIZE_OPTION = typer.Option(50, help="Size of the grid created.")
+INITIALIZATION_OPTION = typer.Option(
+    GridInitialization.RANDOM.value, help="Type of initialization."
+)
+JOBS_OPTION = typer.Option(
+    "1",
+    help="Number of subprocesses used. If value is -1, all cpus are used. If value is auto, the "
+    "fastest number is measured on the grid.",
+)
+ENGINE_OPTION = typer.Option(
+    Engine.SETS.value,
+    help="Engine used to compute generations. The numpy engine ignores the number of jobs, "
+    "the shared engine splits the grid in bands of rows shared between the jobs, the "
+    "bitpacked engine stores 64 cells per word and the hashlife and sparse engines run on "
+    "an unbounded plane. The auto engine measures the fastest engine (except hashlife and "
+    "sparse) on the grid, and measures it again if the population changes drastically.",
+)
+TILE_SIZE_OPTION = typer.Option(
+    None,
+    help="Size of the tiles used to only compute the regions of the grid that may change "
+    "(numpy and shared engines only).",
+)
+PATTERN_OPTION = typer.Option(
+    None,
+    help="Pattern file (RLE, or plaintext if its suffix is .cells) drawn on an empty grid instead "
+    "of the initialization, centered or at a given position: PATH[@ROW,COLUMN]. Can be repeated.",
+)
+RULE_OPTION = typer.Option(
+    str(CONWAY),
+    help="Life-like rule, e.g. B3/S23 (Conway), B36/S23 (HighLife), B2/S (Seeds) or B3678/S34678 "
+    "(Day & Night). Other rules than Conway's are only supported by the sets, numpy and shared "
+    "engines.",
+)
+STATS_OPTION = typer.Option(
+    False, help="Print the mean time spent in every phase of the computation of a generation."
+)
+STATS_OUTPUT_OPTION = typer.Option(
+    None,
+    help="JSON-lines file of the timings, population, births and deaths of every generation.",
+)
+
+
+@contextmanager
+def profiling(stats: bool, stats_output: Optional[Path]) -> Iterator[Optional[Profiler]]:
+    """Creates a profiler if statistics are asked for, and prints its summary at the end.
+
+    :param stats: whether to print the summary of the statistics.
+    :param stats_output: file to write the statistics of every generation into.
+    :yield: profiler, or None if no statistics are asked for.
+    """
+    if not stats and stats_output is None:
+        yield None
+        return
+    with open(stats_output, "w", encoding="utf-8") if stats_output else nullcontext() as output:
+        profiler = Profiler(output=output)
+        try:
+            yield profiler
+        finally:
+            if stats:
+                typer.echo(profiler.summary())
+
+
+@contextmanager
+def monitoring(
+    monitor: Optional[Path], first_generation: int = 0
+) -> Iterator[Optional[Callable[[Statistics], None]]]:
+    """Opens a file of the statistics of every generation if it is asked for, as CSV if its suffix
+    is .csv and as JSON lines otherwise.
+
+    :param monitor: file to write the statistics of every generation into.
+    :param first_generation: generation of the initial grid (e.g. of a resumed simulation), added
+        to the generations of the statistics.
+    :yield: function writing the statistics of a generation, or None if no file is asked for.
+    """
+    if monitor is None:
+        yield None
+        return
+    statistics_format = StatisticsFormat.CSV if monitor.suffix == ".csv" else StatisticsFormat.JSONL
+    with open(monitor, "w", encoding="utf-8", newline="") as output:
+        writer = StatisticsWriter(output, statistics_format)
+
+        def write_statistics(statistics: Statistics) -> None:
+            writer.write(statistics._replace(generation=first_generation + statistics.generation))
+
+        yield write_statistics
+
+
+def parse_pattern(pattern: str) -> tuple[str, Optional[tuple[int, int]]]:
+    """Parses a pattern option.
+
+    :param pattern: pattern file, as ``PATH[@ROW,COLUMN]``.
+    :returns: path of the pattern file and position of its top-left corner (None if not given).
+    """
+    path, _, position = pattern.rpartition("@")
+    match = re.fullmatch(r"(\d+),(\d+)", position)
+    if not path or match is None:
+        return pattern, None
+    return path, (int(match.group(1)), int(match.group(2)))
+
+
+def create_grid(
+    grid_size: int, initialization: GridInitialization, patterns: Optional[list[str]] = None
+) -> np.ndarray:
+    """Creates a grid, initialized with a structure (or with random cells), or with patterns.
+
+    :param grid_size: size of the grid to create.
+    :param initialization: type of initialization (random or a specific structure), ignored if
+        patterns are given.
+    :param patterns: pattern files drawn on an empty grid, as ``PATH[@ROW,COLUMN]``.
+    :returns: grid array.
+    """
+    if not patterns:
+        return Grid(grid_size).grid_init(initialization.value)
+
+    grid_array = np.zeros((grid_size, grid_size), dtype=np.int64)
+    for pattern in patterns:
+        place_pattern(grid_array, *parse_pattern(pattern))
+    return grid_array
+
+
+def check_jobs(jobs: str) -> Optional[int]:
+    """Checks the number of jobs asked for.
+
+    :param jobs: number of workers (jobs) asked for, -1 meaning all cpus and auto the fastest
+        number.
+    :returns: number of workers (jobs) to use, or None to use the fastest number.
+    """
+    from multiprocessing import cpu_count
+
+    if jobs == "auto":
+        return None
+    try:
+        nb_jobs = int(jobs)
+    except ValueError as error:
+        raise ValueError(
+            f"Number of jobs must be an integer or auto but {jobs} was given"
+        ) from error
+
+    nb_cpu = cpu_count()
+    if nb_jobs > nb_cpu:
+        raise ValueError(f"Maximum of jobs possible is {nb_cpu} but {nb_jobs} were given")
+    if nb_jobs == -1:
+        nb_jobs = nb_cpu
+    return nb_jobs
@@ -0,0 +1,103 @@
+"""This module contains the commands streaming the generations of a simulation to viewers."""
+
+# pylint: disable=import-outside-toplevel
+
+from typing import Optional
+
+import numpy as np
+import typer
+
+from ..engine.engine import Engine
+from ..engine.rule import parse_rule
+from ..grid.grid import GridInitialization
+from .generation import generate_grid
+from .options import (
+    ENGINE_OPTION,
+    GRID_SIZE_OPTION,
+    INITIALIZATION_OPTION,
+    JOBS_OPTION,
+    PATTERN_OPTION,
+    RULE_OPTION,
+    TILE_SIZE_OPTION,
+    check_jobs,
+    create_grid,
+)
+
+
+def serve(  # pylint: disable=too-many-arguments,too-many-locals
+    grid_size: int = GRID_SIZE_OPTION,
+    initialization: GridInitialization = INITIALIZATION_OPTION,
+    pattern: Optional[list[str]] = PATTERN_OPTION,
+    jobs: str = JOBS_OPTION,
+    engine: Engine = ENGINE_OPTION,
+    rule: str = RULE_OPTION,
+    step: int = typer.Option(1, help="Number of generations between two frames."),
+    tile_size: Optional[int] = TILE_SIZE_OPTION,
+    host: str = typer.Option("127.0.0.1", help="Host to listen on."),
+    port: int = typer.Option(8765, help="Port to listen on."),
+    fps: Optional[float] = typer.Option(
+        None, help="Maximum number of frames per second (as fast as possible if not given)."
+    ),
+    generations: Optional[int] = typer.Option(
+        None, help="Number of generations after which the simulation stops."
+    ),
+    viewers: int = typer.Option(0, help="Number of viewers to wait for before starting."),
+    max_pending: int = typer.Option(
+        16, help="Number of frames queued for a viewer above which it skips to the latest one."
+    ),
+) -> None:
+    """Creates a grid and initializes it with a structure (or with random cells). Computes its
+    generations once and streams them to every viewer connected (see the watch command).
+
+    :param grid_size: size of the grid to create.
+    :param initialization: type of initialization (random or a specific structure).
+    :param pattern: pattern files drawn on an empty grid instead of the initialization.
+    :param jobs: number of workers (jobs) to use.
+    :param engine: engine used to compute generations.
+    :param rule: Life-like rule.
+    :param step: number of generations between two frames.
+    :param tile_size: size of the tiles used to skip quiescent regions.
+    :param host: host to listen on.
+    :param port: port to listen on.
+    :param fps: maximum number of frames per second.
+    :param generations: number of generations after which the simulation stops.
+    :param viewers: number of viewers to wait for before starting the simulation.
+    :param max_pending: number of frames queued for a viewer above which it skips frames.
+    """
+    import asyncio
+
+    from ..streaming.server import DeltaServer
+
+    nb_jobs = check_jobs(jobs)
+    grid_array: np.ndarray = create_grid(grid_size, initialization, pattern)
+
+    async def serve_generations() -> int:
+        server = DeltaServer(grid_array.shape, host, port, max_pending)
+        await server.start()
+        typer.echo(f"Serving a {grid_size}x{grid_size} grid on {host}:{server.port}")
+        await server.wait_for_viewers(viewers)
+        frames = generate_grid(grid_array, nb_jobs, engine, step, tile_size, rule=parse_rule(rule))
+        nb_frames = await server.run(frames, step, generations, fps)
+        typer.echo(f"{nb_frames} frames streamed, {server.nb_skips} skipped by slow viewers")
+        return nb_frames
+
+    asyncio.run(serve_generations())
+
+
+def watch(
+    host: str = typer.Option("127.0.0.1", help="Host of the server."),
+    port: int = typer.Option(8765, help="Port of the server."),
+    fps: float = typer.Option(10, help="Number of frames per second."),
+) -> None:
+    """Displays the generations streamed by a server (see the serve command), only displaying the
+    latest generation received at each frame.
+
+    :param host: host of the server.
+    :param port: port of the server.
+    :param fps: number of frames per second.
+    """
+    from ..display.renderer import FrameProducer, Renderer
+    from ..streaming.protocol import watch as watch_stream
+
+    frames = (grid for _, grid in watch_stream(host, port))
+    Renderer(FrameProducer(frames, drop_frames=True), fps).show()
@@ -0,0 +1,192 @@
+"""This module contains the display of a simulation.
+
+The simulation runs in a background thread (the producer), which puts copies of the frames into a
+bounded queue. The renderer periodically takes the latest frame from the queue and updates a single
+image artist with blitting, instead of rebuilding the whole figure. When frames are dropped, the
+producer never waits for the renderer: the oldest frames are discarded when the queue is full, so
+that the simulation runs at full speed while the display keeps its frame rate.
+"""
+
+import itertools
+import queue
+import threading
+from typing import Any, Iterable, Optional
+
+import numpy as np
+from matplotlib import animation, pyplot as plt
+from matplotlib.figure import Figure
+from matplotlib.image import AxesImage
+
+from ..profiling.profiler import Phase, Profiler
+
+_END = None
+_PUT_TIMEOUT = 0.1
+_STOP_TIMEOUT = 5.0
+
+
+class FrameProducer(threading.Thread):
+    """Thread running a simulation and feeding its frames to a bounded queue."""
+
+    def __init__(self, frames: Iterable[np.ndarray], maxsize: int = 2, drop_frames: bool = False):
+        """FrameProducer constructor.
+
+        :param frames: frames of the simulation (possibly always the same array updated in place).
+        :param maxsize: maximum number of frames waiting to be displayed.
+        :param drop_frames: whether to drop the oldest frames instead of waiting when the queue is
+            full.
+        """
+        super().__init__(daemon=True)
+        self.frames: Iterable[np.ndarray] = frames
+        self.drop_frames: bool = drop_frames
+        self.nb_produced: int = 0
+        self.nb_dropped: int = 0
+        self.finished: bool = False
+        self._queue: "queue.Queue[Optional[np.ndarray]]" = queue.Queue(maxsize)
+        self._stop_event = threading.Event()
+
+    def _put(self, frame: Optional[np.ndarray]) -> None:
+        """Puts a frame into the queue, dropping the oldest frame or waiting if it is full.
+
+        :param frame: frame to put, or ``_END`` once the simulation is over.
+        """
+        while not self._stop_event.is_set():
+            try:
+                if self.drop_frames:
+                    self._queue.put_nowait(frame)
+                else:
+                    self._queue.put(frame, timeout=_PUT_TIMEOUT)
+                return
+            except queue.Full:
+                if self.drop_frames:
+                    try:
+                        self._queue.get_nowait()
+                        self.nb_dropped += 1
+                    except queue.Empty:
+                        pass
+
+    def run(self) -> None:
+        """Runs the simulation until it ends or the producer is stopped."""
+        frames = iter(self.frames)
+        try:
+            for frame in frames:
+                if self._stop_event.is_set():
+                    break
+                self.nb_produced += 1
+                self._put(frame.copy())
+        finally:
+            close = getattr(frames, "close", None)
+            if close is not None:
+                close()
+            self._put(_END)
+
+    def stop(self) -> None:
+        """Stops the simulation."""
+        self._stop_event.set()
+
+    def next_frame(self, block: bool = False) -> Optional[np.ndarray]:
+        """Gets the next frame to display.
+
+        :param block: whether to wait for a frame if none is available.
+        :returns: the latest frame (and the older ones are dropped) if frames are dropped, the
+            oldest frame otherwise, or None if no frame is available.
+        """
+        latest: Optional[np.ndarray] = None
+        while not self.finished:
+            try:
+                frame = self._queue.get(block=block and latest is None)
+            except queue.Empty:
+                break
+            if frame is _END:
+                self.finished = True
+                break
+            if latest is not None:
+                self.nb_dropped += 1
+            latest = frame
+            if not self.drop_frames:
+                break
+        return latest
+
+
+class Renderer:
+    """Displays the frames of a producer in a single image updated with blitting."""
+
+    def __init__(self, producer: FrameProducer, fps: float, profiler: Optional[Profiler] = None):
+        """Renderer constructor.
+
+        :param producer: producer of the frames.
+        :param fps: number of frames per second.
+        :param profiler: if given, the time spent drawing the frames is recorded.
+        """
+        self.producer: FrameProducer = producer
+        self.fps: float = fps
+        self.profiler: Optional[Profiler] = profiler
+        self._image: Optional[AxesImage] = None
+        self._animation: Optional[animation.FuncAnimation] = None
+
+    def _update(self, _: int) -> tuple[AxesImage, ...]:
+        """Updates the image with the next frame, if any.
+
+        :returns: updated artists.
+        """
+        if self._image is None:
+            return ()
+        frame = self.producer.next_frame()
+        if frame is not None:
+            self._image.set_data(frame)
+        elif (
+            self.producer.finished
+            and self._animation is not None
+            and self._animation.event_source is not None
+        ):
+            self._animation.event_source.stop()
+        return (self._image,)
+
+    @staticmethod
+    def _profile_drawing(image: AxesImage, profiler: Profiler) -> None:
+        """Records the time spent drawing an image every time it is drawn.
+
+        :param image: image.
+        :param profiler: profiler receiving the drawing times.
+        """
+        draw = image.draw
+
+        def _draw(*args: Any, **kwargs: Any) -> Any:
+            with profiler.phase(Phase.DRAW):
+                return draw(*args, **kwargs)
+
+        image.draw = _draw  # type: ignore[method-assign]
+
+    def animate(self, fig: Figure) -> Optional[animation.FuncAnimation]:
+        """Starts the producer and animates its frames in a figure.
+
+        :param fig: figure to draw into.
+        :returns: the animation, or None if the simulation produced no frame.
+        """
+        self.producer.start()
+        first_frame = self.producer.next_frame(block=True)
+        if first_frame is None:
+            return None
+
+        axes = fig.add_subplot()
+        self._image = axes.imshow(first_frame, cmap="binary", vmin=0, vmax=1, animated=True)
+        if self.profiler is not None:
+            self._profile_drawing(self._image, self.profiler)
+        self._animation = animation.FuncAnimation(
+            fig,
+            self._update,
+            frames=itertools.count(),
+            interval=1000 / self.fps,
+            blit=True,
+            cache_frame_data=False,
+        )
+        return self._animation
+
+    def show(self) -> None:
+        """Displays the animation until the window is closed, then stops the producer."""
+        fig = plt.figure()
+        try:
+            self.animate(fig)
+            plt.show()
+        finally:
+            self.producer.stop()
+            self.producer.join(timeout=_STOP_TIMEOUT)
@@ -0,0 +1,103 @@
+"""This module contains the messages exchanged between the coordinator and the workers of a
+distributed simulation.
+
+A message is a JSON header, prefixed by its size, followed by the raw bytes of the numpy arrays it
+carries (their dtypes and shapes being given by the header). Boundary strips exchanged between
+neighboring workers at every generation don't use messages: both sides know their length, so they
+are sent as raw bytes, with 8 cells per byte.
+"""
+
+import json
+import socket
+import struct
+from typing import Any
+
+import numpy as np
+
+_SIZE = struct.Struct("<I")
+
+Header = dict[str, Any]
+
+
+def receive_exactly(connection: socket.socket, size: int) -> bytes:
+    """Receives a number of bytes.
+
+    :param connection: connection.
+    :param size: number of bytes.
+    :returns: bytes received.
+    """
+    buffer = bytearray(size)
+    view = memoryview(buffer)
+    received = 0
+    while received < size:
+        nb_bytes = connection.recv_into(view[received:])
+        if not nb_bytes:
+            raise ConnectionError("Connection closed by the peer")
+        received += nb_bytes
+    return bytes(buffer)
+
+
+def send_message(connection: socket.socket, header: Header, *arrays: np.ndarray) -> None:
+    """Sends a message.
+
+    :param connection: connection.
+    :param header: header of the message, serializable as JSON.
+    :param arrays: arrays carried by the message.
+    """
+    header = {**header, "arrays": [[array.dtype.str, list(array.shape)] for array in arrays]}
+    encoded = json.dumps(header).encode()
+    connection.sendall(
+        b"".join(
+            [_SIZE.pack(len(encoded)), encoded]
+            + [np.ascontiguousarray(array).tobytes() for array in arrays]
+        )
+    )
+
+
+def receive_message(connection: socket.socket) -> tuple[Header, list[np.ndarray]]:
+    """Receives a message.
+
+    :param connection: connection.
+    :returns: header of the message and arrays it carries.
+    """
+    (size,) = _SIZE.unpack(receive_exactly(connection, _SIZE.size))
+    header = json.loads(receive_exactly(connection, size))
+    arrays = []
+    for dtype_name, shape in header.pop("arrays"):
+        dtype = np.dtype(dtype_name)
+        count = int(np.prod(shape, dtype=np.int64))
+        data = receive_exactly(connection, count * dtype.itemsize)
+        arrays.append(np.frombuffer(data, dtype=dtype).reshape(shape).copy())
+    return header, arrays
+
+
+def send_strip(connection: socket.socket, strip: np.ndarray) -> None:
+    """Sends a boundary strip of cells.
+
+    :param connection: connection to the neighboring worker.
+    :param strip: one-dimensional array of cells.
+    """
+    connection.sendall(np.packbits(strip != 0).tobytes())
+
+
+def receive_strip(connection: socket.socket, length: int) -> np.ndarray:
+    """Receives a boundary strip of cells.
+
+    :param connection: connection to the neighboring worker.
+    :param length: number of cells of the strip.
+    :returns: one-dimensional ``uint8`` array of cells.
+    """
+    data = receive_exactly(connection, -(-length // 8))
+    return np.unpackbits(np.frombuffer(data, dtype=np.uint8), count=length)
+
+
+def parse_address(address: str) -> tuple[str, int]:
+    """Parses the address of a worker.
+
+    :param address: address, as ``HOST:PORT``.
+    :returns: host and port.
+    """
+    host, separator, port = address.rpartition(":")
+    if not separator or not host or not port.isdigit():
+        raise ValueError(f"Invalid address: '{address}' (expected HOST:PORT)")
+    return host, int(port)
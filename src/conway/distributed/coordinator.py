@@ -0,0 +1,192 @@
+"""This module contains the coordinator of a distributed simulation.
+
+The grid is split into a layout of rectangular blocks, one per worker (see
+``conway.distributed.worker``), chosen so that the boundary strips exchanged at every generation
+are as short as possible. Workers are only addressed by ``HOST:PORT``, so that they can run on the
+same machine or on several ones.
+
+Once the blocks are sent, the grid only lives on the workers: the coordinator asks them to compute
+a number of generations, which only involves exchanges between neighboring workers, and gathers
+their population or their blocks on demand.
+"""
+
+import socket
+from types import TracebackType
+from typing import Iterator, Optional, Sequence, Type, Union
+
+import numpy as np
+
+from ..engine.rule import CONWAY, Rule
+from .connection import parse_address, receive_message, send_message
+
+Address = Union[str, tuple[str, int]]
+
+
+def choose_layout(nb_workers: int, shape: tuple[int, int]) -> tuple[int, int]:
+    """Chooses how to split a grid into blocks.
+
+    :param nb_workers: number of blocks.
+    :param shape: shape of the grid.
+    :returns: number of rows and columns of blocks minimizing the length of the boundaries.
+    """
+    layouts = [
+        (rows, nb_workers // rows)
+        for rows in range(1, nb_workers + 1)
+        if nb_workers % rows == 0 and rows <= shape[0] and nb_workers // rows <= shape[1]
+    ]
+    if not layouts:
+        raise ValueError(f"A grid of shape {shape} can't be split into {nb_workers} blocks")
+    return min(layouts, key=lambda layout: (layout[0] - 1) * shape[1] + (layout[1] - 1) * shape[0])
+
+
+def split(size: int, nb_parts: int) -> np.ndarray:
+    """Splits a range into parts of (almost) equal sizes.
+
+    :param size: size of the range.
+    :param nb_parts: number of parts.
+    :returns: bounds of the parts (``nb_parts + 1`` values).
+    """
+    return np.linspace(0, size, nb_parts + 1).round().astype(int)
+
+
+class Coordinator:
+    """Splits a grid between workers and drives its simulation."""
+
+    def __init__(
+        self,
+        addresses: Sequence[Address],
+        grid_array: np.ndarray,
+        layout: Optional[tuple[int, int]] = None,
+        rule: Rule = CONWAY,
+    ):
+        """Coordinator constructor: connect to the workers and send them their blocks.
+
+        :param addresses: addresses of the workers, as ``HOST:PORT`` or ``(host, port)``.
+        :param grid_array: initial grid.
+        :param layout: number of rows and columns of blocks (chosen if not given).
+        :param rule: rule.
+        """
+        self.addresses: list[tuple[str, int]] = [
+            parse_address(address) if isinstance(address, str) else address for address in addresses
+        ]
+        self.shape: tuple[int, int] = grid_array.shape
+        self.layout: tuple[int, int] = layout or choose_layout(len(addresses), self.shape)
+        if self.layout[0] * self.layout[1] != len(addresses):
+            raise ValueError(
+                f"Layout {self.layout} needs {self.layout[0] * self.layout[1]} workers but "
+                f"{len(addresses)} were given"
+            )
+        self.rule: Rule = rule
+        self.generation: int = 0
+        self.row_bounds: np.ndarray = split(self.shape[0], self.layout[0])
+        self.column_bounds: np.ndarray = split(self.shape[1], self.layout[1])
+        self._connections: list[socket.socket] = []
+
+        try:
+            for index, address in enumerate(self.addresses):
+                row, column = divmod(index, self.layout[1])
+                connection = socket.create_connection(address)
+                connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                self._connections.append(connection)
+                send_message(
+                    connection,
+                    {"kind": "init", "rule": str(rule), "neighbors": self._neighbors(row, column)},
+                    (grid_array[self._block(row, column)] != 0).view(np.uint8),
+                )
+        except BaseException:
+            self.close()
+            raise
+
+    def _block(self, row: int, column: int) -> tuple[slice, slice]:
+        """Gets the cells of a block.
+
+        :param row: row of the block in the layout.
+        :param column: column of the block in the layout.
+        :returns: slices of the block in the grid.
+        """
+        return (
+            slice(self.row_bounds[row], self.row_bounds[row + 1]),
+            slice(self.column_bounds[column], self.column_bounds[column + 1]),
+        )
+
+    def _neighbors(self, row: int, column: int) -> dict[str, tuple[str, int]]:
+        """Gets the addresses of the workers of the neighboring blocks.
+
+        :param row: row of the block in the layout.
+        :param column: column of the block in the layout.
+        :returns: addresses, by side.
+        """
+        neighbors = {}
+        for side, (row_offset, column_offset) in {
+            "north": (-1, 0),
+            "south": (1, 0),
+            "west": (0, -1),
+            "east": (0, 1),
+        }.items():
+            neighbor_row, neighbor_column = row + row_offset, column + column_offset
+            if 0 <= neighbor_row < self.layout[0] and 0 <= neighbor_column < self.layout[1]:
+                neighbors[side] = self.addresses[neighbor_row * self.layout[1] + neighbor_column]
+        return neighbors
+
+    def step(self, generations: int = 1) -> int:
+        """Computes generations on every worker.
+
+        :param generations: number of generations to compute.
+        :returns: population of the grid.
+        """
+        for connection in self._connections:
+            send_message(connection, {"kind": "step", "generations": generations})
+        population = 0
+        for connection in self._connections:
+            header, _ = receive_message(connection)
+            population += header["population"]
+        self.generation += generations
+        return population
+
+    def gather(self) -> np.ndarray:
+        """Gathers the blocks of every worker.
+
+        :returns: grid of the current generation.
+        """
+        for connection in self._connections:
+            send_message(connection, {"kind": "gather"})
+        grid = np.zeros(self.shape, dtype=np.uint8)
+        for index, connection in enumerate(self._connections):
+            _, (cells,) = receive_message(connection)
+            grid[self._block(*divmod(index, self.layout[1]))] = cells
+        return grid
+
+    def generate(self, step: int = 1) -> Iterator[np.ndarray]:
+        """Yields the gathered grid every ``step`` generations, while it isn't empty (forever if
+        cells are born without living neighbors).
+
+        :param step: number of generations between two yielded grids.
+        :yield: grid.
+        """
+        endless = 0 in self.rule.birth
+        grid = self.gather()
+        while endless or grid.any():
+            yield grid
+            self.step(step)
+            grid = self.gather()
+
+    def close(self) -> None:
+        """Tells the workers to stop, and closes the connections."""
+        for connection in self._connections:
+            try:
+                send_message(connection, {"kind": "stop"})
+            except OSError:
+                pass
+            connection.close()
+        self._connections = []
+
+    def __enter__(self) -> "Coordinator":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.close()
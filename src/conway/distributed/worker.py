@@ -0,0 +1,200 @@
+"""This module contains the workers of a distributed simulation.
+
+A worker listens on a TCP port. The coordinator connects to it and sends it a rectangular block of
+the grid, along with the addresses of the workers holding the neighboring blocks. The worker then
+connects to its south and east neighbors and accepts the connections of its north and west ones,
+so that every pair of neighbors shares a connection.
+
+The block is stored with a halo of one cell on every side. At every generation, neighbors exchange
+their boundary rows, then their boundary columns including the halo rows, so that the corner cells
+reach the diagonal neighbors without connecting them. Only the halo comes from the other workers:
+the generation of the block is then computed locally, with whole-array operations (see
+``conway.engine.vectorized``). Halos on the edges of the grid stay dead.
+
+The coordinator drives the workers with messages (see ``conway.distributed.connection``): compute
+a number of generations (the worker answers with its population), send back the block, or stop.
+"""
+
+import multiprocessing
+import socket
+from typing import Optional
+
+import numpy as np
+
+from ..engine.rule import CONWAY, Rule, parse_rule
+from ..engine.vectorized import next_generation
+from .connection import receive_message, receive_strip, send_message, send_strip
+
+_OPPOSITE = {"north": "south", "south": "north", "west": "east", "east": "west"}
+
+
+def _connect(address: tuple[str, int]) -> socket.socket:
+    """Connects to a worker or a coordinator, without delaying small packets.
+
+    :param address: host and port.
+    :returns: connection.
+    """
+    connection = socket.create_connection(address)
+    connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    return connection
+
+
+class Block:
+    """Block of the grid computed by a worker, surrounded by a halo of cells of its neighbors."""
+
+    def __init__(self, cells: np.ndarray, peers: dict[str, socket.socket], rule: Rule):
+        """Block constructor.
+
+        :param cells: cells of the block.
+        :param peers: connections to the neighboring workers, by side (north, south, west, east).
+        :param rule: rule.
+        """
+        self.peers: dict[str, socket.socket] = peers
+        self.rule: Rule = rule
+        self.padded: np.ndarray = np.zeros((cells.shape[0] + 2, cells.shape[1] + 2), np.uint8)
+        self.padded[1:-1, 1:-1] = cells != 0
+
+    @property
+    def cells(self) -> np.ndarray:
+        """Cells of the block, without the halo.
+
+        :returns: view of the cells.
+        """
+        return self.padded[1:-1, 1:-1]
+
+    def _exchange(self, side: str, strip: np.ndarray, halo: np.ndarray) -> None:
+        """Exchanges boundary strips with a neighbor, if there is one on this side.
+
+        The north (or west) block of a pair sends first while the other one receives first, so
+        that both never wait for the other to receive a strip larger than the socket buffers.
+
+        :param side: side of the neighbor.
+        :param strip: boundary strip sent.
+        :param halo: view of the halo strip, updated in place with the strip received.
+        """
+        peer = self.peers.get(side)
+        if peer is None:
+            return
+        if side in ("south", "east"):
+            send_strip(peer, strip)
+            halo[...] = receive_strip(peer, len(halo))
+        else:
+            halo[...] = receive_strip(peer, len(halo))
+            send_strip(peer, strip)
+
+    def exchange(self) -> None:
+        """Exchanges the boundary strips with the neighbors, updating the halo."""
+        padded = self.padded
+        self._exchange("north", padded[1, 1:-1], padded[0, 1:-1])
+        self._exchange("south", padded[-2, 1:-1], padded[-1, 1:-1])
+        # Columns include the halo rows received above, so that corners reach diagonal neighbors.
+        self._exchange("west", padded[:, 1], padded[:, 0])
+        self._exchange("east", padded[:, -2], padded[:, -1])
+
+    def step(self) -> None:
+        """Computes the next generation of the block."""
+        self.exchange()
+        self.padded[1:-1, 1:-1] = next_generation(self.padded, self.rule)[1:-1, 1:-1]
+
+
+def _open_session(listener: socket.socket) -> tuple[socket.socket, Block]:
+    """Accepts the coordinator and the neighbors, and connects to the other neighbors.
+
+    Neighbors may connect before the coordinator: connections are told apart by their first
+    message.
+
+    :param listener: listening socket of the worker.
+    :returns: connection to the coordinator and block of the worker.
+    """
+    coordinator: Optional[socket.socket] = None
+    cells = np.zeros((0, 0), dtype=np.uint8)
+    rule = CONWAY
+    peers: dict[str, socket.socket] = {}
+    nb_peers = 0
+    while coordinator is None or len(peers) < nb_peers:
+        connection, _ = listener.accept()
+        connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        header, arrays = receive_message(connection)
+        if header["kind"] == "peer":
+            peers[header["side"]] = connection
+            continue
+
+        coordinator, (cells,) = connection, arrays
+        rule = parse_rule(header["rule"])
+        neighbors = header["neighbors"]
+        for side in ("south", "east"):
+            if side in neighbors:
+                peer = _connect(tuple(neighbors[side]))
+                send_message(peer, {"kind": "peer", "side": _OPPOSITE[side]})
+                peers[side] = peer
+        nb_peers = len(neighbors)
+    return coordinator, Block(cells, peers, rule)
+
+
+def run_session(listener: socket.socket) -> None:
+    """Computes a block of the grid for a coordinator, until it asks to stop.
+
+    :param listener: listening socket of the worker.
+    """
+    coordinator, block = _open_session(listener)
+    generation = 0
+    try:
+        while True:
+            header, _ = receive_message(coordinator)
+            if header["kind"] == "step":
+                for _ in range(header["generations"]):
+                    block.step()
+                generation += header["generations"]
+                population = int(np.count_nonzero(block.cells))
+                send_message(coordinator, {"generation": generation, "population": population})
+            elif header["kind"] == "gather":
+                send_message(coordinator, {"generation": generation}, block.cells.copy())
+            else:
+                return
+    finally:
+        for peer in block.peers.values():
+            peer.close()
+        coordinator.close()
+
+
+def serve(
+    host: str = "0.0.0.0",
+    port: int = 0,
+    nb_sessions: Optional[int] = None,
+    ready: Optional["multiprocessing.Queue[int]"] = None,
+) -> None:
+    """Listens for coordinators and computes their blocks, one session at a time.
+
+    :param host: host to listen on.
+    :param port: port to listen on (0 to pick a free port).
+    :param nb_sessions: number of sessions after which the worker stops (never if not given).
+    :param ready: if given, queue receiving the port listened on once ready.
+    """
+    with socket.create_server((host, port)) as listener:
+        if ready is not None:
+            ready.put(listener.getsockname()[1])
+        session = 0
+        while nb_sessions is None or session < nb_sessions:
+            run_session(listener)
+            session += 1
+
+
+def start_local_workers(
+    nb_workers: int, nb_sessions: Optional[int] = 1
+) -> tuple[list[multiprocessing.Process], list[str]]:
+    """Starts workers listening on localhost, in subprocesses.
+
+    :param nb_workers: number of workers.
+    :param nb_sessions: number of sessions after which every worker stops (never if not given).
+    :returns: processes and addresses (``HOST:PORT``) of the workers.
+    """
+    ready: "multiprocessing.Queue[int]" = multiprocessing.Queue()
+    processes = [
+        multiprocessing.Process(
+            target=serve, args=("127.0.0.1", 0, nb_sessions, ready), daemon=True
+        )
+        for _ in range(nb_workers)
+    ]
+    for process in processes:
+        process.start()
+    return processes, [f"127.0.0.1:{ready.get(timeout=30)}" for _ in processes]
@@ -0,0 +1,274 @@
+"""This module contains the automatic choice of the engine and of the number of jobs.
+
+The fastest engine (and number of jobs, for the engines using several processes) depends on the
+size and the density of the grid and on the machine: processes cost more than they bring on small
+grids, whereas large dense grids benefit from them. The tuner times a few generations of every
+candidate on a copy of the actual grid and picks the fastest one. Decisions are cached in a JSON
+file, keyed by the shape of the grid, its density, the number of cpus, the rule and the size of the
+tiles, so that calibration only happens the first time a kind of workload is met.
+
+While the simulation runs, the population is checked regularly: when it changed drastically since
+the last decision (e.g. a random soup dying down to a few still lifes), the choice is evaluated
+again and the simulation continues with the new engine.
+
+Only the engines computing the same bounded grid are candidates: the hashlife and sparse engines,
+which run on an unbounded plane, are never chosen.
+"""
+
+import json
+import os
+import time
+from pathlib import Path
+from typing import Callable, Iterator, NamedTuple, Optional, Union
+
+import numpy as np
+
+from .engine import Engine
+from .rule import CONWAY, Rule
+
+_CALIBRATION_GENERATIONS = 5
+_CALIBRATION_SECONDS = 2.0
+_CHECK_EVERY = 32
+_POPULATION_FACTOR = 4.0
+
+
+class Choice(NamedTuple):
+    """Engine and number of jobs used to compute a simulation."""
+
+    engine: Engine
+    jobs: int
+
+
+Generate = Callable[[np.ndarray, Choice], Iterator[np.ndarray]]
+
+
+def default_cache_path() -> Path:
+    """Gets the default path of the cache of the decisions.
+
+    :returns: path of the cache, in the user's cache directory.
+    """
+    cache_home = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(cache_home) / "conway" / "autotune.json"
+
+
+def candidates(
+    engine: Optional[Engine] = None,
+    jobs: Optional[int] = None,
+    rule: Rule = CONWAY,
+    nb_cpu: Optional[int] = None,
+) -> list[Choice]:
+    """Lists the choices to calibrate.
+
+    :param engine: engine to use, or None to try every engine computing a bounded grid.
+    :param jobs: number of jobs to use, or None to try powers of 2 up to the number of cpus.
+    :param rule: rule, excluding the engines that don't support it.
+    :param nb_cpu: number of cpus (detected if not given).
+    :returns: choices.
+    """
+    nb_cpu = nb_cpu or os.cpu_count() or 1
+    if engine is not None:
+        engines = [engine]
+    else:
+        engines = [Engine.NUMPY, Engine.SHARED, Engine.SETS]
+        if rule == CONWAY:
+            engines.insert(0, Engine.BITPACKED)
+        if 0 in rule.birth:
+            engines.remove(Engine.SETS)
+
+    if jobs is not None:
+        jobs_candidates = [jobs]
+    else:
+        jobs_candidates = sorted({1 << power for power in range(nb_cpu.bit_length())} | {nb_cpu})
+        jobs_candidates = [job for job in jobs_candidates if job <= nb_cpu]
+
+    return [
+        Choice(candidate, job)
+        for candidate in engines
+        for job in (jobs_candidates if candidate in (Engine.SETS, Engine.SHARED) else [1])
+    ]
+
+
+def time_choice(
+    grid_array: np.ndarray,
+    choice: Choice,
+    generate_frames: Generate,
+    generations: int = _CALIBRATION_GENERATIONS,
+    max_seconds: float = _CALIBRATION_SECONDS,
+) -> float:
+    """Times a few generations of a choice on a copy of a grid. The first frame (initial grid)
+    isn't timed, so that the start of the workers isn't either.
+
+    :param grid_array: grid array (left untouched).
+    :param choice: engine and number of jobs.
+    :param generate_frames: function yielding the frames of a grid computed with a choice.
+    :param generations: number of generations timed.
+    :param max_seconds: time after which no generation is started anymore.
+    :returns: mean time per generation, in seconds.
+    """
+    frames = generate_frames(grid_array.copy(), choice)
+    try:
+        if next(frames, None) is None:
+            return 0.0
+        computed = 0
+        start = time.perf_counter()
+        for _ in frames:
+            computed += 1
+            if computed >= generations or time.perf_counter() - start >= max_seconds:
+                break
+        return (time.perf_counter() - start) / max(computed, 1)
+    finally:
+        close = getattr(frames, "close", None)
+        if close is not None:
+            close()
+
+
+class Autotuner:
+    """Chooses the fastest engine and number of jobs for a grid, caching its decisions."""
+
+    def __init__(
+        self,
+        generate_frames: Generate,
+        choices: list[Choice],
+        cache_path: Optional[Union[str, Path]] = None,
+        key_suffix: str = "",
+    ):
+        """Autotuner constructor.
+
+        :param generate_frames: function yielding the frames of a grid computed with a choice.
+        :param choices: choices to calibrate.
+        :param cache_path: path of the cache of the decisions (see ``default_cache_path`` if not
+            given).
+        :param key_suffix: description of the other parameters of the simulation (rule, tiles...)
+            the decisions depend on.
+        """
+        if not choices:
+            raise ValueError("At least one choice must be given")
+
+        self.generate_frames: Generate = generate_frames
+        self.choices: list[Choice] = choices
+        self.cache_path: Path = Path(cache_path) if cache_path else default_cache_path()
+        self.key_suffix: str = key_suffix
+        self.timings: dict[Choice, float] = {}
+
+    def key(self, grid_array: np.ndarray) -> str:
+        """Gets the key of the decision for a grid.
+
+        :param grid_array: grid array.
+        :returns: shape of the grid, density, number of cpus and other parameters.
+        """
+        density = np.count_nonzero(grid_array) / max(grid_array.size, 1)
+        height, width = grid_array.shape
+        return f"{height}x{width}/{density:.2f}/{os.cpu_count()}/{self.key_suffix}"
+
+    def _read_cache(self) -> dict[str, dict]:
+        """Reads the cached decisions.
+
+        :returns: decisions, by key.
+        """
+        try:
+            return json.loads(self.cache_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+
+    def _write_cache(self, key: str, choice: Choice) -> None:
+        """Adds a decision to the cache.
+
+        :param key: key of the decision.
+        :param choice: choice made.
+        """
+        cache = self._read_cache()
+        cache[key] = {"engine": choice.engine.value, "jobs": choice.jobs}
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            temporary = self.cache_path.with_name(f".{self.cache_path.name}.tmp")
+            temporary.write_text(json.dumps(cache, indent=2), encoding="utf-8")
+            os.replace(temporary, self.cache_path)
+        except OSError:
+            pass
+
+    def calibrate(self, grid_array: np.ndarray) -> Choice:
+        """Times every choice on a grid.
+
+        :param grid_array: grid array (left untouched).
+        :returns: fastest choice.
+        """
+        self.timings = {
+            choice: time_choice(grid_array, choice, self.generate_frames) for choice in self.choices
+        }
+        return min(self.timings, key=self.timings.__getitem__)
+
+    def choose(self, grid_array: np.ndarray) -> Choice:
+        """Chooses the engine and number of jobs for a grid, calibrating them if the decision
+        isn't cached yet.
+
+        :param grid_array: grid array (left untouched).
+        :returns: choice.
+        """
+        if len(self.choices) == 1:
+            return self.choices[0]
+
+        key = self.key(grid_array)
+        cached = self._read_cache().get(key)
+        if cached is not None:
+            choice = Choice(Engine(cached["engine"]), cached["jobs"])
+            if choice in self.choices:
+                return choice
+
+        choice = self.calibrate(grid_array)
+        self._write_cache(key, choice)
+        return choice
+
+
+def generate(  # pylint: disable=too-many-arguments
+    grid_array: np.ndarray,
+    tuner: Autotuner,
+    check_every: int = _CHECK_EVERY,
+    population_factor: float = _POPULATION_FACTOR,
+    on_choice: Optional[Callable[[int, Choice], None]] = None,
+    run: Optional[Generate] = None,
+) -> Iterator[np.ndarray]:
+    """Yields a new grid accordingly to Conway's rules, computed with the engine and number of
+    jobs chosen by a tuner. The choice is evaluated again when the population changes drastically.
+
+    The grid is updated in place so that the yielded array is always ``grid_array``.
+
+    :param grid_array: array to update.
+    :param tuner: tuner choosing the engine and number of jobs.
+    :param check_every: number of generations between two checks of the population.
+    :param population_factor: ratio between the current population and the population at the
+        last choice above which (or below the inverse of which) the choice is evaluated again.
+    :param on_choice: function called with the generation and the choice, every time one is made.
+    :param run: function yielding the frames of the grid computed with the choice made, if they
+        must be computed differently than when they are measured (``tuner.generate_frames`` if not
+        given).
+    :yield: updated grid.
+    """
+    generation = 0
+    first = True
+    while True:
+        choice = tuner.choose(grid_array)
+        if on_choice is not None:
+            on_choice(generation, choice)
+        population = max(int(np.count_nonzero(grid_array)), 1)
+        frames = (run or tuner.generate_frames)(grid_array, choice)
+        try:
+            # Every engine yields the current grid first, which was already yielded unless it is
+            # the initial one.
+            if not first and next(frames, None) is None:
+                return
+            first = False
+            for frame in frames:
+                if frame is not grid_array:
+                    grid_array[...] = frame
+                yield grid_array
+                generation += 1
+                if generation % check_every == 0:
+                    ratio = max(int(np.count_nonzero(grid_array)), 1) / population
+                    if ratio > population_factor or ratio < 1 / population_factor:
+                        break
+            else:
+                return
+        finally:
+            close = getattr(frames, "close", None)
+            if close is not None:
+                close()
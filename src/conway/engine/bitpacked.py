@@ -0,0 +1,171 @@
+"""This module contains a bit-packed representation of the grid and its evolution.
+
+Every row of the grid is stored as ``uint64`` words holding 64 cells each: the cell of column ``j``
+is the bit ``j % 64`` of the word ``j // 64``. A generation is computed with bitwise adders applied
+to whole words, so that 64 cells are updated by every operation.
+"""
+
+from typing import Generator, Optional
+
+import numpy as np
+
+from .changes import ChangeTracker
+
+_ONE = np.uint64(1)
+_LAST_BIT = np.uint64(63)
+_WORD_SIZE = 64
+
+
+def pack(array: np.ndarray) -> np.ndarray:
+    """Packs a grid array into ``uint64`` words.
+
+    :param array: grid array.
+    :returns: array of shape ``(rows, ceil(columns / 64))`` containing the packed grid.
+    """
+    nb_rows, nb_columns = array.shape
+    nb_words = -(-nb_columns // _WORD_SIZE)
+    packed_bytes = np.zeros((nb_rows, nb_words * 8), dtype=np.uint8)
+    packed_bytes[:, : -(-nb_columns // 8)] = np.packbits(array != 0, axis=1, bitorder="little")
+    return packed_bytes.view("<u8")
+
+
+def unpack(packed: np.ndarray, width: int, dtype: np.dtype = np.dtype(np.uint8)) -> np.ndarray:
+    """Unpacks a packed grid into a grid array.
+
+    :param packed: packed grid.
+    :param width: number of columns of the grid.
+    :param dtype: dtype of the returned array.
+    :returns: grid array of shape ``(rows, width)``.
+    """
+    packed_bytes = np.ascontiguousarray(packed, dtype="<u8").view(np.uint8)
+    bits = np.unpackbits(packed_bytes, axis=1, count=width, bitorder="little")
+    return bits.astype(dtype, copy=False)
+
+
+def _shift_columns(words: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Shifts every row of a packed grid by one column in both directions.
+
+    :param words: packed grid.
+    :returns: ``(west, east)`` packed grids, where each cell holds the value of its west (resp.
+        east) neighbor.
+    """
+    west = words << _ONE
+    west[:, 1:] |= words[:, :-1] >> _LAST_BIT
+    east = words >> _ONE
+    east[:, :-1] |= words[:, 1:] << _LAST_BIT
+    return west, east
+
+
+def _shift_rows(words: np.ndarray, offset: int) -> np.ndarray:
+    """Shifts a packed grid by one row.
+
+    :param words: packed grid.
+    :param offset: 1 to get the north neighbors of every cell, -1 to get the south ones.
+    :returns: shifted packed grid, padded with dead cells.
+    """
+    shifted = np.zeros_like(words)
+    if offset > 0:
+        shifted[1:] = words[:-1]
+    else:
+        shifted[:-1] = words[1:]
+    return shifted
+
+
+def step(packed: np.ndarray, width: int) -> np.ndarray:
+    """Computes the next generation of a packed grid according to Conway's rules.
+
+    The 8 neighbors of every cell are summed with bitwise adders: the 3 cells of every row are
+    first summed into 2-bit numbers, then the rows above and below are added to the row of the
+    cell (without the cell itself). A cell is alive at the next generation if this sum is 3, or
+    if it is 2 and the cell is alive.
+
+    :param packed: packed grid.
+    :param width: number of columns of the grid.
+    :returns: packed grid of the next generation.
+    """
+    west, east = _shift_columns(packed)
+
+    # Sums of the 3 cells of every row (ones and twos), and of the 2 neighbors of every cell.
+    row_ones = west ^ packed ^ east
+    row_twos = (west & packed) | (east & (west ^ packed))
+    middle_ones = west ^ east
+    middle_twos = west & east
+
+    north_ones, south_ones = _shift_rows(row_ones, 1), _shift_rows(row_ones, -1)
+    north_twos, south_twos = _shift_rows(row_twos, 1), _shift_rows(row_twos, -1)
+
+    ones = north_ones ^ middle_ones ^ south_ones
+    carry = (north_ones & middle_ones) | (south_ones & (north_ones ^ middle_ones))
+
+    # The number of neighbors is ``ones + 2 * twos`` where ``twos`` is the number of set bits among
+    # the 4 following words: it is either 2 or 3 if and only if exactly one of them is set.
+    odd_twos = north_twos ^ middle_twos ^ south_twos ^ carry
+    several_twos = (
+        (north_twos & middle_twos)
+        | (south_twos & carry)
+        | ((north_twos ^ middle_twos) & (south_twos ^ carry))
+    )
+    next_packed = odd_twos & ~several_twos & (ones | packed)
+
+    remaining_bits = width % _WORD_SIZE
+    if remaining_bits:
+        next_packed[:, -1] &= np.uint64((1 << remaining_bits) - 1)
+    return next_packed
+
+
+def _set_cells(words: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Gets the cells whose bit is set in packed words, only unpacking the words that aren't 0.
+
+    :param words: packed grid.
+    :returns: rows and columns of the cells.
+    """
+    rows, word_columns = np.nonzero(words)
+    bits = np.unpackbits(
+        np.ascontiguousarray(words[rows, word_columns], dtype="<u8").view(np.uint8).reshape(-1, 8),
+        axis=1,
+        bitorder="little",
+    )
+    indices, offsets = np.nonzero(bits)
+    return rows[indices], word_columns[indices] * _WORD_SIZE + offsets
+
+
+def changed_cells(
+    packed: np.ndarray, next_packed: np.ndarray, width: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """Gets the cells born and dead between two packed generations, by comparing whole words.
+
+    :param packed: packed grid of the previous generation.
+    :param next_packed: packed grid of the generation.
+    :param width: number of columns of the grid.
+    :returns: flat indices of the cells born and of the cells dead.
+    """
+    born_rows, born_columns = _set_cells(next_packed & ~packed)
+    dead_rows, dead_columns = _set_cells(packed & ~next_packed)
+    return born_rows * width + born_columns, dead_rows * width + dead_columns
+
+
+def generate(
+    grid_array: np.ndarray, tracker: Optional[ChangeTracker] = None
+) -> Generator[np.ndarray, None, None]:
+    """Yields a new grid accordingly to Conway's rules, computed on the bit-packed grid.
+
+    The grid is updated in place so that the yielded array is always ``grid_array``.
+
+    :param grid_array: array to update.
+    :param tracker: if given, tracker updated with the cells of the words that changed.
+    :yield: updated grid.
+    """
+    width = grid_array.shape[1]
+    packed = pack(grid_array)
+    if tracker is not None:
+        tracker.reset(grid_array)
+
+    while packed.any():
+        grid_array[...] = unpack(packed, width)
+        yield grid_array
+
+        next_packed = step(packed, width)
+        if tracker is not None:
+            tracker.update(*changed_cells(packed, next_packed, width))
+        packed = next_packed
+    grid_array[...] = 0
@@ -0,0 +1,121 @@
+"""This module contains the trackers of the cells changing state during a simulation.
+
+Statistics (see ``conway.engine.statistics``) and cycle detection (see ``conway.engine.cycle``) are
+both maintained from the cells born and dead at each generation, so that they cost O(changes) per
+generation instead of O(area). The engines report these cells to a tracker from the state they
+already hold: the sets engine from its sets of positions, tiles from the tiles that changed, the
+bit-packed engine from the words that changed, and the other dense engines by comparing their two
+generation buffers, without allocating any grid. Only the frames of the hashlife and sparse
+engines, which don't keep the previous generation of the grid, are copied and compared (see
+``track_changes``).
+"""
+
+import abc
+from typing import Iterable, Iterator, Optional
+
+import numpy as np
+
+
+class ChangeTracker(abc.ABC):
+    """Base of the objects maintained from the cells changing state."""
+
+    def __init__(self, shape: tuple[int, int]):
+        """ChangeTracker constructor.
+
+        :param shape: shape of the grid.
+        """
+        self.shape: tuple[int, int] = shape
+
+    @abc.abstractmethod
+    def reset(self, array: np.ndarray, generation: Optional[int] = None) -> None:
+        """Computes the tracked state from a whole grid.
+
+        :param array: grid array.
+        :param generation: generation of the grid (the current one is kept if not given, e.g. when
+            the engine computing the simulation changes).
+        """
+
+    @abc.abstractmethod
+    def update(self, born: np.ndarray, dead: np.ndarray, generations: int = 1) -> None:
+        """Updates the tracked state with the cells that changed state since the last update.
+
+        :param born: flat indices of the cells that were born.
+        :param dead: flat indices of the cells that died.
+        :param generations: number of generations since the last update.
+        """
+
+    def update_cells(self, born: set[tuple], dead: set[tuple], generations: int = 1) -> None:
+        """Updates the tracked state with the positions of the cells that changed state since the
+        last update.
+
+        :param born: positions of the cells that were born.
+        :param dead: positions of the cells that died.
+        :param generations: number of generations since the last update.
+        """
+        born_indices, dead_indices = (
+            np.ravel_multi_index(tuple(np.asarray(list(cells)).T), self.shape)
+            if cells
+            else np.zeros(0, dtype=np.intp)
+            for cells in (born, dead)
+        )
+        self.update(born_indices, dead_indices, generations)
+
+
+class ChangeTrackers(ChangeTracker):
+    """Reports the cells changing state to several trackers."""
+
+    def __init__(self, trackers: list[ChangeTracker]):
+        """ChangeTrackers constructor.
+
+        :param trackers: trackers of the same grid.
+        """
+        super().__init__(trackers[0].shape)
+        self.trackers: list[ChangeTracker] = trackers
+
+    def reset(self, array: np.ndarray, generation: Optional[int] = None) -> None:
+        for tracker in self.trackers:
+            tracker.reset(array, generation)
+
+    def update(self, born: np.ndarray, dead: np.ndarray, generations: int = 1) -> None:
+        for tracker in self.trackers:
+            tracker.update(born, dead, generations)
+
+
+def changed_cells(
+    cells: np.ndarray, previous: np.ndarray, mask: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """Gets the cells born and dead between two generations, comparing them into a preallocated
+    mask so that only the indices of the changes are allocated.
+
+    :param cells: grid array of the generation (living cells are 1).
+    :param previous: grid array of the previous generation (living cells are 1).
+    :param mask: boolean array of the shape of the grid, overwritten.
+    :returns: flat indices of the cells born and of the cells dead.
+    """
+    np.greater(cells, previous, out=mask)
+    born = np.flatnonzero(mask)
+    np.less(cells, previous, out=mask)
+    return born, np.flatnonzero(mask)
+
+
+def track_changes(
+    frames: Iterable[np.ndarray], tracker: ChangeTracker, step: int = 1
+) -> Iterator[np.ndarray]:
+    """Yields frames, updating a tracker with the changes between consecutive frames, which are
+    obtained by comparing every frame with a copy of the previous one.
+
+    :param frames: frames of the simulation (possibly always the same array updated in place).
+    :param tracker: tracker of the cells changing state.
+    :param step: number of generations between two frames.
+    :yield: frames.
+    """
+    previous: Optional[np.ndarray] = None
+    mask: Optional[np.ndarray] = None
+    for frame in frames:
+        if previous is None or mask is None:
+            tracker.reset(frame)
+            previous, mask = frame != 0, np.empty(frame.shape, dtype=bool)
+        else:
+            tracker.update(*changed_cells(frame, previous, mask), step)
+            np.not_equal(frame, 0, out=previous)
+        yield frame
@@ -0,0 +1,117 @@
+"""This module contains the detection of cycles (still lifes and oscillations) in a simulation.
+
+Every state of the grid is fingerprinted with a Zobrist hash: each cell is given a random 64-bit
+key, and the hash of a state is the XOR of the keys of its living cells. Since a cell changing state
+toggles its key, the hash is updated in O(changes) from the births and deaths of each generation,
+reported by the engines (see ``conway.engine.changes``).
+"""
+
+from collections import deque
+from typing import Iterable, Iterator, NamedTuple, Optional
+
+import numpy as np
+
+from .changes import ChangeTracker
+
+_DEFAULT_MAX_HISTORY = 1024
+
+
+class Cycle(NamedTuple):
+    """Cycle entered by a simulation."""
+
+    start: int
+    period: int
+
+
+class CycleDetector(ChangeTracker):
+    """Detects when a simulation enters a cycle by comparing hashes of its recent states."""
+
+    def __init__(
+        self, shape: tuple[int, int], max_history: int = _DEFAULT_MAX_HISTORY, seed: int = 0
+    ):
+        """CycleDetector constructor.
+
+        :param shape: shape of the grid.
+        :param max_history: number of hashes kept, i.e. longest period that can be detected.
+        :param seed: seed of the random keys of the cells.
+        """
+        super().__init__(shape)
+        self._keys: np.ndarray = np.random.default_rng(seed).integers(
+            0, np.iinfo(np.uint64).max, size=shape[0] * shape[1], dtype=np.uint64, endpoint=True
+        )
+        self._history: dict[int, int] = {}
+        self._order: deque[tuple[int, int]] = deque(maxlen=max_history)
+        self.hash: int = 0
+        self.generation: int = 0
+        self.cycle: Optional[Cycle] = None
+
+    def reset(self, array: np.ndarray, generation: Optional[int] = None) -> None:
+        """Hashes the given state.
+
+        :param array: grid array.
+        :param generation: generation of the grid, whose history is then forgotten. If not given,
+            the state is the current one (e.g. when the engine computing the simulation changes)
+            and the history is kept.
+        """
+        self.hash = int(np.bitwise_xor.reduce(self._keys[np.flatnonzero(array)]))
+        if generation is not None:
+            self._history.clear()
+            self._order.clear()
+            self.generation = generation
+            self.cycle = None
+        if not self._order:
+            self._record()
+
+    def update(self, born: np.ndarray, dead: np.ndarray, generations: int = 1) -> None:
+        """Updates the hash with the cells that changed state since the last update, and looks
+        for a cycle (see ``cycle``).
+
+        :param born: flat indices of the cells that were born.
+        :param dead: flat indices of the cells that died.
+        :param generations: number of generations since the last update.
+        """
+        self.hash ^= int(np.bitwise_xor.reduce(self._keys[born]))
+        self.hash ^= int(np.bitwise_xor.reduce(self._keys[dead]))
+        self.generation += generations
+        self._record()
+
+    def _record(self) -> Optional[Cycle]:
+        """Records the current hash, looking for it among the previous ones.
+
+        :returns: the cycle entered by the simulation, if any.
+        """
+        previous_generation = self._history.get(self.hash)
+        if previous_generation is not None and self.cycle is None:
+            self.cycle = Cycle(previous_generation, self.generation - previous_generation)
+
+        if len(self._order) == self._order.maxlen:
+            oldest_hash, oldest_generation = self._order.popleft()
+            if self._history.get(oldest_hash) == oldest_generation:
+                del self._history[oldest_hash]
+        self._order.append((self.hash, self.generation))
+        self._history[self.hash] = self.generation
+        return self.cycle
+
+    def steps_to(self, generation: int) -> int:
+        """Gets the number of generations to compute from the current state to reach a state
+        identical to the one of a future generation, once a cycle has been detected.
+
+        :param generation: generation to reach.
+        :returns: number of generations to compute (less than the period of the cycle).
+        """
+        if self.cycle is None:
+            return generation - self.generation
+        return (generation - self.generation) % self.cycle.period
+
+
+def track_cycles(frames: Iterable[np.ndarray], detector: CycleDetector) -> Iterator[np.ndarray]:
+    """Yields frames until the simulation enters a cycle.
+
+    :param frames: frames of the simulation, updating ``detector`` (see ``conway.engine.changes``).
+    :param detector: cycle detector.
+    :yield: frames, the first repeated state excluded.
+    """
+    for frame in frames:
+        if detector.cycle is not None:
+            return
+        yield frame
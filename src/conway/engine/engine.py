@@ -0,0 +1,15 @@
+"""This module contains the definition of the available engines."""
+
+from enum import Enum
+
+
+class Engine(Enum):
+    """All possible engines."""
+
+    SETS = "sets"
+    NUMPY = "numpy"
+    SHARED = "shared"
+    BITPACKED = "bitpacked"
+    HASHLIFE = "hashlife"
+    SPARSE = "sparse"
+    AUTO = "auto"
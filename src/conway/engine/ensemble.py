@@ -0,0 +1,238 @@
+"""This module contains the simulation of many boards at once.
+
+Boards of the same shape are stacked into a single batch array, and every generation of all of them
+is computed with the same whole-array operations (see ``conway.engine.vectorized``). Every board is
+fingerprinted at each generation with a Zobrist hash (see ``conway.engine.cycle``), the hashes of
+its last generations being kept in a ring buffer, so that a board entering a cycle is detected as
+soon as its current hash was seen during the previous generations. Boards are retired from the batch
+as soon as they die or enter a cycle, and a summary of each of them is emitted.
+"""
+
+from enum import Enum
+from typing import Callable, Iterator, NamedTuple, Optional
+
+import numpy as np
+
+from .rule import CONWAY, Rule
+from .vectorized import next_generation
+
+_DEFAULT_MAX_PERIOD = 64
+
+
+class BoardStatus(Enum):
+    """Final states of the boards of an ensemble."""
+
+    DIED = "died"
+    STILL = "still"
+    OSCILLATING = "oscillating"
+    RUNNING = "running"
+
+
+# Statuses are computed for every board as indices in this list.
+_STATUSES = [BoardStatus.DIED, BoardStatus.STILL, BoardStatus.OSCILLATING, BoardStatus.RUNNING]
+_DIED, _STILL, _OSCILLATING, _RUNNING = range(len(_STATUSES))
+
+
+class BoardSummary(NamedTuple):
+    """Summary of the simulation of a board of an ensemble."""
+
+    board: int
+    status: BoardStatus
+    generation: int
+    period: int
+    initial_population: int
+    final_population: int
+    max_population: int
+
+
+class Ensemble:
+    """Batch of boards computed together, retiring the boards that died or entered a cycle."""
+
+    def __init__(
+        self,
+        boards: np.ndarray,
+        max_period: int = _DEFAULT_MAX_PERIOD,
+        seed: int = 0,
+        first_board: int = 0,
+        rule: Rule = CONWAY,
+        on_retire: Optional[Callable[[BoardSummary, np.ndarray], None]] = None,
+    ):
+        """Ensemble constructor.
+
+        :param boards: stack of grid arrays, of shape ``(boards, height, width)``.
+        :param max_period: longest period of the cycles detected.
+        :param seed: seed of the random keys of the cells.
+        :param first_board: number of the first board, the others being numbered consecutively.
+        :param rule: rule.
+        :param on_retire: function called with the summary and the final state of every board
+            retired.
+        """
+        if boards.ndim != 3:
+            raise ValueError(f"Boards must be a 3-dimensional array but {boards.ndim} were given")
+        if max_period < 1:
+            raise ValueError(f"Maximum period must be positive but {max_period} was given")
+
+        self.boards: np.ndarray = (boards != 0).view(np.uint8).copy()
+        self.indices: np.ndarray = np.arange(first_board, first_board + len(boards))
+        self.max_period: int = max_period
+        self.rule: Rule = rule
+        self.on_retire: Optional[Callable[[BoardSummary, np.ndarray], None]] = on_retire
+        self.generation: int = 0
+        self._keys: np.ndarray = np.random.default_rng(seed).integers(
+            0, np.iinfo(np.uint64).max, size=boards.shape[1:], dtype=np.uint64, endpoint=True
+        )
+        self._history: np.ndarray = np.zeros((len(boards), max_period), dtype=np.uint64)
+
+        self.populations: np.ndarray = self.boards.sum(axis=(1, 2), dtype=np.int64)
+        self.initial_populations: np.ndarray = self.populations.copy()
+        self.max_populations: np.ndarray = self.populations.copy()
+        self._history[:, 0] = self._hashes()
+
+    def __len__(self) -> int:
+        return len(self.boards)
+
+    def _hashes(self) -> np.ndarray:
+        """Gets the hash of every board.
+
+        :returns: XOR of the keys of the living cells of every board.
+        """
+        return np.bitwise_xor.reduce(np.where(self.boards != 0, self._keys, 0), axis=(1, 2))
+
+    def _periods(self, hashes: np.ndarray) -> np.ndarray:
+        """Looks for the current hash of every board among the hashes of its previous generations.
+
+        :param hashes: current hash of every board.
+        :returns: period of the cycle entered by every board, or 0 if it didn't enter any.
+        """
+        nb_previous = min(self.generation, self.max_period)
+        # Number of generations between the current one and the one stored in every slot.
+        ages = (self.generation - 1 - np.arange(self.max_period)) % self.max_period + 1
+        matches = (self._history == hashes[:, np.newaxis]) & (ages <= nb_previous)
+        periods = np.where(matches, ages, self.max_period + 1).min(axis=1)
+        return np.where(periods <= self.max_period, periods, 0)
+
+    def _retire(self, retired: np.ndarray, statuses: np.ndarray, periods: np.ndarray) -> list:
+        """Removes boards from the batch.
+
+        :param retired: boolean mask of the boards to remove.
+        :param statuses: status of every board, as an index in ``_STATUSES``.
+        :param periods: period of the cycle entered by every board.
+        :returns: summaries of the removed boards.
+        """
+        summaries = [
+            BoardSummary(
+                board=int(self.indices[i]),
+                status=_STATUSES[statuses[i]],
+                generation=self.generation - int(periods[i]),
+                period=int(periods[i]),
+                initial_population=int(self.initial_populations[i]),
+                final_population=int(self.populations[i]),
+                max_population=int(self.max_populations[i]),
+            )
+            for i in np.flatnonzero(retired)
+        ]
+        if self.on_retire is not None:
+            for summary, board in zip(summaries, self.boards[retired]):
+                self.on_retire(summary, board)
+        kept = ~retired
+        self.boards = self.boards[kept]
+        self.indices = self.indices[kept]
+        self._history = self._history[kept]
+        self.populations = self.populations[kept]
+        self.initial_populations = self.initial_populations[kept]
+        self.max_populations = self.max_populations[kept]
+        return summaries
+
+    def retire_empty(self) -> list[BoardSummary]:
+        """Retires the boards that are empty.
+
+        :returns: summaries of the retired boards.
+        """
+        died = self.populations == 0
+        statuses = np.full(len(self), _DIED)
+        return self._retire(died, statuses, np.zeros(len(self), dtype=np.int64))
+
+    def step(self) -> list[BoardSummary]:
+        """Computes the next generation of every board, and retires the boards that died or entered
+        a cycle.
+
+        :returns: summaries of the retired boards.
+        """
+        self.boards = next_generation(self.boards, self.rule)
+        self.generation += 1
+        self.populations = self.boards.sum(axis=(1, 2), dtype=np.int64)
+        np.maximum(self.max_populations, self.populations, out=self.max_populations)
+
+        hashes = self._hashes()
+        periods = self._periods(hashes)
+        self._history[:, self.generation % self.max_period] = hashes
+
+        died = self.populations == 0
+        periods[died] = 0
+        statuses = np.where(died, _DIED, np.where(periods == 1, _STILL, _OSCILLATING))
+        return self._retire(died | (periods > 0), statuses, periods)
+
+    def run(self, max_generations: int) -> Iterator[BoardSummary]:
+        """Computes generations until every board is retired or ``max_generations`` is reached.
+
+        :param max_generations: maximum number of generations to compute.
+        :yield: summary of every board, when it is retired, then of every board still running.
+        """
+        yield from self.retire_empty()
+        while len(self) and self.generation < max_generations:
+            yield from self.step()
+        running = np.ones(len(self), dtype=bool)
+        statuses = np.full(len(self), _RUNNING)
+        yield from self._retire(running, statuses, np.zeros(len(self), dtype=np.int64))
+
+
+def random_boards(
+    nb_boards: int, grid_size: int, density: float, rng: Optional[np.random.Generator] = None
+) -> np.ndarray:
+    """Creates random boards.
+
+    :param nb_boards: number of boards.
+    :param grid_size: size of the boards.
+    :param density: probability of every cell to be alive.
+    :param rng: random generator.
+    :returns: stack of boards, of shape ``(nb_boards, grid_size, grid_size)``.
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+    return (rng.random((nb_boards, grid_size, grid_size)) < density).view(np.uint8)
+
+
+def simulate_ensemble(  # pylint: disable=too-many-arguments
+    nb_boards: int,
+    grid_size: int,
+    density: float = 0.2,
+    max_generations: int = 10_000,
+    batch_size: int = 1024,
+    max_period: int = _DEFAULT_MAX_PERIOD,
+    seed: Optional[int] = None,
+    rule: Rule = CONWAY,
+    on_retire: Optional[Callable[[BoardSummary, np.ndarray], None]] = None,
+) -> Iterator[BoardSummary]:
+    """Simulates random boards, ``batch_size`` boards at a time.
+
+    :param nb_boards: number of boards.
+    :param grid_size: size of the boards.
+    :param density: probability of every cell of the initial boards to be alive.
+    :param max_generations: maximum number of generations of every board.
+    :param batch_size: maximum number of boards computed together.
+    :param max_period: longest period of the cycles detected.
+    :param seed: seed of the random boards.
+    :param rule: rule.
+    :param on_retire: function called with the summary and the final state of every board.
+    :yield: summary of every board.
+    """
+    if batch_size < 1:
+        raise ValueError(f"Batch size must be positive but {batch_size} was given")
+
+    rng = np.random.default_rng(seed)
+    for first_board in range(0, nb_boards, batch_size):
+        boards = random_boards(min(batch_size, nb_boards - first_board), grid_size, density, rng)
+        ensemble = Ensemble(
+            boards, max_period, first_board=first_board, rule=rule, on_retire=on_retire
+        )
+        yield from ensemble.run(max_generations)
@@ -0,0 +1,349 @@
+"""This module contains an implementation of the HashLife algorithm.
+
+The plane is stored as a quadtree whose nodes are canonicalized: two identical regions of the plane
+are always the same node. The evolution of every node is memoized, so that regular patterns can be
+advanced by huge numbers of generations in logarithmic time. Contrary to the other engines, the
+plane is unbounded: patterns are never clipped by the borders of the grid.
+
+The canonical nodes and the memoized results are bounded by ``max_nodes``, even within a single
+step: once either cache exceeds it, both are cleared. The nodes being computed stay alive as long as
+the recursion references them, but are no longer shared with identical nodes created afterwards,
+and only the nodes of the pattern are made canonical again once the step is done.
+"""
+
+from typing import Generator, Optional
+
+import numpy as np
+
+_DEFAULT_MAX_NODES = 1 << 21
+
+
+class Node:  # pylint: disable=too-few-public-methods
+    """Quadtree node representing a square of ``2 ** level`` cells side."""
+
+    __slots__ = ("level", "nw", "ne", "sw", "se", "population")
+
+    def __init__(
+        self,
+        level: int,
+        population: int,
+        children: Optional[tuple["Node", "Node", "Node", "Node"]] = None,
+    ):
+        """Node constructor. Nodes should only be created by ``HashLife`` to stay canonical.
+
+        :param level: level of the node (a leaf is a single cell of level 0).
+        :param population: number of living cells in the node.
+        :param children: north-west, north-east, south-west and south-east children (a leaf is its
+            own children, so that every node has four children, never followed for leaves).
+        """
+        self.level: int = level
+        self.population: int = population
+        self.nw: Node
+        self.ne: Node
+        self.sw: Node
+        self.se: Node
+        self.nw, self.ne, self.sw, self.se = children if children else (self, self, self, self)
+
+
+_OFF = Node(0, 0)
+_ON = Node(0, 1)
+
+
+class HashLife:
+    """HashLife universe."""
+
+    def __init__(self, max_nodes: int = _DEFAULT_MAX_NODES):
+        """HashLife constructor: initialize an empty universe.
+
+        :param max_nodes: maximum number of canonical nodes (and of memoized results) kept in
+            memory. When exceeded, caches are cleared, and only the nodes of the current pattern are
+            kept once the step is done.
+        """
+        self.max_nodes: int = max_nodes
+        self.generation: int = 0
+        self._nodes: dict[tuple[Node, Node, Node, Node], Node] = {}
+        self._results: dict[tuple[Node, int], Node] = {}
+        self._empty: list[Node] = [_OFF]
+        self.root: Node = self._empty_node(3)
+        self.origin: tuple[int, int] = (0, 0)
+
+    @property
+    def population(self) -> int:
+        """Number of living cells in the universe."""
+        return self.root.population
+
+    @property
+    def nb_nodes(self) -> int:
+        """Number of canonical nodes currently in memory."""
+        return len(self._nodes)
+
+    def _join(self, nw: Node, ne: Node, sw: Node, se: Node) -> Node:
+        """Gets the canonical node made of the 4 given children.
+
+        :returns: canonical node.
+        """
+        key = (nw, ne, sw, se)
+        node = self._nodes.get(key)
+        if node is None:
+            population = nw.population + ne.population + sw.population + se.population
+            node = Node(nw.level + 1, population, key)
+            self._nodes[key] = node
+            self._bound_caches()
+        return node
+
+    def _bound_caches(self) -> None:
+        """Clears the caches if one of them holds more than ``max_nodes`` entries."""
+        if len(self._nodes) > self.max_nodes or len(self._results) > self.max_nodes:
+            self._nodes.clear()
+            self._results.clear()
+
+    def _empty_node(self, level: int) -> Node:
+        """Gets the canonical empty node of the given level.
+
+        :returns: empty node.
+        """
+        while len(self._empty) <= level:
+            empty = self._empty[-1]
+            self._empty.append(self._join(empty, empty, empty, empty))
+        return self._empty[level]
+
+    def _centre(self, node: Node) -> Node:
+        """Surrounds a node with empty cells.
+
+        :param node: node to surround.
+        :returns: node of the next level with ``node`` at its center.
+        """
+        empty = self._empty_node(node.level - 1)
+        return self._join(
+            self._join(empty, empty, empty, node.nw),
+            self._join(empty, empty, node.ne, empty),
+            self._join(empty, node.sw, empty, empty),
+            self._join(node.se, empty, empty, empty),
+        )
+
+    @staticmethod
+    def _is_padded(node: Node) -> bool:
+        """Checks whether every living cell of a node is in its central half.
+
+        :returns: True if the living cells are in the center of the node.
+        """
+        return node.level >= 2 and node.population == (
+            node.nw.se.population
+            + node.ne.sw.population
+            + node.sw.ne.population
+            + node.se.nw.population
+        )
+
+    def _life_4x4(self, node: Node) -> Node:
+        """Computes the next generation of the center of a node of level 2.
+
+        :param node: node of level 2.
+        :returns: node of level 1.
+        """
+        cells = [
+            [node.nw.nw, node.nw.ne, node.ne.nw, node.ne.ne],
+            [node.nw.sw, node.nw.se, node.ne.sw, node.ne.se],
+            [node.sw.nw, node.sw.ne, node.se.nw, node.se.ne],
+            [node.sw.sw, node.sw.se, node.se.sw, node.se.se],
+        ]
+
+        def next_cell(x: int, y: int) -> Node:
+            count = sum(
+                cells[i][j].population
+                for i in range(x - 1, x + 2)
+                for j in range(y - 1, y + 2)
+                if (i, j) != (x, y)
+            )
+            if count == 3 or (count == 2 and cells[x][y].population):
+                return _ON
+            return _OFF
+
+        return self._join(next_cell(1, 1), next_cell(1, 2), next_cell(2, 1), next_cell(2, 2))
+
+    def _successor(self, node: Node, j: int) -> Node:  # pylint: disable=too-many-locals
+        """Computes the center of a node advanced by ``2 ** j`` generations (memoized).
+
+        :param node: node of level ``k`` to advance, with ``j <= k - 2``.
+        :param j: log2 of the number of generations.
+        :returns: node of level ``k - 1``.
+        """
+        if node.population == 0:
+            return node.nw
+
+        key = (node, j)
+        result = self._results.get(key)
+        if result is not None:
+            return result
+
+        if node.level == 2:
+            result = self._life_4x4(node)
+        else:
+            nw, ne, sw, se = node.nw, node.ne, node.sw, node.se
+            sub_j = min(j, node.level - 3)
+            c1 = self._successor(self._join(nw.nw, nw.ne, nw.sw, nw.se), sub_j)
+            c2 = self._successor(self._join(nw.ne, ne.nw, nw.se, ne.sw), sub_j)
+            c3 = self._successor(self._join(ne.nw, ne.ne, ne.sw, ne.se), sub_j)
+            c4 = self._successor(self._join(nw.sw, nw.se, sw.nw, sw.ne), sub_j)
+            c5 = self._successor(self._join(nw.se, ne.sw, sw.ne, se.nw), sub_j)
+            c6 = self._successor(self._join(ne.sw, ne.se, se.nw, se.ne), sub_j)
+            c7 = self._successor(self._join(sw.nw, sw.ne, sw.sw, sw.se), sub_j)
+            c8 = self._successor(self._join(sw.ne, se.nw, sw.se, se.sw), sub_j)
+            c9 = self._successor(self._join(se.nw, se.ne, se.sw, se.se), sub_j)
+
+            if j < node.level - 2:
+                result = self._join(
+                    self._join(c1.se, c2.sw, c4.ne, c5.nw),
+                    self._join(c2.se, c3.sw, c5.ne, c6.nw),
+                    self._join(c4.se, c5.sw, c7.ne, c8.nw),
+                    self._join(c5.se, c6.sw, c8.ne, c9.nw),
+                )
+            else:
+                result = self._join(
+                    self._successor(self._join(c1, c2, c4, c5), sub_j),
+                    self._successor(self._join(c2, c3, c5, c6), sub_j),
+                    self._successor(self._join(c4, c5, c7, c8), sub_j),
+                    self._successor(self._join(c5, c6, c8, c9), sub_j),
+                )
+
+        self._results[key] = result
+        self._bound_caches()
+        return result
+
+    def _build(self, array: np.ndarray, level: int) -> Node:
+        """Builds the node corresponding to a square array.
+
+        :param array: array of ``2 ** level`` cells side.
+        :param level: level of the node.
+        :returns: canonical node.
+        """
+        if level == 0:
+            return _ON if array[0, 0] else _OFF
+        if not array.any():
+            return self._empty_node(level)
+        half = 1 << (level - 1)
+        return self._join(
+            self._build(array[:half, :half], level - 1),
+            self._build(array[:half, half:], level - 1),
+            self._build(array[half:, :half], level - 1),
+            self._build(array[half:, half:], level - 1),
+        )
+
+    def load(self, array: np.ndarray, origin: tuple[int, int] = (0, 0)) -> None:
+        """Replaces the content of the universe by a grid array.
+
+        :param array: grid array.
+        :param origin: position of the top-left cell of the array in the universe.
+        """
+        level = max(3, int(np.ceil(np.log2(max(array.shape)))))
+        size = 1 << level
+        square = np.zeros((size, size), dtype=np.uint8)
+        square[: array.shape[0], : array.shape[1]] = array != 0
+
+        self.root = self._build(square, level)
+        self.origin = origin
+        self.generation = 0
+
+    def advance(self, generations: int) -> None:
+        """Advances the universe by a number of generations. Each power of two contained in
+        ``generations`` is computed in a single call to the memoized successor function.
+
+        :param generations: number of generations.
+        """
+        if generations < 0:
+            raise ValueError(f"Cannot advance by a negative number of generations: {generations}")
+
+        j = 0
+        while generations >> j:
+            if (generations >> j) & 1:
+                self._advance_pow2(j)
+            j += 1
+
+    def _advance_pow2(self, j: int) -> None:
+        """Advances the universe by ``2 ** j`` generations.
+
+        :param j: log2 of the number of generations.
+        """
+        root = self.root
+        row, column = self.origin
+        while root.level < j + 2 or not self._is_padded(root):
+            row, column = row - (1 << (root.level - 1)), column - (1 << (root.level - 1))
+            root = self._centre(root)
+        row, column = row - (1 << (root.level - 1)), column - (1 << (root.level - 1))
+        root = self._centre(root)
+
+        self.root = self._successor(root, j)
+        self.origin = (row + (1 << (root.level - 2)), column + (1 << (root.level - 2)))
+        self.generation += 1 << j
+
+        children = (self.root.nw, self.root.ne, self.root.sw, self.root.se)
+        if self._nodes.get(children) is not self.root:
+            # The caches were cleared during the step.
+            self.collect_garbage()
+
+    def collect_garbage(self) -> None:
+        """Clears the memoized results and every node that isn't part of the current pattern."""
+        self._results.clear()
+        self._nodes.clear()
+
+        stack = [self.root, *self._empty[1:]]
+        while stack:
+            node = stack.pop()
+            key = (node.nw, node.ne, node.sw, node.se)
+            if node.level == 0 or key in self._nodes:
+                continue
+            self._nodes[key] = node
+            stack.extend(key)
+
+    def to_array(self, shape: tuple[int, int], origin: tuple[int, int] = (0, 0)) -> np.ndarray:
+        """Extracts a rectangular region of the universe.
+
+        :param shape: shape of the region.
+        :param origin: position of the top-left cell of the region in the universe.
+        :returns: array of the region (living cells are 1).
+        """
+        array = np.zeros(shape, dtype=np.uint8)
+        stack = [(self.root, self.origin[0] - origin[0], self.origin[1] - origin[1])]
+        while stack:
+            node, row, column = stack.pop()
+            size = 1 << node.level
+            if (
+                node.population == 0
+                or row >= shape[0]
+                or column >= shape[1]
+                or row + size <= 0
+                or column + size <= 0
+            ):
+                continue
+            if node.level == 0:
+                array[row, column] = 1
+                continue
+            half = size >> 1
+            stack.append((node.nw, row, column))
+            stack.append((node.ne, row, column + half))
+            stack.append((node.sw, row + half, column))
+            stack.append((node.se, row + half, column + half))
+        return array
+
+
+def generate(
+    grid_array: np.ndarray, step: int = 1, max_nodes: int = _DEFAULT_MAX_NODES
+) -> Generator[np.ndarray, None, None]:
+    """Yields a new grid accordingly to Conway's rules, computed with HashLife.
+
+    The grid is a window on the unbounded plane: cells leaving it keep evolving outside of it. The
+    grid is updated in place so that the yielded array is always ``grid_array``.
+
+    :param grid_array: array to update.
+    :param step: number of generations between two yielded grids.
+    :param max_nodes: maximum number of canonical nodes kept in memory.
+    :yield: updated grid.
+    """
+    universe = HashLife(max_nodes)
+    universe.load(grid_array)
+
+    while universe.population:
+        grid_array[...] = universe.to_array(grid_array.shape)
+        yield grid_array
+
+        universe.advance(step)
+    grid_array[...] = 0
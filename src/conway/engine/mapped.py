@@ -0,0 +1,234 @@
+"""This module contains the out-of-core computation of grids larger than the memory.
+
+The grid lives in two memory-mapped ``.npy`` files of a directory: one holds the current
+generation, the other receives the next one, and they are swapped after every generation. Cells
+are stored as ``uint8`` or, when packed, as 64 cells per ``uint64`` word (see
+``conway.engine.bitpacked``), so that a 100k x 100k grid takes 10 GB (resp. 1.25 GB) of disk.
+Every generation is computed band by band: only a band of rows and its two halo rows are read at
+once, so that the resident memory is bounded by the size of a band whatever the size of the grid.
+
+The directory also contains a small JSON file telling which buffer holds the current generation and
+the rule the grid is computed with, so that a grid can be reopened and its computation continued
+later, under the same rule.
+"""
+
+import json
+from pathlib import Path
+from typing import Iterator, Optional, Union
+
+import numpy as np
+
+from ..storage.pattern import expand_runs, read_header, read_runs
+from . import bitpacked
+from .rule import CONWAY, Rule, parse_rule
+from .vectorized import step_band
+
+_BUFFERS = ("generation_a.npy", "generation_b.npy")
+_STATE = "state.json"
+_DEFAULT_BAND_ROWS = 1024
+
+
+def is_mapped(directory: Union[str, Path]) -> bool:
+    """Tells whether a directory holds a memory-mapped grid.
+
+    :param directory: directory.
+    :returns: True if a grid can be opened from the directory.
+    """
+    return (Path(directory) / _STATE).is_file()
+
+
+class MappedGrid:
+    """Grid stored in memory-mapped files and computed band by band."""
+
+    def __init__(
+        self,
+        directory: Union[str, Path],
+        shape: Optional[tuple[int, int]] = None,
+        packed: bool = False,
+        band_rows: int = _DEFAULT_BAND_ROWS,
+        rule: Optional[Rule] = None,
+    ):
+        """MappedGrid constructor. Creates an empty grid in the directory if a shape is given,
+        opens the grid of the directory otherwise.
+
+        :param directory: directory of the memory-mapped files.
+        :param shape: shape of the grid to create.
+        :param packed: whether to store 64 cells per word instead of one per byte (Conway's rule
+            only). Ignored when opening a grid.
+        :param band_rows: number of rows computed at once.
+        :param rule: rule (Conway's rule when creating a grid, the rule it was created with when
+            opening one, which must match the given rule).
+        """
+        if band_rows < 1:
+            raise ValueError(f"Number of rows of a band must be positive but {band_rows} was given")
+
+        self.directory: Path = Path(directory)
+        self.band_rows: int = band_rows
+        if shape is None:
+            with open(self.directory / _STATE, encoding="utf-8") as file:
+                state = json.load(file)
+            self.shape: tuple[int, int] = tuple(state["shape"])
+            self.packed: bool = state["packed"]
+            self.generation: int = state["generation"]
+            self._current: int = state["current"]
+            saved_rule = parse_rule(state.get("rule", str(CONWAY)))
+            if rule is not None and rule != saved_rule:
+                raise ValueError(
+                    f"Grid of '{self.directory}' is computed with rule {saved_rule} but {rule} was "
+                    "given"
+                )
+            rule = saved_rule
+            mode = "r+"
+        else:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            self.shape = (int(shape[0]), int(shape[1]))
+            self.packed = packed
+            self.generation = 0
+            self._current = 0
+            rule = CONWAY if rule is None else rule
+            mode = "w+"
+
+        if self.packed and rule != CONWAY:
+            raise ValueError(f"Packed grids only support Conway's rule but {rule} was given")
+        self.rule: Rule = rule
+
+        dtype = np.uint64 if self.packed else np.uint8
+        columns = -(-self.shape[1] // 64) if self.packed else self.shape[1]
+        self._buffers: list[np.memmap] = [
+            np.lib.format.open_memmap(
+                self.directory / name, mode=mode, dtype=dtype, shape=(self.shape[0], columns)
+            )
+            for name in _BUFFERS
+        ]
+        if shape is not None:
+            self._save_state()
+
+    @property
+    def path(self) -> Path:
+        """Path of the ``.npy`` file of the current generation.
+
+        :returns: path of the file.
+        """
+        return self.directory / _BUFFERS[self._current]
+
+    def _save_state(self) -> None:
+        """Writes which buffer holds the current generation, and the rule."""
+        state = {
+            "shape": list(self.shape),
+            "packed": self.packed,
+            "rule": str(self.rule),
+            "generation": self.generation,
+            "current": self._current,
+        }
+        with open(self.directory / _STATE, "w", encoding="utf-8") as file:
+            json.dump(state, file)
+
+    def bands(self) -> Iterator[tuple[int, int]]:
+        """Splits the grid in bands of rows.
+
+        :yield: first row and row after the last row of every band.
+        """
+        for start in range(0, self.shape[0], self.band_rows):
+            yield start, min(start + self.band_rows, self.shape[0])
+
+    def read(self, start: int, stop: int) -> np.ndarray:
+        """Reads rows of the current generation.
+
+        :param start: first row.
+        :param stop: row after the last row.
+        :returns: ``uint8`` array of the rows.
+        """
+        rows = self._buffers[self._current][start:stop]
+        if self.packed:
+            return bitpacked.unpack(rows, self.shape[1])
+        return np.array(rows)
+
+    def write(self, start: int, rows: np.ndarray) -> None:
+        """Writes rows of the current generation.
+
+        :param start: first row.
+        :param rows: array of the rows, as wide as the grid.
+        """
+        if rows.shape[1] != self.shape[1]:
+            raise ValueError(
+                f"Rows must have {self.shape[1]} columns but {rows.shape[1]} were given"
+            )
+        current = self._buffers[self._current]
+        current[start : start + len(rows)] = bitpacked.pack(rows) if self.packed else rows != 0
+
+    def fill_random(self, density: float = 0.2, seed: Optional[int] = None) -> None:
+        """Initializes every cell randomly, band by band.
+
+        :param density: probability of every cell to be alive.
+        :param seed: seed of the random generator.
+        """
+        rng = np.random.default_rng(seed)
+        for start, stop in self.bands():
+            self.write(start, (rng.random((stop - start, self.shape[1])) < density).view(np.uint8))
+        self.flush()
+
+    def place_pattern(
+        self, path: Union[str, Path], offset: Optional[tuple[int, int]] = None
+    ) -> None:
+        """Draws the living cells of a pattern file, chunk by chunk.
+
+        :param path: path of the pattern.
+        :param offset: position of the top-left corner of the pattern in the grid. If not given,
+            the pattern is centered.
+        """
+        header = read_header(path)
+        if offset is None:
+            offset = ((self.shape[0] - header.height) // 2, (self.shape[1] - header.width) // 2)
+        if (
+            offset[0] < 0
+            or offset[1] < 0
+            or offset[0] + header.height > self.shape[0]
+            or offset[1] + header.width > self.shape[1]
+        ):
+            raise ValueError(
+                f"Pattern '{path}' ({header.height}x{header.width}) doesn't fit in the grid "
+                f"{self.shape} at offset {offset}"
+            )
+
+        current = self._buffers[self._current]
+        for runs in read_runs(path):
+            rows, columns = expand_runs(runs)
+            rows, columns = rows + offset[0], columns + offset[1]
+            if self.packed:
+                words = columns // 64
+                bits = np.left_shift(np.uint64(1), (columns % 64).astype(np.uint64))
+                np.bitwise_or.at(current, (rows, words), bits)
+            else:
+                current[rows, columns] = 1
+        self.flush()
+
+    def population(self) -> int:
+        """Counts the living cells of the current generation, band by band.
+
+        :returns: number of living cells.
+        """
+        return sum(int(np.count_nonzero(self.read(start, stop))) for start, stop in self.bands())
+
+    def step(self, generations: int = 1) -> None:
+        """Computes generations, band by band, swapping the buffers after every generation.
+
+        :param generations: number of generations to compute.
+        """
+        for _ in range(generations):
+            src, dst = self._buffers[self._current], self._buffers[1 - self._current]
+            for start, stop in self.bands():
+                if self.packed:
+                    top, bottom = max(start - 1, 0), min(stop + 1, self.shape[0])
+                    band = bitpacked.step(np.asarray(src[top:bottom]), self.shape[1])
+                    dst[start:stop] = band[start - top : stop - top]
+                else:
+                    step_band(src, dst, start, stop, self.rule)
+            dst.flush()
+            self._current = 1 - self._current
+            self.generation += 1
+            self._save_state()
+
+    def flush(self) -> None:
+        """Writes the changes of the current generation to the disk."""
+        self._buffers[self._current].flush()
+        self._save_state()
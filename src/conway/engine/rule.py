@@ -0,0 +1,90 @@
+"""This module contains Life-like rules, such as Conway's rule (B3/S23), HighLife (B36/S23), Seeds
+(B2/S) or Day & Night (B3678/S34678).
+
+A Life-like rule tells, for each number of living neighbors, whether a dead cell is born and whether
+a living cell survives. The next state of a cell is therefore a lookup in a table of 2 x 9 entries,
+indexed by its state and its number of living neighbors. The table is stored as the bits of a
+single integer, so that the next state of a whole array is computed with a shift instead of
+branching on the number of neighbors.
+"""
+
+import re
+from typing import NamedTuple
+
+import numpy as np
+
+_NB_COUNTS = 9
+_RULE_FORMATS = [
+    (re.compile(r"B([0-8]*)/?S([0-8]*)", re.IGNORECASE), False),
+    (re.compile(r"S([0-8]*)/?B([0-8]*)", re.IGNORECASE), True),
+    (re.compile(r"([0-8]*)/([0-8]*)"), True),
+]
+
+
+class Rule(NamedTuple):
+    """Life-like rule."""
+
+    birth: frozenset[int]
+    survival: frozenset[int]
+
+    def __str__(self) -> str:
+        birth = "".join(map(str, sorted(self.birth)))
+        survival = "".join(map(str, sorted(self.survival)))
+        return f"B{birth}/S{survival}"
+
+    @property
+    def table(self) -> tuple[tuple[bool, ...], tuple[bool, ...]]:
+        """Lookup table of the next state of a cell.
+
+        :returns: next state of a cell, indexed by its state and then its number of neighbors.
+        """
+        return (
+            tuple(count in self.birth for count in range(_NB_COUNTS)),
+            tuple(count in self.survival for count in range(_NB_COUNTS)),
+        )
+
+    @property
+    def bits(self) -> int:
+        """Lookup table of the next state of a cell, stored as the bits of an integer.
+
+        :returns: integer whose bit ``9 * state + neighbors`` is the next state of a cell.
+        """
+        return sum(1 << count for count in self.birth) | sum(
+            1 << (_NB_COUNTS + count) for count in self.survival
+        )
+
+
+def parse_rule(rulestring: str) -> Rule:
+    """Parses a rulestring, in the B/S notation (e.g. ``B3/S23``, ``b3s23`` or ``S23/B3``) or in the
+    S/B notation (e.g. ``23/3``).
+
+    :param rulestring: rulestring.
+    :returns: rule.
+    """
+    for pattern, survival_first in _RULE_FORMATS:
+        match = pattern.fullmatch(rulestring.strip())
+        if match is not None:
+            birth, survival = match.group(2, 1) if survival_first else match.group(1, 2)
+            return Rule(frozenset(map(int, birth)), frozenset(map(int, survival)))
+    raise ValueError(f"Unknown rule: '{rulestring}' (expected e.g. 'B3/S23')")
+
+
+CONWAY = parse_rule("B3/S23")
+
+
+def apply_rule(cells: np.ndarray, counts: np.ndarray, rule: Rule = CONWAY) -> np.ndarray:
+    """Computes the next state of cells.
+
+    :param cells: state of the cells (1 if alive, 0 if dead).
+    :param counts: number of living neighbors of the cells.
+    :param rule: rule.
+    :returns: next state of the cells, as ``uint8``.
+    """
+    if rule == CONWAY:
+        return ((counts == 3) | ((cells != 0) & (counts == 2))).view(np.uint8)
+
+    index = counts.astype(np.uint8)
+    index += (cells != 0).view(np.uint8) * np.uint8(_NB_COUNTS)
+    next_cells = np.right_shift(np.uint32(rule.bits), index)
+    next_cells &= np.uint32(1)
+    return next_cells.astype(np.uint8)
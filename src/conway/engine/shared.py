@@ -0,0 +1,246 @@
+"""This module contains a parallel engine sharing the grid between workers through shared memory.
+
+The grid is stored twice (current and next generation) in ``multiprocessing.shared_memory``. Each
+worker owns a contiguous band of rows: it reads its band and the two surrounding halo rows from the
+current buffer and writes its band into the next buffer. Workers and the main process are
+synchronized with a barrier at the beginning and at the end of every generation, so no grid data is
+ever sent between processes. Optionally, the masks of active tiles are shared as well so that
+workers skip the quiescent regions of their band.
+"""
+
+import multiprocessing
+from multiprocessing.shared_memory import SharedMemory
+from multiprocessing.synchronize import Barrier, Event
+from threading import BrokenBarrierError
+from typing import Generator, Optional
+
+import numpy as np
+
+from .changes import ChangeTracker, changed_cells
+from .rule import CONWAY, Rule
+from .tiled import changed_tile_cells, copy_tiles, dilate, padded_shape, step_tiles
+from .vectorized import step_band
+
+_SHUTDOWN_TIMEOUT = 10.0
+
+
+def _split_rows(nb_rows: int, nb_bands: int) -> list[tuple[int, int]]:
+    """Splits ``nb_rows`` rows into at most ``nb_bands`` contiguous bands of (almost) equal size.
+
+    :param nb_rows: number of rows to split.
+    :param nb_bands: number of bands wanted.
+    :returns: list of ``(start, stop)`` rows of every band.
+    """
+    nb_bands = max(1, min(nb_bands, nb_rows))
+    bounds = [nb_rows * i // nb_bands for i in range(nb_bands + 1)]
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def _layout(shape: tuple[int, int], tile_size: Optional[int]) -> list[tuple[tuple, type]]:
+    """Gets the shapes and dtypes of the arrays stored in shared memory.
+
+    :param shape: shape of the grid.
+    :param tile_size: size of the tiles, or None if every cell is computed at each generation.
+    :returns: shapes and dtypes of both generations, followed by the active, changed and occupied
+        masks of tiles when tiles are used.
+    """
+    if tile_size is None:
+        return [(shape, np.uint8)] * 2
+    buffer_shape = padded_shape(shape, tile_size)
+    tiles_shape = ((buffer_shape[0] - 2) // tile_size, (buffer_shape[1] - 2) // tile_size)
+    return [(buffer_shape, np.uint8)] * 2 + [(tiles_shape, np.bool_)] * 3
+
+
+def _attach(shms: list[SharedMemory], layout: list[tuple[tuple, type]]) -> list[np.ndarray]:
+    """Gets arrays backed by shared memory blocks.
+
+    :param shms: shared memory blocks.
+    :param layout: shapes and dtypes of the arrays.
+    :returns: arrays.
+    """
+    return [
+        np.ndarray(shape, dtype=dtype, buffer=shm.buf) for shm, (shape, dtype) in zip(shms, layout)
+    ]
+
+
+def _step_tiles_band(
+    arrays: list[np.ndarray],
+    current: int,
+    band: tuple[int, int],
+    tile_size: int,
+    shape: tuple[int, int],
+    rule: Rule = CONWAY,
+) -> None:
+    """Computes the next generation of the active tiles of a band of tile rows.
+
+    :param arrays: both generations and the active, changed and occupied masks of tiles.
+    :param current: index of the current generation.
+    :param band: ``(start, stop)`` tile rows to compute.
+    :param tile_size: size of the tiles.
+    :param shape: shape of the grid.
+    :param rule: rule.
+    """
+    active, changed, occupied = arrays[2:]
+    start, stop = band
+
+    tile_rows, tile_columns = np.nonzero(active[start:stop])
+    tile_rows += start
+    changed[start:stop] = False
+    changed[tile_rows, tile_columns], occupied[tile_rows, tile_columns] = step_tiles(
+        arrays[current], arrays[1 - current], tile_rows, tile_columns, tile_size, shape, rule
+    )
+
+
+def _worker(  # pylint: disable=too-many-arguments
+    shm_names: list[str],
+    shape: tuple[int, int],
+    band: tuple[int, int],
+    barrier: Barrier,
+    stop_event: Event,
+    tile_size: Optional[int],
+    rule: Rule = CONWAY,
+) -> None:
+    """Computes generations of a band of rows until ``stop_event`` is set.
+
+    :param shm_names: names of the shared memory blocks (see ``_layout``).
+    :param shape: shape of the grid.
+    :param band: ``(start, stop)`` rows (or tile rows if tiles are used) owned by this worker.
+    :param barrier: barrier shared with the other workers and the main process.
+    :param stop_event: event set by the main process when the simulation ends.
+    :param tile_size: size of the tiles, or None if every cell is computed at each generation.
+    :param rule: rule.
+    """
+    shms = [SharedMemory(name=name) for name in shm_names]
+    try:
+        arrays = _attach(shms, _layout(shape, tile_size))
+        current = 0
+        while True:
+            barrier.wait()
+            if stop_event.is_set():
+                break
+            if tile_size is None:
+                step_band(arrays[current], arrays[1 - current], *band, rule)
+            else:
+                _step_tiles_band(arrays, current, band, tile_size, shape, rule)
+            barrier.wait()
+            current = 1 - current
+        del arrays
+    finally:
+        for shm in shms:
+            shm.close()
+
+
+def generate(
+    grid_array: np.ndarray,
+    jobs: int,
+    tile_size: Optional[int] = None,
+    rule: Rule = CONWAY,
+    tracker: Optional[ChangeTracker] = None,
+) -> Generator[np.ndarray, None, None]:
+    """Yields a new grid accordingly to Conway's rules, computed by ``jobs`` workers sharing the
+    grid in shared memory.
+
+    If ``tile_size`` is given, the grid is split into tiles and only the tiles that may change are
+    computed (see ``conway.engine.tiled``); every worker then owns a band of tile rows. The grid is
+    updated in place so that the yielded array is always ``grid_array``. Generation stops when the
+    grid is empty, unless cells are born without living neighbors.
+
+    :param grid_array: array to update.
+    :param jobs: numbers of workers (jobs) to use.
+    :param tile_size: size of the tiles, or None to compute every cell at each generation.
+    :param rule: rule (cells can't be born without living neighbors if tiles are used).
+    :param tracker: if given, tracker updated with the cells changed between the two shared
+        buffers (only in the tiles that changed if tiles are used).
+    :yield: updated grid.
+    """
+    if tile_size is not None and 0 in rule.birth:
+        raise ValueError(f"Quiescent regions can't be skipped with the rule {rule}")
+
+    shape = grid_array.shape
+    layout = _layout(shape, tile_size)
+    context = multiprocessing.get_context()
+
+    shms = [
+        SharedMemory(create=True, size=max(int(np.prod(array_shape)), 1))
+        for array_shape, _ in layout
+    ]
+    arrays = _attach(shms, layout)
+    if tile_size is None:
+        arrays[0][...] = grid_array != 0
+        bands = _split_rows(shape[0], jobs)
+    else:
+        for buffer in arrays[:2]:
+            buffer[...] = 0
+            buffer[1 : shape[0] + 1, 1 : shape[1] + 1] = grid_array != 0
+        arrays[2][...] = True
+        arrays[3][...] = True
+        arrays[4][...] = grid_array.any()
+        bands = _split_rows(arrays[2].shape[0], jobs)
+
+    barrier = context.Barrier(len(bands) + 1)
+    stop_event = context.Event()
+    processes = [
+        context.Process(
+            target=_worker,
+            args=([shm.name for shm in shms], shape, band, barrier, stop_event, tile_size, rule),
+            daemon=True,
+        )
+        for band in bands
+    ]
+    for process in processes:
+        process.start()
+    if tracker is not None:
+        tracker.reset(grid_array)
+
+    try:
+        current = 0
+        if tile_size is None:
+            mask = np.empty(shape, dtype=bool) if tracker is not None else None
+            endless = 0 in rule.birth
+            while endless or arrays[current].any():
+                grid_array[...] = arrays[current]
+                yield grid_array
+
+                barrier.wait()
+                barrier.wait()
+                current = 1 - current
+                if tracker is not None and mask is not None:
+                    tracker.update(*changed_cells(arrays[current], arrays[1 - current], mask))
+            grid_array[...] = 0
+        else:
+            while arrays[4].any():
+                yield grid_array
+
+                barrier.wait()
+                barrier.wait()
+                current = 1 - current
+                arrays[2][...] = dilate(arrays[3])
+                if tracker is not None:
+                    tracker.update(
+                        *changed_tile_cells(
+                            arrays[current][1 : shape[0] + 1, 1 : shape[1] + 1],
+                            grid_array,
+                            arrays[3],
+                            tile_size,
+                        )
+                    )
+                copy_tiles(
+                    arrays[current][1 : shape[0] + 1, 1 : shape[1] + 1],
+                    grid_array,
+                    arrays[3],
+                    tile_size,
+                )
+    finally:
+        stop_event.set()
+        try:
+            barrier.wait(timeout=_SHUTDOWN_TIMEOUT)
+        except BrokenBarrierError:
+            pass
+        for process in processes:
+            process.join(timeout=_SHUTDOWN_TIMEOUT)
+            if process.is_alive():
+                process.terminate()
+        del arrays
+        for shm in shms:
+            shm.close()
+            shm.unlink()
@@ -0,0 +1,140 @@
+"""This module contains a whole-array simulation stepping between two preallocated buffers.
+
+The grid is stored in two buffers (current and next generation) surrounded by a border of dead
+cells, so that the neighbors of every cell can be summed without special cases on the edges. Every
+generation is computed from one buffer into the other with ufuncs writing into preallocated scratch
+buffers (sums of 3 rows, then of 3 columns, then the next state, looked up in the bits of the rule),
+so that no memory is allocated once the simulation is created, and the buffers are then swapped.
+
+Frames are given as read-only views of the current buffer, created once: a frame stays unchanged
+while the next generation is computed from it, and is only overwritten by the generation after.
+Frames to keep longer must be copied (see ``Simulation.copy``).
+"""
+
+from typing import Iterator, Optional
+
+import numpy as np
+
+from .rule import CONWAY, Rule
+
+_NB_COUNTS = 10
+
+
+def _lookup_bits(rule: Rule) -> np.uint32:
+    """Builds the table of the next state of a cell.
+
+    :param rule: rule.
+    :returns: integer whose bit ``10 * state + count`` is the next state of a cell, the count being
+        the number of living cells in its 3x3 neighborhood (itself included).
+    """
+    bits = sum(1 << count for count in rule.birth)
+    bits |= sum(1 << (_NB_COUNTS + count + 1) for count in rule.survival)
+    return np.uint32(bits)
+
+
+class Simulation:
+    """Grid simulated between two preallocated buffers, without allocating memory at each
+    generation."""
+
+    def __init__(self, grid_array: np.ndarray, rule: Rule = CONWAY):
+        """Simulation constructor: allocate the buffers and copy the initial grid.
+
+        :param grid_array: initial grid (left untouched).
+        :param rule: rule.
+        """
+        if grid_array.ndim != 2:
+            raise ValueError(f"Grid must be a 2-dimensional array but {grid_array.ndim} were given")
+
+        self.shape: tuple[int, int] = grid_array.shape
+        self.rule: Rule = rule
+        self.generation: int = 0
+        height, width = self.shape
+        self._buffers: list[np.ndarray] = [
+            np.zeros((height + 2, width + 2), dtype=np.uint8) for _ in range(2)
+        ]
+        self._views: list[np.ndarray] = [buffer[1:-1, 1:-1] for buffer in self._buffers]
+        for view in self._views:
+            view[...] = grid_array != 0
+        self._frames: list[np.ndarray] = [view.view() for view in self._views]
+        for frame in self._frames:
+            frame.flags.writeable = False
+        self._current: int = 0
+
+        self._bits: np.uint32 = _lookup_bits(rule)
+        self._vertical: np.ndarray = np.empty((height, width + 2), dtype=np.uint8)
+        self._counts: np.ndarray = np.empty(self.shape, dtype=np.uint8)
+        if rule == CONWAY:
+            self._masks: list[np.ndarray] = [np.empty(self.shape, dtype=bool) for _ in range(2)]
+        else:
+            self._index: np.ndarray = np.empty(self.shape, dtype=np.uint8)
+            self._next_states: np.ndarray = np.empty(self.shape, dtype=np.uint32)
+
+    @property
+    def grid(self) -> np.ndarray:
+        """Current generation.
+
+        :returns: read-only view of the current generation (living cells are 1).
+        """
+        return self._frames[self._current]
+
+    @property
+    def previous(self) -> np.ndarray:
+        """Generation before the current one, still held by the other buffer.
+
+        :returns: read-only view of the previous generation (the initial grid before any step).
+        """
+        return self._frames[1 - self._current]
+
+    def copy(self, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Copies the current generation.
+
+        :param out: array receiving the copy (allocated if not given).
+        :returns: copy of the current generation.
+        """
+        if out is None:
+            return self.grid.copy()
+        np.copyto(out, self.grid, casting="unsafe")
+        return out
+
+    def step(self, generations: int = 1) -> np.ndarray:
+        """Computes generations.
+
+        :param generations: number of generations to compute.
+        :returns: read-only view of the last generation computed.
+        """
+        vertical, counts = self._vertical, self._counts
+        for _ in range(generations):
+            src = self._buffers[self._current]
+            cells, next_cells = self._views[self._current], self._views[1 - self._current]
+            # Number of living cells in the 3x3 neighborhood of every cell, the cell included.
+            np.add(src[:-2], src[1:-1], out=vertical)
+            np.add(vertical, src[2:], out=vertical)
+            np.add(vertical[:, :-2], vertical[:, 1:-1], out=counts)
+            np.add(counts, vertical[:, 2:], out=counts)
+
+            if self.rule == CONWAY:
+                born, survived = self._masks
+                np.equal(counts, 3, out=born)
+                np.equal(counts, 4, out=survived)
+                # Masks are combined as bytes, so that no value has to be converted.
+                np.bitwise_and(survived.view(np.uint8), cells, out=survived.view(np.uint8))
+                np.bitwise_or(born.view(np.uint8), survived.view(np.uint8), out=next_cells)
+            else:
+                np.multiply(cells, _NB_COUNTS, out=self._index)
+                np.add(self._index, counts, out=self._index)
+                np.right_shift(self._bits, self._index, out=self._next_states)
+                np.bitwise_and(self._next_states, 1, out=next_cells, casting="unsafe")
+            self._current = 1 - self._current
+        self.generation += generations
+        return self.grid
+
+    def __iter__(self) -> Iterator[np.ndarray]:
+        """Yields the current generation and computes the next one, while the grid isn't empty
+        (forever if cells are born without living neighbors).
+
+        :yield: read-only view of every generation.
+        """
+        endless = 0 in self.rule.birth
+        while endless or self.grid.any():
+            yield self.grid
+            self.step()
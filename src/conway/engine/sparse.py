@@ -0,0 +1,107 @@
+"""This module contains a sparse engine, storing only living cells on an unbounded plane.
+
+Every living cell is encoded as a single ``int64`` key: its row in the upper 32 bits and its
+(offset) column in the lower 32 bits. The population is a sorted array of keys, so that memory and
+computation time scale with the number of living cells instead of the area of the grid.
+"""
+
+from typing import Generator
+
+import numpy as np
+
+_COLUMN_BITS = 32
+_COLUMN_OFFSET = 1 << (_COLUMN_BITS - 1)
+_COLUMN_MASK = (1 << _COLUMN_BITS) - 1
+
+_NEIGHBOR_OFFSETS = np.asarray(
+    [(x << _COLUMN_BITS) + y for x in (-1, 0, 1) for y in (-1, 0, 1) if (x, y) != (0, 0)],
+    dtype=np.int64,
+)
+
+
+def encode(rows: np.ndarray, columns: np.ndarray) -> np.ndarray:
+    """Encodes cells positions into keys.
+
+    :param rows: rows of the cells.
+    :param columns: columns of the cells (between -2**31 and 2**31 - 1).
+    :returns: keys of the cells.
+    """
+    rows = np.asarray(rows, dtype=np.int64)
+    columns = np.asarray(columns, dtype=np.int64)
+    return (rows << _COLUMN_BITS) + (columns + _COLUMN_OFFSET)
+
+
+def decode(keys: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Decodes keys into cells positions.
+
+    :param keys: keys of the cells.
+    :returns: rows and columns of the cells.
+    """
+    return keys >> _COLUMN_BITS, (keys & _COLUMN_MASK) - _COLUMN_OFFSET
+
+
+def from_array(array: np.ndarray, origin: tuple[int, int] = (0, 0)) -> np.ndarray:
+    """Gets the keys of the living cells of a grid array.
+
+    :param array: grid array.
+    :param origin: position of the top-left cell of the array on the plane.
+    :returns: sorted keys of the living cells.
+    """
+    rows, columns = np.nonzero(array)
+    return encode(rows + origin[0], columns + origin[1])
+
+
+def to_array(
+    keys: np.ndarray, shape: tuple[int, int], origin: tuple[int, int] = (0, 0)
+) -> np.ndarray:
+    """Draws the living cells contained in a rectangular viewport of the plane.
+
+    :param keys: keys of the living cells.
+    :param shape: shape of the viewport.
+    :param origin: position of the top-left cell of the viewport on the plane.
+    :returns: array of the viewport (living cells are 1).
+    """
+    rows, columns = decode(keys)
+    rows, columns = rows - origin[0], columns - origin[1]
+    visible = (rows >= 0) & (rows < shape[0]) & (columns >= 0) & (columns < shape[1])
+
+    array = np.zeros(shape, dtype=np.uint8)
+    array[rows[visible], columns[visible]] = 1
+    return array
+
+
+def step(keys: np.ndarray) -> np.ndarray:
+    """Computes the next generation according to Conway's rules.
+
+    :param keys: sorted keys of the living cells.
+    :returns: sorted keys of the living cells of the next generation.
+    """
+    neighbors = (keys[:, np.newaxis] + _NEIGHBOR_OFFSETS).ravel()
+    candidates, counts = np.unique(neighbors, return_counts=True)
+
+    indices = np.minimum(np.searchsorted(keys, candidates), max(keys.size - 1, 0))
+    alive = keys[indices] == candidates if keys.size else np.zeros(candidates.shape, dtype=bool)
+
+    return candidates[(counts == 3) | ((counts == 2) & alive)]
+
+
+def generate(
+    grid_array: np.ndarray, origin: tuple[int, int] = (0, 0)
+) -> Generator[np.ndarray, None, None]:
+    """Yields a new grid accordingly to Conway's rules, computed on the living cells only.
+
+    The grid is a viewport on the unbounded plane: cells leaving it keep evolving outside of it. The
+    grid is updated in place so that the yielded array is always ``grid_array``.
+
+    :param grid_array: array to update.
+    :param origin: position of the top-left cell of the viewport on the plane.
+    :yield: updated grid.
+    """
+    keys = from_array(grid_array, origin)
+
+    while keys.size:
+        grid_array[...] = to_array(keys, grid_array.shape, origin)
+        yield grid_array
+
+        keys = step(keys)
+    grid_array[...] = 0
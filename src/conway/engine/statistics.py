@@ -0,0 +1,235 @@
+"""This module contains the statistics of a simulation, maintained incrementally.
+
+The population, the bounding box of the living cells, the population of every region (square of
+``region_size`` cells) and the highest density of a region are only computed from the whole grid
+once. They are then updated from the cells born and dead at each generation, reported by the
+engines (see ``conway.engine.changes``), so that monitoring a simulation costs O(changes) per
+generation instead of O(area).
+
+Statistics are yielded along with the frames and can be written to a CSV or a JSON-lines file.
+"""
+
+import csv
+import json
+from enum import Enum
+from typing import Iterable, Iterator, NamedTuple, Optional, TextIO
+
+import numpy as np
+
+from .changes import ChangeTracker
+
+_DEFAULT_REGION_SIZE = 64
+
+
+class Statistics(NamedTuple):
+    """Statistics of a generation."""
+
+    generation: int
+    population: int
+    births: int
+    deaths: int
+    bounding_box: Optional[tuple[int, int, int, int]]
+    max_density: float
+
+
+class StatisticsFormat(Enum):
+    """Formats of the files of statistics."""
+
+    CSV = "csv"
+    JSONL = "jsonl"
+
+
+class StatisticsTracker(ChangeTracker):  # pylint: disable=too-many-instance-attributes
+    """Maintains the statistics of a simulation from the cells changing state."""
+
+    def __init__(self, shape: tuple[int, int], region_size: int = _DEFAULT_REGION_SIZE):
+        """StatisticsTracker constructor.
+
+        :param shape: shape of the grid.
+        :param region_size: size of the square regions whose density is tracked.
+        """
+        if region_size < 1:
+            raise ValueError(f"Region size must be positive but {region_size} was given")
+
+        super().__init__(shape)
+        self.region_size: int = region_size
+        self.regions: np.ndarray = np.zeros(
+            (-(-shape[0] // region_size), -(-shape[1] // region_size)), dtype=np.int64
+        )
+        self._region_areas: np.ndarray = np.outer(
+            np.diff(np.minimum(np.arange(self.regions.shape[0] + 1) * region_size, shape[0])),
+            np.diff(np.minimum(np.arange(self.regions.shape[1] + 1) * region_size, shape[1])),
+        )
+        self._row_counts: np.ndarray = np.zeros(shape[0], dtype=np.int64)
+        self._column_counts: np.ndarray = np.zeros(shape[1], dtype=np.int64)
+        self._bounds: list[int] = [shape[0], shape[1], -1, -1]
+        self.max_density: float = 0.0
+        self.generation: int = 0
+        self.population: int = 0
+        self.births: int = 0
+        self.deaths: int = 0
+
+    def _add(self, rows: np.ndarray, columns: np.ndarray, count: int) -> None:
+        """Adds cells to the counts of their rows, columns and regions.
+
+        :param rows: rows of the cells.
+        :param columns: columns of the cells.
+        :param count: 1 for living cells, -1 for dead ones.
+        """
+        np.add.at(self._row_counts, rows, count)
+        np.add.at(self._column_counts, columns, count)
+        np.add.at(self.regions, (rows // self.region_size, columns // self.region_size), count)
+
+    def _densities(self, regions: np.ndarray) -> np.ndarray:
+        """Gets the density of regions.
+
+        :param regions: flat indices of the regions.
+        :returns: proportion of living cells of every region.
+        """
+        return self.regions.flat[regions] / self._region_areas.flat[regions]
+
+    def reset(self, array: np.ndarray, generation: Optional[int] = None) -> None:
+        """Computes the statistics of the given state.
+
+        :param array: grid array.
+        :param generation: generation of the grid (the current one is kept if not given, e.g. when
+            the engine computing the simulation changes).
+        """
+        self.regions[...] = 0
+        self._row_counts[...] = 0
+        self._column_counts[...] = 0
+        self._bounds = [self.shape[0], self.shape[1], -1, -1]
+        rows, columns = np.nonzero(array)
+        self._add(rows, columns, 1)
+        self.population = rows.size
+        if generation is not None:
+            self.generation = generation
+        self.births = self.deaths = 0
+        self.max_density = float((self.regions / self._region_areas).max())
+        if rows.size:
+            self._bounds = [rows.min(), columns.min(), rows.max(), columns.max()]
+
+    def update(self, born: np.ndarray, dead: np.ndarray, generations: int = 1) -> None:
+        """Updates the statistics with the cells that changed state since the last update.
+
+        :param born: flat indices of the cells that were born.
+        :param dead: flat indices of the cells that died.
+        :param generations: number of generations since the last update.
+        """
+        born_rows, born_columns = np.divmod(born, self.shape[1])
+        dead_rows, dead_columns = np.divmod(dead, self.shape[1])
+        regions = np.unique(
+            np.ravel_multi_index(
+                (
+                    np.concatenate([born_rows, dead_rows]) // self.region_size,
+                    np.concatenate([born_columns, dead_columns]) // self.region_size,
+                ),
+                self.regions.shape,
+            )
+        )
+        previous_densities = self._densities(regions)
+        self._add(born_rows, born_columns, 1)
+        self._add(dead_rows, dead_columns, -1)
+        densities = self._densities(regions)
+        if densities.size and densities.max() >= self.max_density:
+            self.max_density = float(densities.max())
+        elif (previous_densities >= self.max_density).any():
+            # The densest region lost cells: every region is compared again.
+            self.max_density = float((self.regions / self._region_areas).max())
+        self.population += born.size - dead.size
+        self.births += born.size
+        self.deaths += dead.size
+        self.generation += generations
+
+        if born.size:
+            self._bounds = [
+                min(self._bounds[0], born_rows.min()),
+                min(self._bounds[1], born_columns.min()),
+                max(self._bounds[2], born_rows.max()),
+                max(self._bounds[3], born_columns.max()),
+            ]
+        if not self.population:
+            self._bounds = [self.shape[0], self.shape[1], -1, -1]
+        elif dead.size:
+            # The bounds only move inwards when their row or column emptied.
+            for index, counts in ((0, self._row_counts), (1, self._column_counts)):
+                low, high = self._bounds[index], self._bounds[index + 2]
+                if not counts[low]:
+                    self._bounds[index] = low + int(np.argmax(counts[low:] != 0))
+                if not counts[high]:
+                    self._bounds[index + 2] = high - int(np.argmax(counts[high::-1] != 0))
+
+    def collect(self) -> Statistics:
+        """Gets the statistics of the current generation, and starts counting births and deaths
+        again.
+
+        :returns: statistics, births and deaths being counted since the previous collection.
+        """
+        bounding_box = None
+        if self.population:
+            min_row, min_column, max_row, max_column = self._bounds
+            bounding_box = (int(min_row), int(min_column), int(max_row), int(max_column))
+        statistics = Statistics(
+            self.generation,
+            int(self.population),
+            int(self.births),
+            int(self.deaths),
+            bounding_box,
+            self.max_density,
+        )
+        self.births = self.deaths = 0
+        return statistics
+
+
+def collect_statistics(
+    frames: Iterable[np.ndarray], tracker: StatisticsTracker
+) -> Iterator[tuple[np.ndarray, Statistics]]:
+    """Yields frames along with their statistics.
+
+    :param frames: frames of the simulation, updating ``tracker`` (see ``conway.engine.changes``).
+    :param tracker: statistics tracker.
+    :yield: frame and its statistics.
+    """
+    for frame in frames:
+        yield frame, tracker.collect()
+
+
+class StatisticsWriter:  # pylint: disable=too-few-public-methods
+    """Writes statistics into a file, one generation per line."""
+
+    _FIELDS = [
+        "generation",
+        "population",
+        "births",
+        "deaths",
+        "min_row",
+        "min_column",
+        "max_row",
+        "max_column",
+        "max_density",
+    ]
+
+    def __init__(self, output: TextIO, statistics_format: StatisticsFormat = StatisticsFormat.CSV):
+        """StatisticsWriter constructor: write the header of a CSV file.
+
+        :param output: file the statistics are written into.
+        :param statistics_format: format of the file.
+        """
+        self.output: TextIO = output
+        self.statistics_format: StatisticsFormat = statistics_format
+        self._writer = None
+        if statistics_format == StatisticsFormat.CSV:
+            self._writer = csv.writer(output)
+            self._writer.writerow(self._FIELDS)
+
+    def write(self, statistics: Statistics) -> None:
+        """Writes the statistics of a generation.
+
+        :param statistics: statistics.
+        """
+        bounding_box = statistics.bounding_box or (None, None, None, None)
+        values = [*statistics[:4], *bounding_box, round(statistics.max_density, 6)]
+        if self._writer is not None:
+            self._writer.writerow(["" if value is None else value for value in values])
+        else:
+            self.output.write(json.dumps(dict(zip(self._FIELDS, values))) + "\n")
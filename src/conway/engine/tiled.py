@@ -0,0 +1,243 @@
+"""This module contains a dense engine skipping the quiescent regions of the grid.
+
+The grid is split into square tiles. A tile only has to be computed if it, or one of its 8
+neighboring tiles, changed during the previous generation: other tiles can't change. The grid is
+stored in two buffers (current and next generation) surrounded by a border of dead cells, so that
+every tile and its halo can be read at once. Active tiles are gathered and computed together with
+whole-array operations.
+"""
+
+from typing import Generator, Optional
+
+import numpy as np
+from numpy.lib.stride_tricks import as_strided
+
+from .changes import ChangeTracker
+from .rule import CONWAY, Rule, apply_rule
+
+
+def padded_shape(shape: tuple[int, int], tile_size: int) -> tuple[int, int]:
+    """Gets the shape of the buffers storing a grid split in tiles.
+
+    :param shape: shape of the grid.
+    :param tile_size: size of the tiles.
+    :returns: shape of the buffers (a whole number of tiles and a border of dead cells).
+    """
+    return (-(-shape[0] // tile_size) * tile_size + 2, -(-shape[1] // tile_size) * tile_size + 2)
+
+
+def _tiles(buffer: np.ndarray, tile_size: int, halo: bool) -> np.ndarray:
+    """Gets a view of a buffer split in tiles.
+
+    :param buffer: padded buffer.
+    :param tile_size: size of the tiles.
+    :param halo: whether the tiles include the surrounding halo of cells.
+    :returns: view of shape ``(tile_rows, tile_columns, size, size)``.
+    """
+    nb_tile_rows = (buffer.shape[0] - 2) // tile_size
+    nb_tile_columns = (buffer.shape[1] - 2) // tile_size
+    row_stride, column_stride = buffer.strides
+    size = tile_size + 2 if halo else tile_size
+    return as_strided(
+        buffer if halo else buffer[1:, 1:],
+        shape=(nb_tile_rows, nb_tile_columns, size, size),
+        strides=(row_stride * tile_size, column_stride * tile_size, row_stride, column_stride),
+        writeable=not halo,
+    )
+
+
+def dilate(mask: np.ndarray) -> np.ndarray:
+    """Extends a mask of tiles to the neighbors of every tile.
+
+    :param mask: boolean mask of tiles.
+    :returns: mask of the tiles that are in the mask or next to a tile of the mask.
+    """
+    vertical = mask.copy()
+    vertical[1:] |= mask[:-1]
+    vertical[:-1] |= mask[1:]
+
+    dilated = vertical.copy()
+    dilated[:, 1:] |= vertical[:, :-1]
+    dilated[:, :-1] |= vertical[:, 1:]
+    return dilated
+
+
+def step_tiles(
+    src: np.ndarray,
+    dst: np.ndarray,
+    tile_rows: np.ndarray,
+    tile_columns: np.ndarray,
+    tile_size: int,
+    shape: tuple[int, int],
+    rule: Rule = CONWAY,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Computes the next generation of some tiles of ``src`` into ``dst``.
+
+    :param src: padded buffer of the current generation.
+    :param dst: padded buffer receiving the next generation.
+    :param tile_rows: rows of the tiles to compute.
+    :param tile_columns: columns of the tiles to compute.
+    :param tile_size: size of the tiles.
+    :param shape: shape of the grid (cells beyond it always stay dead).
+    :param rule: rule (cells can't be born without living neighbors).
+    :returns: boolean arrays telling for each computed tile whether it changed and whether it
+        contains living cells.
+    """
+    windows = _tiles(src, tile_size, halo=True)[tile_rows, tile_columns]
+
+    # Number of living cells in the 3x3 neighborhood of every cell, the cell included.
+    vertical = windows[:, :-2] + windows[:, 1:-1] + windows[:, 2:]
+    counts = vertical[:, :, :-2] + vertical[:, :, 1:-1] + vertical[:, :, 2:]
+    cells = windows[:, 1:-1, 1:-1]
+    if rule == CONWAY:
+        next_cells = ((counts == 3) | ((counts == 4) & (cells == 1))).view(np.uint8)
+    else:
+        next_cells = apply_rule(cells, counts - cells, rule)
+
+    if shape[0] % tile_size or shape[1] % tile_size:
+        cell_range = np.arange(tile_size)
+        row_limits = shape[0] - tile_rows * tile_size
+        column_limits = shape[1] - tile_columns * tile_size
+        next_cells &= cell_range[np.newaxis, :, np.newaxis] < row_limits[:, np.newaxis, np.newaxis]
+        next_cells &= (
+            cell_range[np.newaxis, np.newaxis, :] < column_limits[:, np.newaxis, np.newaxis]
+        )
+
+    _tiles(dst, tile_size, halo=False)[tile_rows, tile_columns] = next_cells
+    return (next_cells != cells).any(axis=(1, 2)), next_cells.any(axis=(1, 2))
+
+
+def copy_tiles(src: np.ndarray, dst: np.ndarray, mask: np.ndarray, tile_size: int) -> None:
+    """Copies some tiles of a grid into another one.
+
+    :param src: grid array to copy tiles from.
+    :param dst: grid array to copy tiles into.
+    :param mask: boolean mask of the tiles to copy.
+    :param tile_size: size of the tiles.
+    """
+    for tile_row, tile_column in zip(*np.nonzero(mask)):
+        rows = slice(tile_row * tile_size, (tile_row + 1) * tile_size)
+        columns = slice(tile_column * tile_size, (tile_column + 1) * tile_size)
+        dst[rows, columns] = src[rows, columns]
+
+
+def changed_tile_cells(
+    src: np.ndarray, dst: np.ndarray, mask: np.ndarray, tile_size: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """Gets the cells that differ between two grids, only comparing some tiles.
+
+    :param src: grid array of the new generation.
+    :param dst: grid array of the previous generation.
+    :param mask: boolean mask of the tiles that changed.
+    :param tile_size: size of the tiles.
+    :returns: flat indices of the cells born and of the cells dead.
+    """
+    born, dead = [np.zeros(0, dtype=np.intp)], [np.zeros(0, dtype=np.intp)]
+    for tile_row, tile_column in zip(*np.nonzero(mask)):
+        rows = slice(tile_row * tile_size, (tile_row + 1) * tile_size)
+        columns = slice(tile_column * tile_size, (tile_column + 1) * tile_size)
+        cells, previous = src[rows, columns] != 0, dst[rows, columns] != 0
+        for changes, changed in ((born, cells & ~previous), (dead, previous & ~cells)):
+            cell_rows, cell_columns = np.nonzero(changed)
+            changes.append(
+                np.ravel_multi_index(
+                    (cell_rows + rows.start, cell_columns + columns.start), src.shape
+                )
+            )
+    return np.concatenate(born), np.concatenate(dead)
+
+
+class TiledGrid:
+    """Grid split in tiles, only computing the tiles that may change."""
+
+    def __init__(self, array: np.ndarray, tile_size: int = 64, rule: Rule = CONWAY):
+        """TiledGrid constructor: initialize the buffers with a grid array.
+
+        :param array: grid array.
+        :param tile_size: size of the tiles.
+        :param rule: rule (cells can't be born without living neighbors).
+        """
+        if tile_size < 1:
+            raise ValueError(f"Tile size must be positive but {tile_size} was given")
+        if 0 in rule.birth:
+            raise ValueError(f"Quiescent regions can't be skipped with the rule {rule}")
+
+        self.shape: tuple[int, int] = array.shape
+        self.tile_size: int = tile_size
+        self.rule: Rule = rule
+        self._buffers: list[np.ndarray] = [
+            np.zeros(padded_shape(array.shape, tile_size), dtype=np.uint8) for _ in range(2)
+        ]
+        for buffer in self._buffers:
+            buffer[1 : self.shape[0] + 1, 1 : self.shape[1] + 1] = array != 0
+        self._current: int = 0
+
+        tiles = _tiles(self._buffers[0], tile_size, halo=False)
+        self.active: np.ndarray = np.ones(tiles.shape[:2], dtype=bool)
+        self.changed: np.ndarray = np.ones(tiles.shape[:2], dtype=bool)
+        self.occupied: np.ndarray = np.asarray(tiles.any(axis=(2, 3)))
+
+    def to_array(self) -> np.ndarray:
+        """Gets the current generation.
+
+        :returns: view of the current generation (living cells are 1).
+        """
+        return self._buffers[self._current][1 : self.shape[0] + 1, 1 : self.shape[1] + 1]
+
+    def step(self) -> None:
+        """Computes the next generation of the active tiles and updates the active tiles."""
+        tile_rows, tile_columns = np.nonzero(self.active)
+        src, dst = self._buffers[self._current], self._buffers[1 - self._current]
+
+        self.changed[...] = False
+        self.changed[tile_rows, tile_columns], self.occupied[tile_rows, tile_columns] = step_tiles(
+            src, dst, tile_rows, tile_columns, self.tile_size, self.shape, self.rule
+        )
+
+        self.active = dilate(self.changed)
+        self._current = 1 - self._current
+
+    def copy_changes(self, array: np.ndarray) -> None:
+        """Copies the tiles that changed during the last generation into a grid array.
+
+        :param array: grid array holding the previous generation.
+        """
+        copy_tiles(self.to_array(), array, self.changed, self.tile_size)
+
+    def changed_cells(self, array: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Gets the cells born and dead during the last generation, only comparing the tiles that
+        changed.
+
+        :param array: grid array holding the previous generation.
+        :returns: flat indices of the cells born and of the cells dead.
+        """
+        return changed_tile_cells(self.to_array(), array, self.changed, self.tile_size)
+
+
+def generate(
+    grid_array: np.ndarray,
+    tile_size: int = 64,
+    rule: Rule = CONWAY,
+    tracker: Optional[ChangeTracker] = None,
+) -> Generator[np.ndarray, None, None]:
+    """Yields a new grid accordingly to Conway's rules, only computing the tiles that may change.
+
+    The grid is updated in place so that the yielded array is always ``grid_array``.
+
+    :param grid_array: array to update.
+    :param tile_size: size of the tiles.
+    :param rule: rule (cells can't be born without living neighbors).
+    :param tracker: if given, tracker updated with the cells of the tiles that changed.
+    :yield: updated grid.
+    """
+    grid = TiledGrid(grid_array, tile_size, rule)
+    if tracker is not None:
+        tracker.reset(grid_array)
+
+    while grid.occupied.any():
+        yield grid_array
+
+        grid.step()
+        if tracker is not None:
+            tracker.update(*grid.changed_cells(grid_array))
+        grid.copy_changes(grid_array)
@@ -0,0 +1,86 @@
+"""This module contains a whole-array implementation of Conway's rules."""
+
+from typing import Generator, Optional
+
+import numpy as np
+
+from .changes import ChangeTracker, changed_cells
+from .rule import CONWAY, Rule, apply_rule
+from .simulation import Simulation
+
+
+def count_neighbors(array: np.ndarray) -> np.ndarray:
+    """Counts the living neighbors of every cell. Cells outside the array are considered dead.
+
+    :param array: grid array, or stack of grid arrays (the grids being the last two axes).
+    :returns: array of the same shape containing the number of living neighbors of each cell.
+    """
+    alive = (array != 0).view(np.uint8)
+
+    vertical = alive.copy()
+    vertical[..., 1:, :] += alive[..., :-1, :]
+    vertical[..., :-1, :] += alive[..., 1:, :]
+
+    counts = vertical.copy()
+    counts[..., 1:] += vertical[..., :-1]
+    counts[..., :-1] += vertical[..., 1:]
+    counts -= alive
+
+    return counts
+
+
+def next_generation(array: np.ndarray, rule: Rule = CONWAY) -> np.ndarray:
+    """Computes the next generation of the grid according to Conway's rules (or to another
+    Life-like rule).
+
+    :param array: grid array, or stack of grid arrays (the grids being the last two axes).
+    :param rule: rule.
+    :returns: new array (same dtype as ``array``) containing the next generation.
+    """
+    return apply_rule(array, count_neighbors(array), rule).astype(array.dtype)
+
+
+def generate(
+    grid_array: np.ndarray, rule: Rule = CONWAY, tracker: Optional[ChangeTracker] = None
+) -> Generator[np.ndarray, None, None]:
+    """Yields a new grid accordingly to Conway's rules, using whole-array operations.
+
+    The grid is updated in place so that the yielded array is always ``grid_array``. Generations
+    are computed between the preallocated buffers of a ``Simulation``, then copied into the grid
+    (changes made to the grid between two generations are therefore ignored). Generation stops when
+    the grid is empty, unless cells are born without living neighbors.
+
+    :param grid_array: array to update.
+    :param rule: rule.
+    :param tracker: if given, tracker updated with the cells changed between the two buffers.
+    :yield: updated grid.
+    """
+    simulation = Simulation(grid_array, rule)
+    mask = np.empty(grid_array.shape, dtype=bool) if tracker is not None else None
+    if tracker is not None:
+        tracker.reset(grid_array)
+
+    endless = 0 in rule.birth
+    while endless or grid_array.any():
+        yield grid_array
+
+        simulation.step()
+        if tracker is not None and mask is not None:
+            tracker.update(*changed_cells(simulation.grid, simulation.previous, mask))
+        np.copyto(grid_array, simulation.grid, casting="unsafe")
+
+
+def step_band(src: np.ndarray, dst: np.ndarray, start: int, stop: int, rule: Rule = CONWAY) -> None:
+    """Computes the next generation of the rows ``start`` to ``stop`` (excluded) of ``src`` into
+    ``dst``. Only the band and its two halo rows are read from ``src``.
+
+    :param src: grid array of the current generation.
+    :param dst: grid array receiving the next generation.
+    :param start: first row of the band.
+    :param stop: row after the last row of the band.
+    :param rule: rule.
+    """
+    top = max(start - 1, 0)
+    bottom = min(stop + 1, src.shape[0])
+    band = next_generation(src[top:bottom], rule)
+    dst[start:stop] = band[start - top : stop - top]
@@ -0,0 +1,449 @@
+"""This module contains the census of the objects of a grid.
+
+Living cells are grouped into clusters: two cells belong to the same cluster if they are at most
+``distance`` cells apart (2 by default, so that objects made of several parts, such as the pulsar,
+aren't split, at the cost of merging objects close enough to interact). Every cluster is then
+identified against a catalog of known objects. Some phases of known objects have parts further
+apart (e.g. the penta-decathlon): the clusters left unknown are grouped again with the greatest
+distance needed by the catalog, and kept apart if this doesn't identify them either.
+
+The catalog is indexed by the exact cells of every phase of every object, in each of its 8
+orientations (rotations and reflections), so that a known object is identified with a single
+dictionary lookup. Only unknown objects are canonicalized: they are evolved in isolation (for at
+most ``max_period`` generations, as when an object is added to the catalog), and the smallest of the
+8 orientations of all their phases is their canonical form. They are counted by a hash of it, so
+that an unknown object has the same hash in every phase, can be told apart from others and added to
+the catalog. Unknown clusters grouped with the greatest distance are counted as a single object if
+one of the phases of the group is a single cluster, so that the phases of an unknown object whose
+parts are further apart aren't split either: the phases of a group are only computed until one of
+them is, and only for groups of several clusters.
+"""
+
+import hashlib
+from collections import Counter
+from functools import lru_cache
+from typing import Iterator, Optional
+
+import numpy as np
+
+from ..engine.rule import CONWAY, Rule
+from ..engine.vectorized import next_generation
+from .structures import (
+    OscillatingStructures,
+    Oscillator,
+    SpaceshipStructures,
+    Spaceship,
+    Stabilized,
+    StabilizedStructures,
+)
+
+_DEFAULT_DISTANCE = 2
+_DEFAULT_MAX_PERIOD = 64
+
+Key = tuple[int, int, bytes]
+
+
+def _key(cells: np.ndarray) -> Key:
+    """Gets the key of a cropped object.
+
+    :param cells: cropped array of the object.
+    :returns: shape and packed cells of the object.
+    """
+    return cells.shape[0], cells.shape[1], np.packbits(cells != 0, axis=None).tobytes()
+
+
+def crop(cells: np.ndarray) -> np.ndarray:
+    """Crops an array to the bounding box of its living cells.
+
+    :param cells: array.
+    :returns: view of the bounding box (empty if there is no living cell).
+    """
+    rows, columns = np.nonzero(cells)
+    if not rows.size:
+        return cells[:0, :0]
+    return cells[rows.min() : rows.max() + 1, columns.min() : columns.max() + 1]
+
+
+def orientations(cells: np.ndarray) -> list[np.ndarray]:
+    """Gets the 8 orientations of an object (rotations and reflections).
+
+    :param cells: array of the object.
+    :returns: arrays of the orientations, some of which may be equal for symmetric objects.
+    """
+    return [np.rot90(array, turns) for array in (cells, cells[:, ::-1]) for turns in range(4)]
+
+
+def _hash(key: Key) -> str:
+    """Gets the hash of a key.
+
+    :param key: key of an object.
+    :returns: hexadecimal hash of the shape and packed cells of the object.
+    """
+    height, width, packed = key
+    return hashlib.blake2b(f"{height}x{width}:".encode() + packed, digest_size=8).hexdigest()
+
+
+def _canonical_key(cells: np.ndarray) -> Key:
+    """Gets the key of an object, identical for all its orientations.
+
+    :param cells: cropped array of the object.
+    :returns: smallest key among the orientations of the object.
+    """
+    return min(_key(array) for array in orientations(cells))
+
+
+def _evolve(
+    cells: np.ndarray, rule: Rule = CONWAY, max_period: int = _DEFAULT_MAX_PERIOD
+) -> Iterator[tuple[Key, np.ndarray]]:
+    """Yields the phases of an object, until one of them repeats (up to orientation and position),
+    the object dies or ``max_period`` phases are yielded.
+
+    :param cells: array of the object, in its first phase.
+    :param rule: rule the phases are computed with.
+    :param max_period: greatest number of phases yielded.
+    :yield: canonical key and cropped array of every distinct phase, in order.
+    """
+    phase = crop(np.asarray(cells) != 0).view(np.uint8)
+    keys: set[Key] = set()
+    while phase.size and len(keys) < max_period:
+        key = _canonical_key(phase)
+        if key in keys:
+            return
+        keys.add(key)
+        yield key, phase
+        phase = crop(next_generation(np.pad(phase, 1), rule))
+
+
+def phases(
+    cells: np.ndarray, rule: Rule = CONWAY, max_period: int = _DEFAULT_MAX_PERIOD
+) -> dict[Key, np.ndarray]:
+    """Computes the phases of an object, until one of them repeats (up to orientation and
+    position), the object dies or ``max_period`` phases are computed.
+
+    :param cells: array of the object, in its first phase.
+    :param rule: rule the phases are computed with.
+    :param max_period: greatest number of phases computed.
+    :returns: cropped arrays of the distinct phases, in order, by canonical key.
+    """
+    return dict(_evolve(cells, rule, max_period))
+
+
+def canonical_hash(
+    cells: np.ndarray, rule: Rule = CONWAY, max_period: int = _DEFAULT_MAX_PERIOD
+) -> str:
+    """Gets a hash of an object, identical for all its phases (the phases of a periodic object
+    whose period is at most ``max_period``), orientations and positions.
+
+    :param cells: array of the object.
+    :param rule: rule the phases of the object are computed with.
+    :param max_period: greatest number of phases computed.
+    :returns: hexadecimal hash of the smallest key among the orientations of the phases of the
+        object.
+    """
+    return _hash(min(phases(cells, rule, max_period), default=(0, 0, b"")))
+
+
+def _close_pairs(
+    rows: np.ndarray, columns: np.ndarray, width: int, distance: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """Finds the pairs of living cells close to each other, by looking the neighbors of every cell
+    up among the sorted positions of the living cells.
+
+    :param rows: rows of the living cells, sorted by row then column.
+    :param columns: columns of the living cells.
+    :param width: width of the grid.
+    :param distance: greatest distance (in rows or columns) between the cells of a pair.
+    :returns: indices of the first and second cells of every pair.
+    """
+    # Columns are shifted so that neighbors never wrap around to the next row.
+    width += 2 * distance
+    keys = (rows + distance) * width + columns + distance
+    firsts, seconds = [], []
+    for row_offset in range(distance + 1):
+        for column_offset in range(-distance, distance + 1):
+            if row_offset == 0 and column_offset <= 0:
+                continue
+            targets = keys + row_offset * width + column_offset
+            indices = np.minimum(np.searchsorted(keys, targets), keys.size - 1)
+            found = keys[indices] == targets
+            firsts.append(np.flatnonzero(found))
+            seconds.append(indices[found])
+    return np.concatenate(firsts), np.concatenate(seconds)
+
+
+def label_clusters(
+    array: np.ndarray, distance: int = _DEFAULT_DISTANCE
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Groups the living cells of a grid into clusters.
+
+    Pairs of living cells close enough are found by looking their neighbors up among the sorted
+    positions of the living cells, or by comparing every pair when there are few living cells
+    compared to the number of neighbors. Clusters are then the connected components of these
+    pairs, found by propagating the smallest index of every component, with pointer jumping.
+
+    :param array: grid array.
+    :param distance: greatest distance (in rows or columns) between two cells of the same cluster.
+    :returns: rows and columns of the living cells, and cluster of each of them (index of one of
+        its cells).
+    """
+    if distance < 1:
+        raise ValueError(f"Distance must be positive but {distance} was given")
+
+    rows, columns = np.nonzero(array)
+    if rows.size <= 16 * distance**2:
+        close = np.abs(rows[:, np.newaxis] - rows) <= distance
+        close &= np.abs(columns[:, np.newaxis] - columns) <= distance
+        first, second = np.nonzero(np.triu(close, 1))
+    else:
+        first, second = _close_pairs(rows, columns, array.shape[1], distance)
+
+    labels = np.arange(rows.size)
+    while True:
+        smallest = np.minimum(labels[first], labels[second])
+        updated = labels.copy()
+        np.minimum.at(updated, first, smallest)
+        np.minimum.at(updated, second, smallest)
+        updated = updated[updated]
+        if np.array_equal(updated, labels):
+            return rows, columns, labels
+        labels = updated
+
+
+def clusters(
+    array: np.ndarray, distance: int = _DEFAULT_DISTANCE
+) -> Iterator[tuple[tuple[int, int], np.ndarray]]:
+    """Yields the clusters of living cells of a grid.
+
+    :param array: grid array.
+    :param distance: greatest distance (in rows or columns) between two cells of the same cluster.
+    :yield: position of the top-left corner and cropped array of every cluster.
+    """
+    rows, columns, labels = label_clusters(array, distance)
+    order = np.argsort(labels, kind="stable")
+    bounds = np.flatnonzero(np.diff(labels[order])) + 1
+    for cells in np.split(order, bounds) if order.size else []:
+        cluster_rows, cluster_columns = rows[cells], columns[cells]
+        top, left = cluster_rows.min(), cluster_columns.min()
+        cluster = np.zeros(
+            (cluster_rows.max() - top + 1, cluster_columns.max() - left + 1), dtype=np.uint8
+        )
+        cluster[cluster_rows - top, cluster_columns - left] = 1
+        yield (int(top), int(left)), cluster
+
+
+def spread(cells: np.ndarray) -> int:
+    """Gets the smallest distance grouping all the cells of an object into a single cluster.
+
+    :param cells: array of the object.
+    :returns: distance (in rows or columns).
+    """
+    distance = 1
+    while len(np.unique(label_clusters(cells, distance)[2])) > 1:
+        distance += 1
+    return distance
+
+
+def is_cluster(cells: np.ndarray, distance: int = _DEFAULT_DISTANCE) -> bool:
+    """Checks whether all the cells of an object form a single cluster.
+
+    :param cells: array of the object.
+    :param distance: greatest distance (in rows or columns) between two cells of the same cluster.
+    :returns: whether the object is a single cluster.
+    """
+    # Every cluster is labeled with the index of one of its cells, the first one with 0.
+    return not label_clusters(cells, distance)[2].any()
+
+
+class Catalog:
+    """Index of known objects, by the cells of each of their phases and orientations."""
+
+    def __init__(self, rule: Rule = CONWAY, max_period: int = _DEFAULT_MAX_PERIOD):
+        """Catalog constructor.
+
+        :param rule: rule the phases of the objects are computed with.
+        :param max_period: greatest number of phases computed for an object.
+        """
+        self.rule: Rule = rule
+        self.max_period: int = max_period
+        self.phases: dict[str, int] = {}
+        self.distance: int = 1
+        self._index: dict[Key, str] = {}
+        self._canonical: dict[Key, str] = {}
+
+    def __len__(self) -> int:
+        return len(self.phases)
+
+    def add(self, name: str, cells: np.ndarray) -> int:
+        """Adds an object to the catalog, computing its phases.
+
+        :param name: name of the object.
+        :param cells: array of the object, in any phase.
+        :returns: number of phases of the object (up to orientation and position).
+        """
+        distinct = phases(cells, self.rule, self.max_period)
+        for phase in distinct.values():
+            self.distance = max(self.distance, spread(phase))
+            for array in orientations(phase):
+                self._index.setdefault(_key(array), name)
+        self.phases[name] = len(distinct)
+        return len(distinct)
+
+    def lookup(self, cells: np.ndarray) -> Optional[str]:
+        """Looks an object up.
+
+        :param cells: cropped array of the object.
+        :returns: name of the object, or None if it is unknown.
+        """
+        return self._index.get(_key(cells))
+
+    def identify(self, cells: np.ndarray) -> str:
+        """Identifies an object.
+
+        :param cells: cropped array of the object.
+        :returns: name of the object if it is known, its canonical hash otherwise.
+        """
+        name = self.lookup(cells)
+        return name if name is not None else self.canonicalize(cells)
+
+    def canonicalize(self, cells: np.ndarray) -> str:
+        """Canonicalizes an unknown object, computing its phases once for all its occurrences in
+        the same phase and orientation.
+
+        :param cells: cropped array of the object.
+        :returns: canonical hash of the object (see ``canonical_hash``).
+        """
+        key = _key(cells)
+        if key not in self._canonical:
+            distinct = phases(cells, self.rule, self.max_period)
+            self._canonical[key] = _hash(min(distinct, default=(0, 0, b"")))
+        return self._canonical[key]
+
+    def forms_cluster(self, cells: np.ndarray, distance: int = _DEFAULT_DISTANCE) -> bool:
+        """Checks whether an object forms a single cluster in one of its phases, computing its
+        phases only until one does.
+
+        :param cells: cropped array of the object.
+        :param distance: greatest distance (in rows or columns) between two cells of the same
+            cluster.
+        :returns: whether one of the phases of the object is a single cluster.
+        """
+        return any(
+            is_cluster(phase, distance) for _, phase in _evolve(cells, self.rule, self.max_period)
+        )
+
+
+def _group(
+    parts: list[tuple[tuple[int, int], np.ndarray]], shape: tuple[int, int], distance: int
+) -> Iterator[list[tuple[tuple[int, int], np.ndarray]]]:
+    """Groups clusters that are at most ``distance`` cells apart.
+
+    :param parts: position of the top-left corner and cropped array of every cluster.
+    :param shape: shape of the grid.
+    :param distance: greatest distance (in rows or columns) between two clusters of a group.
+    :yield: clusters of every group.
+    """
+    grid = np.zeros(shape, dtype=np.uint8)
+    for (top, left), cluster in parts:
+        grid[top : top + cluster.shape[0], left : left + cluster.shape[1]] |= cluster
+    rows, columns, labels = label_clusters(grid, distance)
+    label_grid = np.zeros(shape, dtype=labels.dtype)
+    label_grid[rows, columns] = labels
+
+    groups: dict[int, list[tuple[tuple[int, int], np.ndarray]]] = {}
+    for (top, left), cluster in parts:
+        # The first row of a cropped cluster always holds a living cell.
+        label = label_grid[top, left + int(np.argmax(cluster[0]))]
+        groups.setdefault(int(label), []).append(((top, left), cluster))
+    yield from groups.values()
+
+
+def _merge(parts: list[tuple[tuple[int, int], np.ndarray]]) -> np.ndarray:
+    """Merges clusters into a single object.
+
+    :param parts: position of the top-left corner and cropped array of every cluster.
+    :returns: cropped array of the object.
+    """
+    top = min(position[0] for position, _ in parts)
+    left = min(position[1] for position, _ in parts)
+    bottom = max(position[0] + cluster.shape[0] for position, cluster in parts)
+    right = max(position[1] + cluster.shape[1] for position, cluster in parts)
+    merged = np.zeros((bottom - top, right - left), dtype=np.uint8)
+    for (row, column), cluster in parts:
+        merged[
+            row - top : row - top + cluster.shape[0],
+            column - left : column - left + cluster.shape[1],
+        ] |= cluster
+    return merged
+
+
+def structures_catalog() -> Catalog:
+    """Builds a catalog of the structures defined in ``conway.grid.structures``.
+
+    :returns: catalog of the stabilized structures, oscillators and spaceships.
+    """
+    catalog = Catalog()
+    for structures, structure_class in (
+        (StabilizedStructures, Stabilized),
+        (OscillatingStructures, Oscillator),
+        (SpaceshipStructures, Spaceship),
+    ):
+        for structure in structures:
+            catalog.add(structure.value, structure_class(structure.value).array)
+    return catalog
+
+
+@lru_cache(maxsize=None)
+def default_catalog() -> Catalog:
+    """Gets the catalog of the structures defined in ``conway.grid.structures``, built once and
+    shared (see ``structures_catalog`` to get a catalog that can be extended).
+
+    :returns: catalog of the stabilized structures, oscillators and spaceships.
+    """
+    return structures_catalog()
+
+
+def census(
+    array: np.ndarray,
+    catalog: Optional[Catalog] = None,
+    distance: int = _DEFAULT_DISTANCE,
+    samples: Optional[dict[str, np.ndarray]] = None,
+) -> Counter[str]:
+    """Counts the objects of a grid.
+
+    :param array: grid array.
+    :param catalog: catalog of known objects (see ``default_catalog`` if not given).
+    :param distance: greatest distance (in rows or columns) between two cells of the same object.
+    :param samples: if given, dictionary receiving the cells of an unknown object of each hash.
+    :returns: number of objects, by name for known objects and by canonical hash for the others.
+    """
+    if catalog is None:
+        catalog = default_catalog()
+
+    counts: Counter[str] = Counter()
+    unknown: list[tuple[tuple[int, int], np.ndarray]] = []
+    for position, cluster in clusters(array, distance):
+        name = catalog.lookup(cluster)
+        if name is not None:
+            counts[name] += 1
+        else:
+            unknown.append((position, cluster))
+    if not unknown:
+        return counts
+
+    for group in _group(unknown, array.shape, max(catalog.distance, distance)):
+        objects = [cluster for _, cluster in group]
+        if len(group) > 1:
+            merged = _merge(group)
+            name = catalog.lookup(merged)
+            if name is not None:
+                counts[name] += 1
+                continue
+            # The parts are a single object if they form a single cluster in one of its phases.
+            if catalog.forms_cluster(merged, distance):
+                objects = [merged]
+        for cells in objects:
+            object_hash = catalog.canonicalize(cells)
+            counts[object_hash] += 1
+            if samples is not None:
+                samples.setdefault(object_hash, cells)
+    return counts
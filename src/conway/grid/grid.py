@@ -6,6 +6,7 @@ import numpy as np
 
 from conway.transform.array import padding
 from .cell import get_neighbors
+from ..engine.rule import CONWAY, Rule
 from .structures import (
     Oscillator,
     Spaceship,
@@ -40,15 +41,20 @@ class GridInitialization(Enum):
 
 
 def update_positions(
-    array: np.ndarray, living_cells: set[tuple], subset_living_cells: set[tuple]
+    array: np.ndarray,
+    living_cells: set[tuple],
+    subset_living_cells: set[tuple],
+    rule: Rule = CONWAY,
 ) -> tuple[set[tuple], set[tuple]]:
     """Updates the grid according to the different rules.
 
     :param array: grid array.
     :param living_cells: living cells positions.
     :param subset_living_cells: subset of living cells positions.
+    :param rule: rule (cells can't be born without living neighbors).
     :returns: positions of the living cells.
     """
+    births, survivals = rule.table
     prev_living_cells: set[tuple] = subset_living_cells.copy()
     for living_cell in prev_living_cells:
         living_cell_neighbors: set[tuple] = get_neighbors(array.shape, *living_cell)
@@ -58,7 +64,7 @@ def update_positions(
             living_cell_neighbors - living_cell_living_neighbors
         )
 
-        if len(living_cell_living_neighbors) < 2 or len(living_cell_living_neighbors) > 3:
+        if not survivals[len(living_cell_living_neighbors)]:
             subset_living_cells.remove(tuple(living_cell))
 
         for dead_neighbor in living_cell_dead_neighbors:
@@ -66,7 +72,7 @@ def update_positions(
 
             dead_cell_living_neighbors: set[tuple] = dead_cell_neighbors.intersection(living_cells)
 
-            if len(dead_cell_living_neighbors) == 3:
+            if births[len(dead_cell_living_neighbors)]:
                 subset_living_cells.add(tuple(dead_neighbor))
 
     return subset_living_cells, prev_living_cells
@@ -0,0 +1,232 @@
+"""This module contains the instrumentation of simulations.
+
+A profiler records, for every generation, the time spent in each phase of its computation, the
+population and the number of births and deaths. With the sets engine, phases are the creation of the
+subsets of cells, the computation of the workers (and the imbalance between them), the transfer of
+data to and from the workers, the merge of their results and the update of the grid. With the other
+engines, only the whole step is timed. When frames are displayed, the drawing time is recorded too.
+
+Records are given to a callback and/or written to a JSON-lines file as soon as a generation is over.
+When instrumentation is disabled, a ``NullProfiler`` is used, whose methods do nothing, and frames
+aren't even wrapped, so that the simulation isn't slowed down.
+"""
+
+import json
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
+from enum import Enum
+from typing import Any, Callable, ContextManager, Iterable, Iterator, Optional, TextIO
+
+import numpy as np
+
+
+class Phase(Enum):
+    """Phases of the computation of a generation."""
+
+    STEP = "step"
+    SUBSETS = "subsets"
+    WORKERS = "workers"
+    TRANSFER = "transfer"
+    MERGE = "merge"
+    UPDATE_GRID = "update_grid"
+    DRAW = "draw"
+
+
+Record = dict[str, Any]
+
+
+class Profiler:
+    """Records the timings, population and changes of every generation."""
+
+    enabled: bool = True
+
+    def __init__(
+        self,
+        callback: Optional[Callable[[Record], None]] = None,
+        output: Optional[TextIO] = None,
+    ):
+        """Profiler constructor.
+
+        :param callback: function called with the record of every generation.
+        :param output: file the records are written into, one JSON object per line.
+        """
+        self.callback: Optional[Callable[[Record], None]] = callback
+        self.output: Optional[TextIO] = output
+        self.nb_generations: int = 0
+        self.totals: defaultdict[str, float] = defaultdict(float)
+        self.max_imbalance: float = 1.0
+        self._phases: defaultdict[str, float] = defaultdict(float)
+        self._workers: list[float] = []
+        self._lock = threading.Lock()
+
+    def phase(self, phase: Phase) -> ContextManager[None]:
+        """Times a phase of the current generation.
+
+        :param phase: phase timed.
+        :returns: context timing its body.
+        """
+        return self._timed(phase)
+
+    @contextmanager
+    def _timed(self, phase: Phase) -> Iterator[None]:
+        """Times a phase of the current generation.
+
+        :param phase: phase timed.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(phase, time.perf_counter() - start)
+
+    def add(self, phase: Phase, seconds: float) -> None:
+        """Adds time spent in a phase of the current generation.
+
+        :param phase: phase.
+        :param seconds: time spent.
+        """
+        with self._lock:
+            self._phases[phase.value] += seconds
+
+    def add_workers(self, seconds: list[float], wall_time: float) -> None:
+        """Records the computation time of every worker.
+
+        :param seconds: time spent computing by every worker.
+        :param wall_time: time between sending the work and getting back every result, the
+            difference with the slowest worker being spent transferring data.
+        """
+        with self._lock:
+            self._workers.extend(seconds)
+            self._phases[Phase.WORKERS.value] += wall_time
+            self._phases[Phase.TRANSFER.value] += max(wall_time - max(seconds, default=0.0), 0.0)
+
+    def end_generation(self, generation: int, population: int, births: int, deaths: int) -> None:
+        """Ends the current generation, and gives its record to the callback and the output.
+
+        :param generation: generation.
+        :param population: number of living cells.
+        :param births: number of cells born since the previous record.
+        :param deaths: number of cells dead since the previous record.
+        """
+        with self._lock:
+            phases, self._phases = dict(self._phases), defaultdict(float)
+            workers, self._workers = self._workers, []
+
+        record: Record = {
+            "generation": generation,
+            "population": population,
+            "births": births,
+            "deaths": deaths,
+            "phases": phases,
+        }
+        if workers:
+            imbalance = max(workers) / max(sum(workers) / len(workers), 1e-12)
+            record["workers"] = workers
+            record["imbalance"] = imbalance
+            self.max_imbalance = max(self.max_imbalance, imbalance)
+
+        self.nb_generations += 1
+        for name, seconds in phases.items():
+            self.totals[name] += seconds
+        if self.callback is not None:
+            self.callback(record)
+        if self.output is not None:
+            self.output.write(json.dumps(record) + "\n")
+
+    def summary(self) -> str:
+        """Summarizes the records.
+
+        :returns: mean time of every phase per generation.
+        """
+        lines = [f"{self.nb_generations} generations profiled"]
+        for name, seconds in sorted(self.totals.items(), key=lambda item: -item[1]):
+            lines.append(
+                f"{name:>12}: {seconds:.4f}s "
+                f"({1000 * seconds / max(self.nb_generations, 1):.3f}ms per generation)"
+            )
+        if self.max_imbalance > 1:
+            lines.append(f"max worker imbalance: {self.max_imbalance:.2f}")
+        return "\n".join(lines)
+
+
+class NullProfiler(Profiler):
+    """Profiler recording nothing."""
+
+    enabled = False
+
+    def phase(self, phase: Phase) -> ContextManager[None]:
+        """Does nothing.
+
+        :param phase: phase timed.
+        :returns: context doing nothing.
+        """
+        return nullcontext()
+
+    def add(self, phase: Phase, seconds: float) -> None:
+        """Does nothing.
+
+        :param phase: phase.
+        :param seconds: time spent.
+        """
+
+    def add_workers(self, seconds: list[float], wall_time: float) -> None:
+        """Does nothing.
+
+        :param seconds: time spent computing by every worker.
+        :param wall_time: time between sending the work and getting back every result.
+        """
+
+    def end_generation(self, generation: int, population: int, births: int, deaths: int) -> None:
+        """Does nothing.
+
+        :param generation: generation.
+        :param population: number of living cells.
+        :param births: number of cells born since the previous record.
+        :param deaths: number of cells dead since the previous record.
+        """
+
+
+def profile_frames(
+    frames: Iterable[np.ndarray], profiler: Profiler, step: int = 1, time_steps: bool = True
+) -> Iterator[np.ndarray]:
+    """Yields frames, recording the time spent computing each of them and the changes between
+    consecutive frames.
+
+    :param frames: frames of the simulation (possibly always the same array updated in place).
+    :param profiler: profiler receiving the records.
+    :param step: number of generations between two frames.
+    :param time_steps: whether the computation of every frame is timed as a whole, which must be
+        disabled when the engine times its own phases so that they aren't counted twice.
+    :yield: frames.
+    """
+    iterator = iter(frames)
+    previous: Optional[np.ndarray] = None
+    generation = 0
+    try:
+        while True:
+            start = time.perf_counter()
+            try:
+                frame = next(iterator)
+            except StopIteration:
+                return
+            if time_steps:
+                profiler.add(Phase.STEP, time.perf_counter() - start)
+
+            cells = frame != 0
+            if previous is None:
+                births, deaths = int(np.count_nonzero(cells)), 0
+                previous = cells
+            else:
+                births = int(np.count_nonzero(cells & ~previous))
+                deaths = int(np.count_nonzero(previous & ~cells))
+                previous[...] = cells
+            profiler.end_generation(generation, int(np.count_nonzero(cells)), births, deaths)
+
+            yield frame
+            generation += step
+    finally:
+        close = getattr(iterator, "close", None)
+        if close is not None:
+            close()
@@ -0,0 +1,220 @@
+"""This module contains the checkpoints of long-running simulations.
+
+A checkpoint holds everything needed to resume a simulation exactly where it stopped: the grid (as
+the flat indices of its living cells when they are few, packed as bits otherwise), the generation,
+the state of the random generators and the parameters of the simulation (engine, rule, ...). It is
+stored as a compressed numpy archive, written into a temporary file which is then renamed, so that
+a crash while writing never leaves a corrupted checkpoint behind.
+
+Checkpoints are written by a background thread so that the simulation doesn't wait for the disk.
+If a checkpoint is asked for while the previous one is still being written, the pending one is
+replaced by the newer one, so that only the latest state is ever waiting to be written.
+"""
+
+import json
+import os
+import random
+import threading
+from pathlib import Path
+from types import TracebackType
+from typing import Any, NamedTuple, Optional, Type, Union, cast
+
+import numpy as np
+
+_PREFIX = "checkpoint_"
+_SUFFIX = ".npz"
+
+
+class Checkpoint(NamedTuple):
+    """State of a simulation at a given generation."""
+
+    generation: int
+    grid: np.ndarray
+    parameters: dict[str, Any]
+    random_state: dict[str, Any]
+
+
+def random_state() -> dict[str, Any]:
+    """Gets the state of the random generators (the ``random`` module and numpy's global one).
+
+    :returns: state of the random generators, serializable as JSON.
+    """
+    version, internal, gauss = random.getstate()
+    numpy_state = cast(tuple[str, np.ndarray, int, int, float], np.random.get_state())
+    name, keys, position, has_gauss, cached_gauss = numpy_state
+    return {
+        "random": [version, list(internal), gauss],
+        "numpy": [name, keys.tolist(), position, has_gauss, cached_gauss],
+    }
+
+
+def set_random_state(state: dict[str, Any]) -> None:
+    """Restores the state of the random generators.
+
+    :param state: state of the random generators, as given by ``random_state``.
+    """
+    version, internal, gauss = state["random"]
+    random.setstate((version, tuple(internal), gauss))
+    name, keys, position, has_gauss, cached_gauss = state["numpy"]
+    np.random.set_state((name, np.array(keys, dtype=np.uint32), position, has_gauss, cached_gauss))
+
+
+def checkpoint_path(directory: Union[str, Path], generation: int) -> Path:
+    """Gets the path of the checkpoint of a generation.
+
+    :param directory: directory of the checkpoints.
+    :param generation: generation.
+    :returns: path of the checkpoint.
+    """
+    return Path(directory) / f"{_PREFIX}{generation:012d}{_SUFFIX}"
+
+
+def list_checkpoints(directory: Union[str, Path]) -> list[Path]:
+    """Lists the checkpoints of a directory.
+
+    :param directory: directory of the checkpoints.
+    :returns: paths of the checkpoints, from the oldest to the latest.
+    """
+    return sorted(Path(directory).glob(f"{_PREFIX}*{_SUFFIX}"))
+
+
+def latest_checkpoint(directory: Union[str, Path]) -> Optional[Path]:
+    """Gets the latest checkpoint of a directory.
+
+    :param directory: directory of the checkpoints.
+    :returns: path of the latest checkpoint, or None if there is none.
+    """
+    checkpoints = list_checkpoints(directory)
+    return checkpoints[-1] if checkpoints else None
+
+
+def save_checkpoint(path: Union[str, Path], checkpoint: Checkpoint) -> None:
+    """Writes a checkpoint atomically.
+
+    :param path: path of the checkpoint.
+    :param checkpoint: checkpoint.
+    """
+    path = Path(path)
+    cells = np.ravel(checkpoint.grid) != 0
+    indices = np.flatnonzero(cells).astype(np.uint32 if cells.size <= 2**32 else np.uint64)
+    # Living cells are stored as indices if they take less space than the packed grid.
+    arrays: dict[str, Any]
+    if indices.nbytes < cells.size // 8:
+        arrays = {"indices": indices}
+    else:
+        arrays = {"packed": np.packbits(cells)}
+    metadata = {
+        "generation": checkpoint.generation,
+        "shape": list(checkpoint.grid.shape),
+        "parameters": checkpoint.parameters,
+        "random_state": checkpoint.random_state,
+    }
+
+    temporary = path.with_name(f".{path.name}.tmp")
+    with open(temporary, "wb") as file:
+        np.savez_compressed(file, metadata=np.array(json.dumps(metadata)), **arrays)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temporary, path)
+
+
+def load_checkpoint(path: Union[str, Path]) -> Checkpoint:
+    """Reads a checkpoint.
+
+    :param path: path of the checkpoint.
+    :returns: checkpoint.
+    """
+    with np.load(path) as archive:
+        metadata = json.loads(str(archive["metadata"]))
+        shape = tuple(metadata["shape"])
+        cells = np.zeros(shape[0] * shape[1], dtype=np.uint8)
+        if "indices" in archive:
+            cells[archive["indices"]] = 1
+        else:
+            cells[...] = np.unpackbits(archive["packed"], count=cells.size)
+    return Checkpoint(
+        metadata["generation"],
+        cells.reshape(shape),
+        metadata["parameters"],
+        metadata["random_state"],
+    )
+
+
+class CheckpointWriter:
+    """Writes checkpoints in a background thread, keeping only the latest ones."""
+
+    def __init__(self, directory: Union[str, Path], keep: int = 2):
+        """CheckpointWriter constructor: start the thread.
+
+        :param directory: directory of the checkpoints.
+        :param keep: number of checkpoints kept, older ones being removed.
+        """
+        if keep < 1:
+            raise ValueError(f"Number of checkpoints kept must be positive but {keep} was given")
+
+        self.directory: Path = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.keep: int = keep
+        self.nb_written: int = 0
+        self.nb_replaced: int = 0
+        self._pending: Optional[Checkpoint] = None
+        self._closed: bool = False
+        self._error: Optional[BaseException] = None
+        self._condition = threading.Condition()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        """Writes the pending checkpoint, until the writer is closed."""
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._pending is not None or self._closed)
+                checkpoint, self._pending = self._pending, None
+                if checkpoint is None:
+                    return
+            try:
+                save_checkpoint(checkpoint_path(self.directory, checkpoint.generation), checkpoint)
+                for old in list_checkpoints(self.directory)[: -self.keep]:
+                    old.unlink()
+            except Exception as error:  # pylint: disable=broad-exception-caught
+                self._error = error
+            with self._condition:
+                self.nb_written += 1
+                self._condition.notify_all()
+
+    def write(self, generation: int, grid: np.ndarray, parameters: dict[str, Any]) -> None:
+        """Queues a checkpoint of the current state of the simulation, replacing the checkpoint
+        waiting to be written if any.
+
+        :param generation: generation.
+        :param grid: grid of the generation (copied, so that it can be updated in the meantime).
+        :param parameters: parameters of the simulation, serializable as JSON.
+        """
+        if self._error is not None:
+            raise self._error
+        checkpoint = Checkpoint(generation, grid.copy(), parameters, random_state())
+        with self._condition:
+            if self._pending is not None:
+                self.nb_replaced += 1
+            self._pending = checkpoint
+            self._condition.notify_all()
+
+    def close(self) -> None:
+        """Waits for the pending checkpoint to be written and stops the thread."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._thread.join()
+        if self._error is not None:
+            raise self._error
+
+    def __enter__(self) -> "CheckpointWriter":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.close()
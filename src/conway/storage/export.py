@@ -0,0 +1,286 @@
+"""This module contains the export of simulations to animated GIFs and raw frame streams.
+
+Frames are encoded one at a time as they are produced, so that exporting a simulation never holds
+more than a few frames in memory, whatever its number of generations. Every frame is first
+downscaled by an integer factor: each pixel of the exported frame shows the density of living cells
+in a square block of the grid, as a level of gray (white when every cell is dead, black when every
+cell is alive).
+
+- GIF: the header is written when the writer is created, then every frame is LZW-encoded (by
+  Pillow) and appended to the file.
+- raw: frames are appended as 8-bit gray pixels, without any header, which can be read by video
+  encoders (e.g. ``ffmpeg -f rawvideo -pix_fmt gray -video_size WIDTHxHEIGHT -i FILE ...``).
+
+Encoding can be done by a background thread (see ``BackgroundWriter``), so that the simulation
+keeps running while the previous frames are encoded. Pillow is only imported once a GIF is written,
+so that importing this module stays fast.
+"""
+
+import abc
+import queue
+import threading
+from enum import Enum
+from pathlib import Path
+from types import TracebackType
+from typing import TYPE_CHECKING, BinaryIO, Optional, Type, Union
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from PIL import Image
+
+_MAX_COLORS = 256
+_END = None
+
+
+class ExportFormat(Enum):
+    """Formats of exported simulations."""
+
+    GIF = "gif"
+    RAW = "raw"
+
+
+def downscale(frame: np.ndarray, scale: int) -> np.ndarray:
+    """Downscales a frame by counting the living cells of every ``scale`` x ``scale`` block.
+
+    :param frame: grid array.
+    :param scale: size of the blocks (1 to keep the size of the grid).
+    :returns: number of living cells of every block, the blocks on the bottom and right edges
+        being completed with dead cells.
+    """
+    cells = (np.asarray(frame) != 0).view(np.uint8)
+    if scale == 1:
+        return cells
+    height, width = cells.shape
+    padded = np.zeros((-(-height // scale) * scale, -(-width // scale) * scale), dtype=np.uint16)
+    padded[:height, :width] = cells
+    blocks = padded.reshape((padded.shape[0] // scale, scale, padded.shape[1] // scale, scale))
+    return blocks.sum(axis=(1, 3))
+
+
+class _FrameWriter(abc.ABC):
+    """Base class of the writers of exported simulations."""
+
+    def __init__(self, path: Union[str, Path], shape: tuple[int, int], scale: int = 1):
+        """_FrameWriter constructor: create the file.
+
+        :param path: path of the exported file.
+        :param shape: shape of the grid.
+        :param scale: size of the blocks of cells shown by a single pixel.
+        """
+        if scale < 1:
+            raise ValueError(f"Scale must be positive but {scale} was given")
+
+        self.scale: int = scale
+        self.shape: tuple[int, int] = (-(-shape[0] // scale), -(-shape[1] // scale))
+        self.nb_frames: int = 0
+        self.nb_colors: int = min(scale * scale + 1, _MAX_COLORS)
+        self._file: BinaryIO = open(path, "wb")  # pylint: disable=consider-using-with
+
+    def _levels(self, frame: np.ndarray) -> np.ndarray:
+        """Gets the level of every pixel of a frame.
+
+        :param frame: grid array.
+        :returns: downscaled frame, from 0 (every cell of the block is dead) to ``nb_colors - 1``
+            (every cell is alive).
+        """
+        counts = downscale(frame, self.scale)
+        if counts.shape != self.shape:
+            raise ValueError(
+                f"Frame of shape {np.shape(frame)} can't be exported into frames of shape "
+                f"{self.shape} (scale {self.scale})"
+            )
+        if self.nb_colors == self.scale * self.scale + 1:
+            return counts.astype(np.uint8)
+        return (
+            counts.astype(np.uint32) * (self.nb_colors - 1) // (self.scale * self.scale)
+        ).astype(np.uint8)
+
+    def _gray(self) -> np.ndarray:
+        """Gets the gray value of every level.
+
+        :returns: gray values, from white to black.
+        """
+        return (255 - np.arange(self.nb_colors) * 255 // (self.nb_colors - 1)).astype(np.uint8)
+
+    @abc.abstractmethod
+    def write(self, frame: np.ndarray) -> None:
+        """Appends a frame to the file.
+
+        :param frame: grid array.
+        """
+
+    def _close(self) -> None:
+        """Writes the end of the file."""
+
+    def close(self) -> None:
+        """Ends and closes the file."""
+        if self._file.closed:
+            return
+        try:
+            self._close()
+        finally:
+            self._file.close()
+
+    def __enter__(self) -> "_FrameWriter":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+
+class GifWriter(_FrameWriter):
+    """Streams frames to an animated GIF."""
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        shape: tuple[int, int],
+        scale: int = 1,
+        fps: float = 10,
+        loop: bool = True,
+    ):
+        """GifWriter constructor: create the file and write its header.
+
+        :param path: path of the GIF.
+        :param shape: shape of the grid.
+        :param scale: size of the blocks of cells shown by a single pixel.
+        :param fps: number of frames per second.
+        :param loop: whether the animation plays in a loop.
+        """
+        from PIL import GifImagePlugin  # pylint: disable=import-outside-toplevel
+
+        super().__init__(path, shape, scale)
+        self.duration: int = max(round(1000 / fps), 1)
+
+        gray = self._gray()
+        self._palette: list[int] = np.repeat(gray, 3).tolist()
+        header, _ = GifImagePlugin.getheader(
+            self._image(np.zeros(self.shape, dtype=np.uint8)), None, {"loop": 0} if loop else {}
+        )
+        for chunk in header:
+            self._file.write(chunk)
+
+    def _image(self, levels: np.ndarray) -> "Image.Image":
+        """Gets a palette image of a downscaled frame.
+
+        :param levels: downscaled frame.
+        :returns: image.
+        """
+        from PIL import Image  # pylint: disable=import-outside-toplevel,redefined-outer-name
+
+        image = Image.frombytes("P", (self.shape[1], self.shape[0]), levels.tobytes())
+        image.putpalette(self._palette)
+        return image
+
+    def write(self, frame: np.ndarray) -> None:
+        """Encodes a frame and appends it to the GIF.
+
+        :param frame: grid array.
+        """
+        from PIL import GifImagePlugin  # pylint: disable=import-outside-toplevel
+
+        for chunk in GifImagePlugin.getdata(
+            self._image(self._levels(frame)), duration=self.duration
+        ):
+            self._file.write(chunk)
+        self.nb_frames += 1
+
+    def _close(self) -> None:
+        """Writes the trailer of the GIF."""
+        self._file.write(b";")
+
+
+class RawWriter(_FrameWriter):
+    """Streams frames to a file of 8-bit gray pixels."""
+
+    def write(self, frame: np.ndarray) -> None:
+        """Appends a frame to the file.
+
+        :param frame: grid array.
+        """
+        self._file.write(self._gray()[self._levels(frame)].tobytes())
+        self.nb_frames += 1
+
+
+class BackgroundWriter:
+    """Encodes frames in a background thread, letting the simulation run in the meantime."""
+
+    def __init__(self, writer: _FrameWriter, maxsize: int = 4):
+        """BackgroundWriter constructor: start the thread.
+
+        :param writer: writer encoding the frames.
+        :param maxsize: maximum number of frames waiting to be encoded.
+        """
+        self.writer: _FrameWriter = writer
+        self._queue: "queue.Queue[Optional[np.ndarray]]" = queue.Queue(maxsize)
+        self._error: Optional[BaseException] = None
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        """Encodes the frames of the queue until the end is reached."""
+        while True:
+            frame = self._queue.get()
+            if frame is _END:
+                return
+            if self._error is None:
+                try:
+                    self.writer.write(frame)
+                except Exception as error:  # pylint: disable=broad-exception-caught
+                    self._error = error
+
+    def write(self, frame: np.ndarray) -> None:
+        """Queues a copy of a frame, waiting if too many frames are waiting to be encoded.
+
+        :param frame: grid array.
+        """
+        if self._error is not None:
+            raise self._error
+        self._queue.put(frame.copy())
+
+    def close(self) -> None:
+        """Waits for the queued frames to be encoded and closes the writer."""
+        if self._thread.is_alive():
+            self._queue.put(_END)
+            self._thread.join()
+        self.writer.close()
+        if self._error is not None:
+            raise self._error
+
+    def __enter__(self) -> "BackgroundWriter":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+
+def open_writer(
+    path: Union[str, Path],
+    shape: tuple[int, int],
+    export_format: ExportFormat = ExportFormat.GIF,
+    scale: int = 1,
+    fps: float = 10,
+) -> _FrameWriter:
+    """Creates a writer of exported simulations.
+
+    :param path: path of the exported file.
+    :param shape: shape of the grid.
+    :param export_format: format of the exported file.
+    :param scale: size of the blocks of cells shown by a single pixel.
+    :param fps: number of frames per second (GIF only).
+    :returns: writer.
+    """
+    if export_format == ExportFormat.GIF:
+        return GifWriter(path, shape, scale, fps)
+    return RawWriter(path, shape, scale)
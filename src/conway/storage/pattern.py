@@ -0,0 +1,272 @@
+"""This module contains the loading of patterns from RLE and plaintext files.
+
+Pattern files are parsed in chunks, and every chunk is turned into runs of living cells (row, first
+column and length of every run) with whole-array operations, without ever building a dense array of
+the whole pattern. Runs are then written straight into a grid at a given offset, or expanded into
+the positions of the living cells (e.g. for the sparse engine), so that patterns of millions of
+cells can be loaded quickly and with little memory.
+
+Supported formats are:
+
+- RLE (``.rle``): an optional ``#`` comments section, a header ``x = <width>, y = <height>[, rule =
+  <rule>]`` and runs such as ``3o2b$`` (``b`` is a dead cell, any other letter a living cell, ``$``
+  ends a row and ``!`` ends the pattern), where the counts default to 1;
+- plaintext (``.cells``): ``!`` comments, then one line per row where ``.`` is a dead cell and ``O``
+  (or ``*``) a living cell.
+"""
+
+import re
+from pathlib import Path
+from typing import BinaryIO, Iterator, NamedTuple, Optional, Union
+
+import numpy as np
+
+from ..engine import sparse
+
+_CHUNK_SIZE = 1 << 18
+_RLE_HEADER = re.compile(rb"x\s*=\s*(\d+)\s*,\s*y\s*=\s*(\d+)(?:\s*,\s*rule\s*=\s*([^\s,]+))?")
+_PLAINTEXT_SUFFIXES = {".cells", ".txt"}
+_WHITESPACES = np.frombuffer(b" \t\r\n", dtype=np.uint8)
+_DEAD_TAGS = np.frombuffer(b"b.", dtype=np.uint8)
+_ALIVE_CHARACTERS = np.frombuffer(b"O*", dtype=np.uint8)
+
+
+class PatternHeader(NamedTuple):
+    """Header of a pattern file."""
+
+    width: int
+    height: int
+    rule: Optional[str]
+
+
+class Runs(NamedTuple):
+    """Runs of living cells."""
+
+    rows: np.ndarray
+    columns: np.ndarray
+    lengths: np.ndarray
+
+
+def _is_plaintext(path: Union[str, Path]) -> bool:
+    """Tells whether a pattern file is a plaintext file (or a RLE file).
+
+    :param path: path of the pattern.
+    :returns: True if the pattern is a plaintext file.
+    """
+    return Path(path).suffix.lower() in _PLAINTEXT_SUFFIXES
+
+
+def _read_rle_header(file: BinaryIO) -> PatternHeader:
+    """Reads the comments and the header of a RLE file, leaving the file at the start of the runs.
+
+    :param file: RLE file.
+    :returns: header of the file.
+    """
+    for line in iter(file.readline, b""):
+        stripped = line.strip()
+        if not stripped or stripped.startswith(b"#"):
+            continue
+        match = _RLE_HEADER.match(stripped)
+        if match is None:
+            raise ValueError(f"Invalid RLE header: {stripped[:80]!r}")
+        rule = match.group(3)
+        return PatternHeader(
+            int(match.group(1)), int(match.group(2)), rule.decode() if rule else None
+        )
+    raise ValueError("Missing RLE header")
+
+
+def _rle_runs(file: BinaryIO, chunk_size: int) -> Iterator[Runs]:
+    """Parses the runs of a RLE file, chunk by chunk.
+
+    :param file: RLE file, at the start of the runs.
+    :param chunk_size: number of bytes read at once.
+    :yield: runs of living cells of every chunk.
+    """
+    row, column = 0, 0
+    carry = np.zeros(0, dtype=np.uint8)
+    finished = False
+    while not finished:
+        chunk = file.read(chunk_size)
+        finished = not chunk
+        data = np.concatenate([carry, np.frombuffer(chunk, dtype=np.uint8)])
+        data = data[~np.isin(data, _WHITESPACES)]
+
+        end = np.flatnonzero(data == ord("!"))
+        if len(end):
+            data = data[: end[0]]
+            finished = True
+
+        is_digit = (data >= ord("0")) & (data <= ord("9"))
+        tags = np.flatnonzero(~is_digit)
+        # Digits after the last tag belong to a count continued in the next chunk.
+        last = tags[-1] + 1 if tags.size else 0
+        carry, data, is_digit = data[last:], data[:last], is_digit[:last]
+        if not tags.size:
+            continue
+
+        # Count of every tag: its digits are weighted by powers of 10 and summed.
+        digits = np.flatnonzero(is_digit)
+        owners = np.searchsorted(tags, digits)
+        values = (data[digits] - ord("0")).astype(np.int64) * 10 ** (tags[owners] - digits - 1)
+        counts = np.bincount(owners, weights=values, minlength=len(tags)).astype(np.int64)
+        has_count = np.zeros(len(tags), dtype=bool)
+        has_count[owners] = True
+        counts[~has_count] = 1
+
+        symbols = data[tags]
+        newlines = symbols == ord("$")
+        widths = np.where(newlines, 0, counts)
+        heights = np.where(newlines, counts, 0)
+
+        rows = row + np.cumsum(heights) - heights
+        ends = np.cumsum(widths)
+        last_newlines = np.maximum.accumulate(np.where(newlines, np.arange(len(tags)), -1))
+        starts = np.where(
+            last_newlines >= 0, ends - widths - ends[last_newlines], column + ends - widths
+        )
+
+        alive = ~newlines & ~np.isin(symbols, _DEAD_TAGS)
+        yield Runs(rows[alive], starts[alive], counts[alive])
+
+        row += int(heights.sum())
+        column = int(starts[-1] + widths[-1])
+
+
+def _plaintext_runs(file: BinaryIO, chunk_size: int) -> Iterator[Runs]:
+    """Parses the runs of a plaintext file, by chunks of lines.
+
+    :param file: plaintext file.
+    :param chunk_size: approximate number of bytes read at once.
+    :yield: runs of living cells of every chunk.
+    """
+    row = 0
+    while True:
+        lines = file.readlines(chunk_size)
+        if not lines:
+            return
+        rows, columns, lengths = [], [], []
+        for line in lines:
+            if line.startswith(b"!"):
+                continue
+            cells = np.isin(np.frombuffer(line.rstrip(b"\r\n"), dtype=np.uint8), _ALIVE_CHARACTERS)
+            edges = np.flatnonzero(np.diff(cells, prepend=False, append=False))
+            rows.append(np.full(len(edges) // 2, row))
+            columns.append(edges[0::2])
+            lengths.append(edges[1::2] - edges[0::2])
+            row += 1
+        if rows:
+            yield Runs(np.concatenate(rows), np.concatenate(columns), np.concatenate(lengths))
+
+
+def read_header(path: Union[str, Path]) -> PatternHeader:
+    """Reads the header of a pattern file. Plaintext files have no header: they are scanned to
+    find the size of the pattern.
+
+    :param path: path of the pattern.
+    :returns: header of the pattern.
+    """
+    with open(path, "rb") as file:
+        if not _is_plaintext(path):
+            return _read_rle_header(file)
+        height, width = 0, 0
+        for line in file:
+            if not line.startswith(b"!"):
+                height += 1
+                width = max(width, len(line.rstrip(b"\r\n")))
+        return PatternHeader(width, height, None)
+
+
+def read_runs(path: Union[str, Path], chunk_size: int = _CHUNK_SIZE) -> Iterator[Runs]:
+    """Parses the runs of living cells of a pattern file, chunk by chunk.
+
+    :param path: path of the pattern (plaintext if its suffix is ``.cells`` or ``.txt``, RLE
+        otherwise).
+    :param chunk_size: number of bytes read at once.
+    :yield: runs of living cells of every chunk.
+    """
+    with open(path, "rb") as file:
+        if _is_plaintext(path):
+            yield from _plaintext_runs(file, chunk_size)
+        else:
+            _read_rle_header(file)
+            yield from _rle_runs(file, chunk_size)
+
+
+def expand_runs(runs: Runs) -> tuple[np.ndarray, np.ndarray]:
+    """Gets the positions of the cells of runs.
+
+    :param runs: runs of living cells.
+    :returns: rows and columns of the living cells.
+    """
+    firsts = np.cumsum(runs.lengths) - runs.lengths
+    offsets = np.arange(int(runs.lengths.sum())) - np.repeat(firsts, runs.lengths)
+    return np.repeat(runs.rows, runs.lengths), np.repeat(runs.columns, runs.lengths) + offsets
+
+
+def load_cells(
+    path: Union[str, Path], offset: tuple[int, int] = (0, 0), chunk_size: int = _CHUNK_SIZE
+) -> tuple[np.ndarray, np.ndarray]:
+    """Gets the positions of the living cells of a pattern file.
+
+    :param path: path of the pattern.
+    :param offset: position of the top-left corner of the pattern.
+    :param chunk_size: number of bytes read at once.
+    :returns: rows and columns of the living cells.
+    """
+    rows, columns = [np.zeros(0, dtype=np.int64)], [np.zeros(0, dtype=np.int64)]
+    for runs in read_runs(path, chunk_size):
+        chunk_rows, chunk_columns = expand_runs(runs)
+        rows.append(chunk_rows + offset[0])
+        columns.append(chunk_columns + offset[1])
+    return np.concatenate(rows), np.concatenate(columns)
+
+
+def load_keys(
+    path: Union[str, Path], offset: tuple[int, int] = (0, 0), chunk_size: int = _CHUNK_SIZE
+) -> np.ndarray:
+    """Gets the keys of the living cells of a pattern file, for the sparse engine.
+
+    :param path: path of the pattern.
+    :param offset: position of the top-left corner of the pattern on the plane.
+    :param chunk_size: number of bytes read at once.
+    :returns: sorted keys of the living cells.
+    """
+    # Runs are parsed row by row and from left to right, so keys are already sorted.
+    return sparse.encode(*load_cells(path, offset, chunk_size))
+
+
+def place_pattern(
+    grid_array: np.ndarray,
+    path: Union[str, Path],
+    offset: Optional[tuple[int, int]] = None,
+    chunk_size: int = _CHUNK_SIZE,
+) -> None:
+    """Draws the living cells of a pattern file into a grid array.
+
+    :param grid_array: grid array, updated in place.
+    :param path: path of the pattern.
+    :param offset: position of the top-left corner of the pattern in the grid. If not given, the
+        pattern is centered.
+    :param chunk_size: number of bytes read at once.
+    """
+    header = read_header(path)
+    if offset is None:
+        offset = (
+            (grid_array.shape[0] - header.height) // 2,
+            (grid_array.shape[1] - header.width) // 2,
+        )
+    if (
+        offset[0] < 0
+        or offset[1] < 0
+        or offset[0] + header.height > grid_array.shape[0]
+        or offset[1] + header.width > grid_array.shape[1]
+    ):
+        raise ValueError(
+            f"Pattern '{path}' ({header.height}x{header.width}) doesn't fit in the grid "
+            f"{grid_array.shape} at offset {offset}"
+        )
+
+    for runs in read_runs(path, chunk_size):
+        rows, columns = expand_runs(runs)
+        grid_array[rows + offset[0], columns + offset[1]] = 1
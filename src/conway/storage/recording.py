@@ -0,0 +1,275 @@
+"""This module contains a seekable recording format for simulation histories.
+
+A recording starts with a header (shape of the grid and interval between keyframes), followed by one
+record per generation:
+
+- every ``keyframe_interval`` generations, a keyframe holding the whole grid packed as bits;
+- otherwise, a delta holding the flat indices of the cells born and the cells dead since the
+  previous generation.
+
+When the recording is closed, an index of the keyframes is appended, followed by a footer giving
+its position. Reading a generation only requires jumping to the nearest previous keyframe and
+replaying the following deltas. A recording that wasn't closed (e.g. after a crash) is still
+readable: its index is rebuilt by scanning the records.
+"""
+
+import bisect
+import mmap
+import struct
+from pathlib import Path
+from types import TracebackType
+from typing import BinaryIO, Generator, Optional, Type, Union
+
+import numpy as np
+
+_MAGIC = b"CWRC"
+_FOOTER_MAGIC = b"CWRI"
+_VERSION = 1
+
+# Magic, version, height, width, keyframe interval.
+_HEADER = struct.Struct("<4sHQQQ")
+# Kind, generation, then payload size (keyframe) or number of births and deaths (delta).
+_RECORD = struct.Struct("<BQQQ")
+# Index offset, number of keyframes, number of generations, magic.
+_FOOTER = struct.Struct("<QQQ4s")
+
+_KEYFRAME = 0
+_DELTA = 1
+
+
+def index_dtype(shape: tuple[int, int]) -> np.dtype:
+    """Gets the dtype of the flat indices of the cells of a grid.
+
+    :param shape: shape of the grid.
+    :returns: smallest unsigned dtype able to hold the indices.
+    """
+    return np.dtype("<u4") if shape[0] * shape[1] <= np.iinfo(np.uint32).max else np.dtype("<u8")
+
+
+class RecordingWriter:
+    """Streams the generations of a simulation to a recording file."""
+
+    def __init__(
+        self, path: Union[str, Path], shape: tuple[int, int], keyframe_interval: int = 100
+    ):
+        """RecordingWriter constructor: create the file and write its header.
+
+        :param path: path of the recording.
+        :param shape: shape of the grid.
+        :param keyframe_interval: number of generations between two keyframes.
+        """
+        if keyframe_interval < 1:
+            raise ValueError(
+                f"Keyframe interval must be positive but {keyframe_interval} was given"
+            )
+
+        self.shape: tuple[int, int] = shape
+        self.keyframe_interval: int = keyframe_interval
+        self.nb_generations: int = 0
+        self._index_dtype: np.dtype = index_dtype(shape)
+        self._previous: np.ndarray = np.zeros(shape[0] * shape[1], dtype=bool)
+        self._keyframes: list[tuple[int, int]] = []
+
+        self._file: BinaryIO = open(path, "wb")  # pylint: disable=consider-using-with
+        self._file.write(_HEADER.pack(_MAGIC, _VERSION, shape[0], shape[1], keyframe_interval))
+
+    def write(
+        self,
+        frame: np.ndarray,
+        births: Optional[np.ndarray] = None,
+        deaths: Optional[np.ndarray] = None,
+    ) -> None:
+        """Appends the next generation to the recording.
+
+        :param frame: grid of the generation.
+        :param births: flat indices of the cells born since the previous generation. If not given
+            (or if ``deaths`` isn't), changes are found by comparing with the previous generation.
+        :param deaths: flat indices of the cells dead since the previous generation.
+        """
+        generation = self.nb_generations
+        cells = np.ravel(frame) != 0
+
+        if generation % self.keyframe_interval == 0:
+            payload = np.packbits(cells).tobytes()
+            self._keyframes.append((generation, self._file.tell()))
+            self._file.write(_RECORD.pack(_KEYFRAME, generation, len(payload), 0))
+            self._file.write(payload)
+        else:
+            if births is None or deaths is None:
+                births = np.flatnonzero(cells & ~self._previous)
+                deaths = np.flatnonzero(~cells & self._previous)
+            self._file.write(_RECORD.pack(_DELTA, generation, len(births), len(deaths)))
+            self._file.write(np.asarray(births, dtype=self._index_dtype).tobytes())
+            self._file.write(np.asarray(deaths, dtype=self._index_dtype).tobytes())
+
+        self._previous[...] = cells
+        self.nb_generations += 1
+
+    def close(self) -> None:
+        """Writes the index of the keyframes and closes the file."""
+        if self._file.closed:
+            return
+        index_offset = self._file.tell()
+        self._file.write(np.asarray(self._keyframes, dtype="<u8").tobytes())
+        self._file.write(
+            _FOOTER.pack(index_offset, len(self._keyframes), self.nb_generations, _FOOTER_MAGIC)
+        )
+        self._file.close()
+
+    def __enter__(self) -> "RecordingWriter":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+
+class RecordingReader:
+    """Reads the generations of a recording through a memory map."""
+
+    def __init__(self, path: Union[str, Path]):
+        """RecordingReader constructor: map the file and load its index of keyframes.
+
+        :param path: path of the recording.
+        """
+        self._file: BinaryIO = open(path, "rb")  # pylint: disable=consider-using-with
+        self._map: mmap.mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, height, width, keyframe_interval = _HEADER.unpack_from(self._map, 0)
+        if magic != _MAGIC or version != _VERSION:
+            self.close()
+            raise ValueError(f"Not a recording (version {_VERSION}): '{path}'")
+
+        self.shape: tuple[int, int] = (height, width)
+        self.keyframe_interval: int = keyframe_interval
+        self._index_dtype: np.dtype = index_dtype(self.shape)
+        self._end: int = len(self._map)
+
+        self._keyframe_generations: list[int] = []
+        self._keyframe_offsets: list[int] = []
+        self.nb_generations: int = 0
+        if not self._read_index():
+            self._scan_records()
+
+    def _read_index(self) -> bool:
+        """Reads the index of keyframes written when the recording was closed.
+
+        :returns: False if the recording has no index.
+        """
+        if self._end < _HEADER.size + _FOOTER.size:
+            return False
+        index_offset, nb_keyframes, nb_generations, magic = _FOOTER.unpack_from(
+            self._map, self._end - _FOOTER.size
+        )
+        if magic != _FOOTER_MAGIC:
+            return False
+
+        index = np.frombuffer(self._map, dtype="<u8", count=2 * nb_keyframes, offset=index_offset)
+        self._keyframe_generations = index[0::2].tolist()
+        self._keyframe_offsets = index[1::2].tolist()
+        del index
+        self.nb_generations = nb_generations
+        self._end = index_offset
+        return True
+
+    def _scan_records(self) -> None:
+        """Rebuilds the index of keyframes by reading every record. The last record is dropped if
+        it is incomplete."""
+        offset = _HEADER.size
+        while offset + _RECORD.size <= self._end:
+            kind, generation, _, _ = _RECORD.unpack_from(self._map, offset)
+            next_offset = offset + _RECORD.size + self._payload_size(offset)
+            if next_offset > self._end:
+                break
+            if kind == _KEYFRAME:
+                self._keyframe_generations.append(generation)
+                self._keyframe_offsets.append(offset)
+            self.nb_generations = generation + 1
+            offset = next_offset
+        self._end = offset
+
+    def _payload_size(self, offset: int) -> int:
+        """Gets the size of the payload of a record.
+
+        :param offset: offset of the record.
+        :returns: size of the payload in bytes.
+        """
+        kind, _, first, second = _RECORD.unpack_from(self._map, offset)
+        if kind == _KEYFRAME:
+            return first
+        return (first + second) * self._index_dtype.itemsize
+
+    def _apply(self, offset: int, cells: np.ndarray) -> int:
+        """Applies a record to the cells of the grid.
+
+        :param offset: offset of the record.
+        :param cells: flat array of the cells, updated in place.
+        :returns: offset of the next record.
+        """
+        kind, _, first, second = _RECORD.unpack_from(self._map, offset)
+        payload_offset = offset + _RECORD.size
+        if kind == _KEYFRAME:
+            packed = np.frombuffer(self._map, dtype=np.uint8, count=first, offset=payload_offset)
+            cells[...] = np.unpackbits(packed, count=cells.size)
+            del packed
+            return payload_offset + first
+
+        changes = np.frombuffer(
+            self._map, dtype=self._index_dtype, count=first + second, offset=payload_offset
+        )
+        cells[changes[:first]] = 1
+        cells[changes[first:]] = 0
+        del changes
+        return payload_offset + (first + second) * self._index_dtype.itemsize
+
+    def __len__(self) -> int:
+        return self.nb_generations
+
+    def seek(self, generation: int) -> np.ndarray:
+        """Gets the grid of a generation, replaying deltas from the nearest previous keyframe.
+
+        :param generation: generation to get.
+        :returns: grid of the generation (living cells are 1).
+        """
+        if not 0 <= generation < self.nb_generations:
+            raise IndexError(
+                f"Generation {generation} not in the recording ({self.nb_generations} generations)"
+            )
+
+        keyframe = bisect.bisect_right(self._keyframe_generations, generation) - 1
+        cells = np.zeros(self.shape[0] * self.shape[1], dtype=np.uint8)
+        offset = self._keyframe_offsets[keyframe]
+        for _ in range(generation - self._keyframe_generations[keyframe] + 1):
+            offset = self._apply(offset, cells)
+        return cells.reshape(self.shape)
+
+    def __iter__(self) -> Generator[np.ndarray, None, None]:
+        """Yields every generation of the recording. The yielded array is updated in place.
+
+        :yield: grid of every generation.
+        """
+        cells = np.zeros(self.shape[0] * self.shape[1], dtype=np.uint8)
+        offset = _HEADER.size
+        for _ in range(self.nb_generations):
+            offset = self._apply(offset, cells)
+            yield cells.reshape(self.shape)
+
+    def close(self) -> None:
+        """Unmaps and closes the file."""
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self) -> "RecordingReader":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.close()
@@ -0,0 +1,136 @@
+"""This module contains the protocol used to stream the generations of a simulation to viewers.
+
+When a viewer connects, the server sends a header (shape of the grid), followed by one message per
+generation:
+
+- a keyframe, holding the whole grid packed as bits, is sent first, and again whenever the viewer
+  fell behind and skipped generations;
+- otherwise, a delta holds the flat indices of the cells born and the cells dead since the previous
+  generation;
+- an end message tells that the simulation is over.
+
+Messages are encoded once per generation by the server, whatever the number of viewers, and are
+read back into a grid updated in place.
+"""
+
+import socket
+import struct
+from typing import BinaryIO, Iterator
+
+import numpy as np
+
+from ..storage.recording import index_dtype
+
+_MAGIC = b"CWST"
+_VERSION = 1
+
+# Magic, version, height, width.
+HEADER = struct.Struct("<4sHQQ")
+# Kind, generation, then payload size (keyframe) or number of births and deaths (delta).
+MESSAGE = struct.Struct("<BQQQ")
+
+KEYFRAME = 0
+DELTA = 1
+END = 2
+
+
+def encode_header(shape: tuple[int, int]) -> bytes:
+    """Encodes the header of a stream.
+
+    :param shape: shape of the grid.
+    :returns: header.
+    """
+    return HEADER.pack(_MAGIC, _VERSION, shape[0], shape[1])
+
+
+def encode_keyframe(generation: int, cells: np.ndarray) -> bytes:
+    """Encodes a whole generation.
+
+    :param generation: generation.
+    :param cells: grid of the generation.
+    :returns: keyframe message.
+    """
+    payload = np.packbits(np.ravel(cells) != 0).tobytes()
+    return MESSAGE.pack(KEYFRAME, generation, len(payload), 0) + payload
+
+
+def encode_delta(
+    generation: int, shape: tuple[int, int], births: np.ndarray, deaths: np.ndarray
+) -> bytes:
+    """Encodes the changes of a generation.
+
+    :param generation: generation.
+    :param shape: shape of the grid.
+    :param births: flat indices of the cells born since the previous generation.
+    :param deaths: flat indices of the cells dead since the previous generation.
+    :returns: delta message.
+    """
+    dtype = index_dtype(shape)
+    return b"".join(
+        [
+            MESSAGE.pack(DELTA, generation, len(births), len(deaths)),
+            np.asarray(births, dtype=dtype).tobytes(),
+            np.asarray(deaths, dtype=dtype).tobytes(),
+        ]
+    )
+
+
+def encode_end(generation: int) -> bytes:
+    """Encodes the end of a stream.
+
+    :param generation: last generation.
+    :returns: end message.
+    """
+    return MESSAGE.pack(END, generation, 0, 0)
+
+
+def _read_exactly(file: BinaryIO, size: int) -> bytes:
+    """Reads a number of bytes from a stream.
+
+    :param file: stream.
+    :param size: number of bytes.
+    :returns: bytes read.
+    """
+    data = file.read(size)
+    if len(data) != size:
+        raise ConnectionError("Stream ended unexpectedly")
+    return data
+
+
+def read_stream(file: BinaryIO) -> Iterator[tuple[int, np.ndarray]]:
+    """Reads the generations of a stream, until its end.
+
+    :param file: stream, at its header.
+    :yield: generation and grid (living cells are 1). The grid is updated in place.
+    """
+    magic, version, height, width = HEADER.unpack(_read_exactly(file, HEADER.size))
+    if magic != _MAGIC or version != _VERSION:
+        raise ValueError(f"Not a stream of generations (version {_VERSION})")
+
+    shape = (height, width)
+    dtype = index_dtype(shape)
+    cells = np.zeros(height * width, dtype=np.uint8)
+    while True:
+        kind, generation, first, second = MESSAGE.unpack(_read_exactly(file, MESSAGE.size))
+        if kind == END:
+            return
+        if kind == KEYFRAME:
+            packed = np.frombuffer(_read_exactly(file, first), dtype=np.uint8)
+            cells[...] = np.unpackbits(packed, count=cells.size)
+        else:
+            changes = np.frombuffer(_read_exactly(file, (first + second) * dtype.itemsize), dtype)
+            cells[changes[:first]] = 1
+            cells[changes[first:]] = 0
+        yield generation, cells.reshape(shape)
+
+
+def watch(host: str, port: int) -> Iterator[tuple[int, np.ndarray]]:
+    """Connects to a server and reads the generations it streams.
+
+    :param host: host of the server.
+    :param port: port of the server.
+    :yield: generation and grid (living cells are 1). The grid is updated in place.
+    """
+    with socket.create_connection((host, port)) as connection:
+        with connection.makefile("rb") as file:
+            yield from read_stream(file)
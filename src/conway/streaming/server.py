@@ -0,0 +1,203 @@
+"""This module contains a server streaming the generations of a simulation to many viewers.
+
+The simulation runs once, in a thread so that the event loop stays responsive, and every
+generation is encoded a single time as a delta (see ``conway.streaming.protocol``) which is queued
+for every connected viewer. Each viewer has its own queue, emptied by its own task as fast as its
+connection allows. When a viewer falls behind (its queue holds ``max_pending`` messages), its queued
+messages are dropped and it is sent a keyframe of the latest generation instead, so that slow
+viewers skip generations rather than slowing the simulation down. Keyframes are only encoded when a
+viewer needs one, and at most once per generation.
+"""
+
+import asyncio
+import time
+from typing import Iterable, Optional
+
+import numpy as np
+
+from .protocol import encode_delta, encode_end, encode_header, encode_keyframe
+
+_DEFAULT_MAX_PENDING = 16
+
+
+class _Viewer:
+    """Connection to a viewer and queue of the messages it hasn't received yet."""
+
+    def __init__(self, writer: asyncio.StreamWriter):
+        """Viewer constructor.
+
+        :param writer: stream to the viewer.
+        """
+        self.writer: asyncio.StreamWriter = writer
+        self.queue: asyncio.Queue[Optional[bytes]] = asyncio.Queue()
+        self.synced: bool = False
+        self.nb_skips: int = 0
+
+    def clear(self) -> None:
+        """Drops the queued messages."""
+        while not self.queue.empty():
+            self.queue.get_nowait()
+
+
+class DeltaServer:
+    """Server streaming the generations of a simulation to any number of viewers."""
+
+    def __init__(
+        self,
+        shape: tuple[int, int],
+        host: str = "127.0.0.1",
+        port: int = 0,
+        max_pending: int = _DEFAULT_MAX_PENDING,
+    ):
+        """DeltaServer constructor.
+
+        :param shape: shape of the grid.
+        :param host: host to listen on.
+        :param port: port to listen on (0 to pick a free port, see ``port`` once started).
+        :param max_pending: number of messages queued for a viewer above which it skips to the
+            latest generation.
+        """
+        if max_pending < 1:
+            raise ValueError(
+                f"Maximum of pending messages must be positive but {max_pending} was given"
+            )
+
+        self.shape: tuple[int, int] = shape
+        self.host: str = host
+        self.port: int = port
+        self.max_pending: int = max_pending
+        self.nb_skips: int = 0
+        self._viewers: set[_Viewer] = set()
+        self._tasks: set[asyncio.Task] = set()
+        self._connected: Optional[asyncio.Condition] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    @property
+    def nb_viewers(self) -> int:
+        """Number of connected viewers.
+
+        :returns: number of viewers.
+        """
+        return len(self._viewers)
+
+    async def start(self) -> None:
+        """Starts listening for viewers."""
+        self._connected = asyncio.Condition()
+        self._server = await asyncio.start_server(self._connect, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def _connect(self, _: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Registers a new viewer and sends it the queued messages until the end of the stream.
+
+        :param writer: stream to the viewer.
+        """
+        viewer = _Viewer(writer)
+        writer.write(encode_header(self.shape))
+        self._viewers.add(viewer)
+        task = asyncio.current_task()
+        if task is not None:
+            self._tasks.add(task)
+        if self._connected is not None:
+            async with self._connected:
+                self._connected.notify_all()
+        try:
+            while (message := await viewer.queue.get()) is not None:
+                writer.write(message)
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self._viewers.discard(viewer)
+            self.nb_skips += viewer.nb_skips
+            writer.close()
+            if task is not None:
+                self._tasks.discard(task)
+
+    async def wait_for_viewers(self, nb_viewers: int) -> None:
+        """Waits until a number of viewers are connected.
+
+        :param nb_viewers: number of viewers.
+        """
+        if self._connected is None:
+            raise RuntimeError("The server must be started first")
+        async with self._connected:
+            await self._connected.wait_for(lambda: self.nb_viewers >= nb_viewers)
+
+    def broadcast(self, generation: int, cells: np.ndarray, delta: bytes) -> None:
+        """Queues the delta of a generation for every viewer. Viewers that didn't receive any
+        keyframe yet or that fell behind are queued a keyframe of the generation instead.
+
+        :param generation: generation.
+        :param cells: grid of the generation.
+        :param delta: delta message of the generation.
+        """
+        keyframe: Optional[bytes] = None
+        for viewer in self._viewers:
+            if viewer.synced and viewer.queue.qsize() < self.max_pending:
+                viewer.queue.put_nowait(delta)
+                continue
+            if viewer.synced:
+                viewer.nb_skips += 1
+            viewer.clear()
+            if keyframe is None:
+                keyframe = encode_keyframe(generation, cells)
+            viewer.queue.put_nowait(keyframe)
+            viewer.synced = True
+
+    async def run(
+        self,
+        frames: Iterable[np.ndarray],
+        step: int = 1,
+        generations: Optional[int] = None,
+        fps: Optional[float] = None,
+    ) -> int:
+        """Computes the generations of a simulation and streams them to the viewers, then closes
+        the server once every viewer received the end of the stream.
+
+        :param frames: frames of the simulation (possibly always the same array updated in place).
+        :param step: number of generations between two frames.
+        :param generations: if given, number of generations after which the simulation stops.
+        :param fps: if given, maximum number of frames per second.
+        :returns: number of frames streamed.
+        """
+        loop = asyncio.get_running_loop()
+        iterator = iter(frames)
+        previous = np.zeros(self.shape[0] * self.shape[1], dtype=bool)
+        nb_frames, generation = 0, 0
+        try:
+            while generations is None or generation <= generations:
+                start = time.perf_counter()
+                frame = await loop.run_in_executor(None, next, iterator, None)
+                if frame is None:
+                    break
+                cells = np.ravel(frame) != 0
+                births = np.flatnonzero(cells & ~previous)
+                deaths = np.flatnonzero(previous & ~cells)
+                self.broadcast(
+                    generation, cells, encode_delta(generation, self.shape, births, deaths)
+                )
+                previous = cells
+                nb_frames += 1
+                generation += step
+
+                delay = 1 / fps - (time.perf_counter() - start) if fps else 0
+                await asyncio.sleep(max(delay, 0))
+        finally:
+            await self.close(encode_end(max(generation - step, 0)))
+        return nb_frames
+
+    async def close(self, end: Optional[bytes] = None) -> None:
+        """Stops listening, and waits for every viewer to receive its queued messages.
+
+        :param end: last message sent to every viewer.
+        """
+        if self._server is not None:
+            self._server.close()
+        for viewer in self._viewers:
+            if end is not None:
+                viewer.queue.put_nowait(end)
+            viewer.queue.put_nowait(None)
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        if self._server is not None:
+            await self._server.wait_closed()
@@ -0,0 +1,31 @@
+import json
+from pathlib import Path
+
+from src.conway.commands.options import monitoring, parse_pattern
+from src.conway.engine.statistics import Statistics
+
+
+def test_monitoring(tmp_path: Path) -> None:
+    with monitoring(None) as on_statistics:
+        assert on_statistics is None
+
+    monitor = tmp_path / "monitor.jsonl"
+    with monitoring(monitor, first_generation=10) as on_statistics:
+        assert on_statistics is not None
+        on_statistics(Statistics(0, 5, 0, 0, (1, 2, 3, 4), 0.5))
+        on_statistics(Statistics(1, 0, 0, 5, None, 0.0))
+
+    lines = monitor.read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line)["generation"] for line in lines] == [10, 11]
+
+    monitor = tmp_path / "monitor.csv"
+    with monitoring(monitor) as on_statistics:
+        assert on_statistics is not None
+        on_statistics(Statistics(0, 5, 0, 0, (1, 2, 3, 4), 0.5))
+    assert monitor.read_text(encoding="utf-8").splitlines()[1] == "0,5,0,0,1,2,3,4,0.5"
+
+
+def test_parse_pattern() -> None:
+    assert parse_pattern("glider.rle") == ("glider.rle", None)
+    assert parse_pattern("glider.rle@3,4") == ("glider.rle", (3, 4))
+    assert parse_pattern("a@b.rle") == ("a@b.rle", None)
@@ -0,0 +1,106 @@
+import itertools
+import time
+
+import matplotlib
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+import numpy as np
+import pytest
+
+from src.conway.display.renderer import FrameProducer, Renderer
+from src.conway.engine import vectorized
+from src.conway.grid.grid import Grid
+from src.conway.profiling.profiler import Phase, Profiler
+
+matplotlib.use("Agg")
+
+
+def _frames(nb_frames: int) -> list[np.ndarray]:
+    return [np.full((2, 2), i) for i in range(nb_frames)]
+
+
+def test_producer_keeps_every_frame() -> None:
+    producer = FrameProducer(iter(_frames(10)), maxsize=2)
+    producer.start()
+
+    frames = []
+    while not producer.finished:
+        frame = producer.next_frame(block=True)
+        if frame is not None:
+            frames.append(frame[0, 0])
+    producer.join()
+
+    assert frames == list(range(10))
+    assert producer.nb_dropped == 0
+
+
+def test_producer_drops_frames() -> None:
+    producer = FrameProducer(iter(_frames(100)), maxsize=2, drop_frames=True)
+    producer.start()
+    producer.join()
+
+    frame = producer.next_frame()
+    assert frame is not None
+    assert frame[0, 0] == 99
+    assert producer.nb_produced == 100
+    assert producer.nb_dropped == 99
+    assert producer.next_frame() is None
+    assert producer.finished
+
+
+def test_producer_copies_frames() -> None:
+    array = Grid(10).grid_init("blinker")
+    producer = FrameProducer(vectorized.generate(array), maxsize=3)
+    producer.start()
+
+    first = producer.next_frame(block=True)
+    second = producer.next_frame(block=True)
+    producer.stop()
+    producer.join()
+
+    assert not np.array_equal(first, second)
+
+
+def test_producer_stops_endless_simulation() -> None:
+    producer = FrameProducer(itertools.repeat(np.zeros((2, 2))), drop_frames=True)
+    producer.start()
+    time.sleep(0.05)
+    producer.stop()
+    producer.join(timeout=5)
+
+    assert not producer.is_alive()
+
+
+@pytest.mark.parametrize("drop_frames", [False, True])
+def test_renderer_updates_image(drop_frames: bool) -> None:
+    figure = matplotlib.figure.Figure()
+    renderer = Renderer(FrameProducer(iter(_frames(3)), drop_frames=drop_frames), fps=10)
+    animation = renderer.animate(figure)
+    assert animation is not None
+
+    for i in range(100):
+        (image,) = renderer._update(i)
+        if renderer.producer.finished:
+            break
+        time.sleep(0.01)
+    renderer.producer.join(timeout=5)
+
+    assert image.get_array()[0, 0] == 2
+    assert renderer.producer.finished
+
+
+def test_renderer_profiles_drawing() -> None:
+    records = []
+    profiler = Profiler(callback=records.append)
+    figure = matplotlib.figure.Figure()
+    FigureCanvasAgg(figure)
+    renderer = Renderer(FrameProducer(iter(_frames(1))), fps=10, profiler=profiler)
+    animation = renderer.animate(figure)
+    assert animation is not None
+
+    figure.canvas.draw()
+    (image,) = renderer._update(0)
+    image.axes.draw_artist(image)
+    profiler.end_generation(0, 0, 0, 0)
+    renderer.producer.stop()
+
+    assert records[0]["phases"][Phase.DRAW.value] > 0
@@ -0,0 +1,66 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from src.conway.distributed.coordinator import Coordinator, choose_layout, split
+from src.conway.distributed.worker import start_local_workers
+from src.conway.engine import vectorized
+from src.conway.engine.rule import CONWAY, parse_rule
+
+
+def test_choose_layout() -> None:
+    assert choose_layout(1, (10, 10)) == (1, 1)
+    assert choose_layout(4, (100, 100)) == (2, 2)
+    assert choose_layout(4, (10, 1000)) == (1, 4)
+    assert choose_layout(3, (1000, 10)) == (3, 1)
+    with pytest.raises(ValueError):
+        choose_layout(4, (1, 2))
+
+
+def test_split() -> None:
+    assert split(10, 3).tolist() == [0, 3, 7, 10]
+    assert split(4, 4).tolist() == [0, 1, 2, 3, 4]
+
+
+@pytest.mark.parametrize(
+    "nb_workers, shape, rule",
+    [(4, (40, 37), CONWAY), (3, (25, 61), parse_rule("B36/S23")), (6, (30, 30), CONWAY)],
+)
+def test_coordinator(nb_workers: int, shape: tuple[int, int], rule) -> None:
+    grid_array = (np.random.default_rng(nb_workers).random(shape) < 0.35).astype(np.uint8)
+    expected = grid_array
+    processes, addresses = start_local_workers(nb_workers)
+
+    with Coordinator(addresses, grid_array, rule=rule) as coordinator:
+        assert coordinator.gather().tolist() == grid_array.tolist()
+        for generations in (1, 5, 10):
+            population = coordinator.step(generations)
+            for _ in range(generations):
+                expected = vectorized.next_generation(expected, rule)
+            assert population == np.count_nonzero(expected)
+            assert coordinator.gather().tolist() == expected.tolist()
+        assert coordinator.generation == 16
+
+    for process in processes:
+        process.join(timeout=10)
+        assert process.exitcode == 0
+
+
+def test_coordinator_birth_on_empty_grid() -> None:
+    processes, addresses = start_local_workers(2)
+
+    with Coordinator(
+        addresses, np.zeros((6, 8), dtype=np.uint8), rule=parse_rule("B0/S")
+    ) as coordinator:
+        frames = itertools.islice(coordinator.generate(), 4)
+        assert [int(np.count_nonzero(frame)) for frame in frames] == [0, 48, 0, 48]
+
+    for process in processes:
+        process.join(timeout=10)
+        assert process.exitcode == 0
+
+
+def test_coordinator_invalid_layout() -> None:
+    with pytest.raises(ValueError):
+        Coordinator(["127.0.0.1:1"] * 3, np.zeros((10, 10), dtype=np.uint8), layout=(2, 2))
@@ -0,0 +1,27 @@
+import socket
+import threading
+
+import numpy as np
+
+from src.conway.distributed.worker import Block
+from src.conway.engine.rule import CONWAY
+
+
+def test_exchange_strips_larger_than_socket_buffers() -> None:
+    # Strips of 2**23 cells are packed into 1 MiB, more than the buffers of the socket pair.
+    width = 1 << 23
+    north_socket, south_socket = socket.socketpair()
+    north = Block(np.ones((2, width), dtype=np.uint8), {"south": north_socket}, CONWAY)
+    south = Block(np.zeros((2, width), dtype=np.uint8), {"north": south_socket}, CONWAY)
+
+    threads = [threading.Thread(target=block.exchange, daemon=True) for block in (north, south)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=20)
+    north_socket.close()
+    south_socket.close()
+
+    assert not any(thread.is_alive() for thread in threads)
+    assert north.padded[-1, 1:-1].sum() == 0
+    assert south.padded[0, 1:-1].sum() == width
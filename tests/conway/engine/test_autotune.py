@@ -0,0 +1,77 @@
+import itertools
+import time
+from pathlib import Path
+from typing import Iterator
+
+import numpy as np
+
+from src.conway.engine import vectorized
+from src.conway.engine.autotune import Autotuner, Choice, candidates, generate
+from src.conway.engine.engine import Engine
+from src.conway.engine.rule import parse_rule
+from src.conway.grid.grid import Grid
+
+
+def _generate(array: np.ndarray, choice: Choice) -> Iterator[np.ndarray]:
+    if choice.engine == Engine.SETS:
+        time.sleep(0.01)
+    return vectorized.generate(array)
+
+
+def test_candidates() -> None:
+    choices = candidates(nb_cpu=4)
+
+    assert Choice(Engine.BITPACKED, 1) in choices
+    assert Choice(Engine.NUMPY, 1) in choices
+    assert {choice.jobs for choice in choices if choice.engine == Engine.SHARED} == {1, 2, 4}
+    assert {choice.engine for choice in choices} == {
+        Engine.BITPACKED,
+        Engine.NUMPY,
+        Engine.SHARED,
+        Engine.SETS,
+    }
+    assert Engine.BITPACKED not in {
+        choice.engine for choice in candidates(rule=parse_rule("B36/S23"), nb_cpu=4)
+    }
+    assert Engine.SETS not in {
+        choice.engine for choice in candidates(rule=parse_rule("B0/S8"), nb_cpu=4)
+    }
+    assert candidates(Engine.SETS, 3, nb_cpu=4) == [Choice(Engine.SETS, 3)]
+
+
+def test_choose_caches_decision(tmp_path: Path) -> None:
+    array = Grid(30).grid_init("random")
+    choices = [Choice(Engine.SETS, 1), Choice(Engine.NUMPY, 1)]
+    tuner = Autotuner(_generate, choices, tmp_path / "cache.json")
+
+    assert tuner.choose(array) == Choice(Engine.NUMPY, 1)
+    assert set(tuner.timings) == set(choices)
+
+    def fail(array: np.ndarray, choice: Choice) -> Iterator[np.ndarray]:
+        raise AssertionError("The decision should be cached")
+
+    cached = Autotuner(fail, choices, tmp_path / "cache.json")
+    assert cached.choose(array) == Choice(Engine.NUMPY, 1)
+
+
+def test_generate_reevaluates_on_population_change(tmp_path: Path) -> None:
+    array = Grid(40).grid_init("random")
+    expected = [frame.copy() for frame in itertools.islice(vectorized.generate(array.copy()), 30)]
+    tuner = Autotuner(
+        _generate, [Choice(Engine.SETS, 1), Choice(Engine.NUMPY, 1)], tmp_path / "cache.json"
+    )
+    choices = []
+
+    frames = generate(
+        array,
+        tuner,
+        check_every=1,
+        population_factor=1.0001,
+        on_choice=lambda generation, choice: choices.append(generation),
+    )
+    results = [frame.copy() for frame in itertools.islice(frames, len(expected))]
+
+    assert len(choices) > 1
+    assert len(results) == len(expected)
+    for result, frame in zip(results, expected):
+        assert np.array_equal(result, frame)
@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+
+from src.conway.engine.bitpacked import pack, step, unpack
+from src.conway.engine.vectorized import next_generation
+from src.conway.grid.grid import Grid
+
+
+@pytest.mark.parametrize("width", [1, 63, 64, 65, 130])
+def test_pack_unpack(width: int) -> None:
+    array = np.random.choice([0, 1], size=(7, width))
+    packed = pack(array)
+
+    assert packed.dtype == np.uint64
+    assert packed.shape == (7, -(-width // 64))
+    assert np.array_equal(unpack(packed, width), array)
+
+
+def test_pack_bit_order() -> None:
+    array = np.zeros((1, 70), dtype=int)
+    array[0, [0, 3, 64]] = 1
+    assert pack(array).tolist() == [[0b1001, 1]]
+
+
+@pytest.mark.parametrize("width", [20, 64, 100])
+def test_step_matches_vectorized_engine(width: int) -> None:
+    array = np.random.choice([0, 1], size=(40, width))
+    packed = pack(array)
+    for _ in range(10):
+        array = next_generation(array)
+        packed = step(packed, width)
+        assert np.array_equal(unpack(packed, width), array)
+
+
+@pytest.mark.parametrize("structure", ["pulsar", "glider", "hwss"])
+def test_step_structures(structure: str) -> None:
+    array = Grid(70).grid_init(structure)
+    packed = pack(array)
+    for _ in range(20):
+        array = next_generation(array)
+        packed = step(packed, 70)
+    assert np.array_equal(unpack(packed, 70), array)
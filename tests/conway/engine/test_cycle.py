@@ -0,0 +1,97 @@
+import numpy as np
+import pytest
+
+from src.conway.engine import bitpacked, sparse, vectorized
+from src.conway.engine.changes import track_changes
+from src.conway.engine.cycle import Cycle, CycleDetector, track_cycles
+from src.conway.grid.grid import Grid
+
+
+@pytest.mark.parametrize(
+    "structure,res_cycle",
+    [
+        ("block", Cycle(0, 1)),
+        ("blinker", Cycle(0, 2)),
+        ("pulsar", Cycle(0, 3)),
+        ("penta_decathlon", Cycle(0, 15)),
+    ],
+)
+def test_track_cycles(structure: str, res_cycle: Cycle) -> None:
+    array = Grid(20).grid_init(structure)
+    detector = CycleDetector(array.shape)
+    frames = list(track_cycles(vectorized.generate(array, tracker=detector), detector))
+
+    assert detector.cycle == res_cycle
+    assert len(frames) == res_cycle.start + res_cycle.period
+
+
+def test_track_cycles_after_transient() -> None:
+    array = np.zeros((10, 10), dtype=int)
+    array[4, 3:6] = 1
+    array[5, 3] = 1
+    detector = CycleDetector(array.shape)
+    list(track_cycles(vectorized.generate(array, tracker=detector), detector))
+
+    assert detector.cycle is not None
+    assert detector.cycle.start > 0
+
+
+def test_update_cells_matches_update() -> None:
+    array = Grid(8).grid_init("glider")
+    detector_cells = CycleDetector(array.shape)
+    detector_indices = CycleDetector(array.shape)
+    detector_cells.reset(array)
+    detector_indices.reset(array)
+
+    detector_cells.update_cells({(0, 0), (3, 4)}, {(7, 7)})
+    detector_indices.update(np.asarray([0, 28]), np.asarray([63]))
+    assert detector_cells.hash == detector_indices.hash
+
+    detector_cells.update_cells({(0, 0), (3, 4)}, {(7, 7)})
+    assert detector_cells.cycle == Cycle(0, 2)
+
+
+def test_history_is_bounded() -> None:
+    array = Grid(20).grid_init("penta_decathlon")
+    detector = CycleDetector(array.shape, max_history=10)
+    frames = list(
+        zip(range(100), track_cycles(vectorized.generate(array, tracker=detector), detector))
+    )
+
+    assert detector.cycle is None
+    assert len(frames) == 100
+
+
+def test_steps_to() -> None:
+    array = Grid(20).grid_init("pulsar")
+    detector = CycleDetector(array.shape)
+    list(track_cycles(vectorized.generate(array, tracker=detector), detector))
+
+    assert detector.generation == 3
+    assert detector.steps_to(10**6) == (10**6 - 3) % 3
+    assert detector.steps_to(10**6 + 1) == 2
+
+
+@pytest.mark.parametrize("engine", ["frames", "sets"])
+def test_detector_fed_by_engines(engine: str) -> None:
+    array = Grid(20).grid_init("pulsar")
+    detector = CycleDetector(array.shape)
+    if engine == "frames":
+        frames = list(track_cycles(track_changes(sparse.generate(array), detector), detector))
+    else:
+        frames = list(track_cycles(bitpacked.generate(array, detector), detector))
+
+    assert detector.cycle == Cycle(0, 3)
+    assert len(frames) == 3
+
+
+def test_reset_keeps_history_of_current_state() -> None:
+    array = Grid(20).grid_init("blinker")
+    detector = CycleDetector(array.shape)
+    frames = vectorized.generate(array, tracker=detector)
+    next(frames)
+    # Another engine continuing the simulation hashes the current state again.
+    detector.reset(next(frames))
+    next(frames)
+
+    assert detector.cycle == Cycle(0, 2)
@@ -0,0 +1,115 @@
+import numpy as np
+import pytest
+
+from src.conway.engine.cycle import CycleDetector, track_cycles
+from src.conway.engine.ensemble import (
+    BoardStatus,
+    Ensemble,
+    random_boards,
+    simulate_ensemble,
+)
+from src.conway.engine import vectorized
+from src.conway.engine.rule import parse_rule
+from src.conway.grid.grid import Grid
+
+
+def test_next_generation_of_stacked_boards() -> None:
+    boards = random_boards(5, 20, 0.3, np.random.default_rng(0))
+
+    expected = [vectorized.next_generation(board) for board in boards]
+    assert np.array_equal(vectorized.next_generation(boards), expected)
+
+
+def test_structures() -> None:
+    boards = np.stack(
+        [
+            Grid(10).grid_init("block"),
+            Grid(10).grid_init("blinker"),
+            np.zeros((10, 10), dtype=int),
+            Grid(10).grid_init("glider"),
+        ]
+    )
+
+    summaries = sorted(Ensemble(boards).run(100))
+    assert [summary.board for summary in summaries] == [0, 1, 2, 3]
+    assert [summary.status for summary in summaries] == [
+        BoardStatus.STILL,
+        BoardStatus.OSCILLATING,
+        BoardStatus.DIED,
+        BoardStatus.STILL,
+    ]
+    assert [(summary.generation, summary.period) for summary in summaries[:3]] == [
+        (0, 1),
+        (0, 2),
+        (0, 0),
+    ]
+    assert summaries[0].final_population == 4
+    assert summaries[3].max_population == 5
+
+
+def test_summaries_match_single_boards() -> None:
+    boards = random_boards(20, 16, 0.3, np.random.default_rng(1))
+
+    for summary in Ensemble(boards, max_period=16).run(1000):
+        detector = CycleDetector(boards.shape[1:])
+        board = boards[summary.board].astype(np.int64)
+        nb_frames = sum(
+            1 for _ in track_cycles(vectorized.generate(board, tracker=detector), detector)
+        )
+        if summary.status == BoardStatus.DIED:
+            assert detector.cycle is None
+            assert summary.generation == nb_frames
+        else:
+            assert detector.cycle == (summary.generation, summary.period)
+            assert (summary.period == 1) == (summary.status == BoardStatus.STILL)
+        assert summary.final_population == np.count_nonzero(board)
+
+
+def test_max_generations() -> None:
+    summaries = list(Ensemble(Grid(50).grid_init("glider")[np.newaxis]).run(10))
+
+    assert len(summaries) == 1
+    assert summaries[0].status == BoardStatus.RUNNING
+    assert summaries[0].generation == 10
+
+
+@pytest.mark.parametrize("batch_size", [1, 7, 100])
+def test_simulate_ensemble(batch_size: int) -> None:
+    summaries = list(simulate_ensemble(30, 12, max_generations=500, batch_size=batch_size, seed=3))
+
+    assert sorted(summary.board for summary in summaries) == list(range(30))
+    assert summaries == list(
+        simulate_ensemble(30, 12, max_generations=500, batch_size=batch_size, seed=3)
+    )
+
+
+def test_ensemble_checks_boards() -> None:
+    with pytest.raises(ValueError):
+        Ensemble(np.zeros((10, 10)))
+
+
+def test_ensemble_rule() -> None:
+    rule = parse_rule("B36/S23")
+    boards = random_boards(3, 12, 0.4, np.random.default_rng(2))
+
+    ensemble = Ensemble(boards, rule=rule)
+    ensemble.step()
+    expected = [vectorized.next_generation(board, rule) for board in boards]
+    assert np.array_equal(ensemble.boards, np.array(expected)[np.isin(range(3), ensemble.indices)])
+
+
+def test_simulate_ensemble_on_retire() -> None:
+    retired = []
+    summaries = list(
+        simulate_ensemble(
+            20,
+            12,
+            max_generations=300,
+            seed=5,
+            on_retire=lambda summary, board: retired.append((summary, board.copy())),
+        )
+    )
+
+    assert [summary for summary, _ in retired] == summaries
+    for summary, board in retired:
+        assert np.count_nonzero(board) == summary.final_population
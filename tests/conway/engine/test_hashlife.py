@@ -0,0 +1,89 @@
+import numpy as np
+import pytest
+
+from src.conway.engine.hashlife import HashLife
+from src.conway.engine.vectorized import next_generation
+from src.conway.grid.grid import Grid
+
+
+@pytest.mark.parametrize("structure", ["pulsar", "penta_decathlon", "glider"])
+def test_advance_matches_vectorized_engine(structure: str) -> None:
+    array = Grid(40).grid_init(structure)
+    universe = HashLife()
+    universe.load(array)
+    for generations in [1, 1, 2, 3, 8]:
+        for _ in range(generations):
+            array = next_generation(array)
+        universe.advance(generations)
+        assert np.array_equal(universe.to_array(array.shape), array)
+
+
+def test_load_and_to_array() -> None:
+    array = np.random.choice([0, 1], size=(13, 21))
+    universe = HashLife()
+    universe.load(array, origin=(-5, 7))
+
+    assert universe.population == array.sum()
+    assert np.array_equal(universe.to_array((13, 21), origin=(-5, 7)), array)
+
+
+def test_advance_glider_pow2() -> None:
+    glider = Grid(3).grid_init("glider")
+    universe = HashLife()
+    universe.load(glider)
+    universe.advance(2**20)
+
+    assert universe.generation == 2**20
+    assert universe.population == 5
+    assert np.array_equal(universe.to_array((3, 3), origin=(2**18, 2**18)), glider)
+
+
+def test_garbage_collection_keeps_pattern() -> None:
+    array = Grid(20).grid_init("random")
+    expected = array.copy()
+    for _ in range(6):
+        expected = next_generation(expected)
+
+    universe = HashLife(max_nodes=10)
+    universe.load(np.pad(array, 20), origin=(-20, -20))
+    universe.advance(6)
+    reference = HashLife()
+    reference.load(np.pad(array, 20), origin=(-20, -20))
+    reference.advance(6)
+
+    assert universe.nb_nodes < reference.nb_nodes
+    assert np.array_equal(
+        universe.to_array((60, 60), origin=(-20, -20)),
+        reference.to_array((60, 60), origin=(-20, -20)),
+    )
+    assert universe.population == reference.population
+
+
+def test_caches_stay_bounded_within_a_step(monkeypatch) -> None:
+    array = np.pad(Grid(24).grid_init("random"), 24)
+    reference = HashLife()
+    reference.load(array, origin=(-24, -24))
+    reference.advance(16)
+
+    universe = HashLife(max_nodes=500)
+    sizes = []
+    bound_caches = universe._bound_caches
+
+    def record_sizes() -> None:
+        bound_caches()
+        sizes.append((universe.nb_nodes, len(universe._results)))
+
+    monkeypatch.setattr(universe, "_bound_caches", record_sizes)
+    universe.load(array, origin=(-24, -24))
+    universe.advance(16)
+
+    assert max(max(size) for size in sizes) <= 500 < reference.nb_nodes
+    assert np.array_equal(
+        universe.to_array(array.shape, origin=(-24, -24)),
+        reference.to_array(array.shape, origin=(-24, -24)),
+    )
+
+
+def test_advance_negative() -> None:
+    with pytest.raises(ValueError):
+        HashLife().advance(-1)
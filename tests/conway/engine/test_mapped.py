@@ -0,0 +1,87 @@
+import numpy as np
+import pytest
+
+from src.conway.engine.mapped import MappedGrid, is_mapped
+from src.conway.engine.rule import parse_rule
+from src.conway.engine.vectorized import next_generation
+
+
+@pytest.mark.parametrize("packed", [False, True])
+@pytest.mark.parametrize("band_rows", [1, 7, 64])
+def test_step_matches_vectorized(tmp_path, packed, band_rows):
+    grid = MappedGrid(tmp_path, (40, 70), packed=packed, band_rows=band_rows)
+    grid.fill_random(0.3, seed=1)
+    expected = grid.read(0, 40)
+
+    grid.step(5)
+    for _ in range(5):
+        expected = next_generation(expected)
+
+    np.testing.assert_array_equal(grid.read(0, 40), expected)
+    assert grid.generation == 5
+    assert grid.population() == expected.sum()
+
+
+def test_step_with_rule(tmp_path):
+    rule = parse_rule("B36/S23")
+    grid = MappedGrid(tmp_path, (30, 30), band_rows=4, rule=rule)
+    grid.fill_random(0.4, seed=2)
+    expected = next_generation(next_generation(grid.read(0, 30), rule), rule)
+
+    grid.step(2)
+
+    np.testing.assert_array_equal(grid.read(0, 30), expected)
+
+
+def test_reopen_keeps_rule(tmp_path):
+    rule = parse_rule("B36/S23")
+    grid = MappedGrid(tmp_path, (30, 30), band_rows=4, rule=rule)
+    grid.fill_random(0.4, seed=2)
+    grid.step(1)
+    del grid
+
+    assert MappedGrid(tmp_path).rule == rule
+    assert MappedGrid(tmp_path, rule=parse_rule("b36s23")).rule == rule
+    with pytest.raises(ValueError):
+        MappedGrid(tmp_path, rule=parse_rule("B3/S23"))
+
+
+def test_packed_rejects_other_rules(tmp_path):
+    with pytest.raises(ValueError):
+        MappedGrid(tmp_path, (8, 8), packed=True, rule=parse_rule("B36/S23"))
+
+
+def test_reopen(tmp_path):
+    grid = MappedGrid(tmp_path, (20, 100), packed=True, band_rows=3)
+    grid.fill_random(seed=3)
+    grid.step(3)
+    expected = grid.read(0, 20)
+    del grid
+
+    assert is_mapped(tmp_path)
+    assert not is_mapped(tmp_path / "missing")
+    reopened = MappedGrid(tmp_path, band_rows=8)
+
+    assert reopened.shape == (20, 100)
+    assert reopened.packed
+    assert reopened.generation == 3
+    np.testing.assert_array_equal(reopened.read(0, 20), expected)
+    np.testing.assert_array_equal(
+        np.unpackbits(np.load(reopened.path).view(np.uint8), axis=1, count=100, bitorder="little"),
+        expected,
+    )
+
+
+@pytest.mark.parametrize("packed", [False, True])
+def test_place_pattern(tmp_path, packed):
+    pattern = tmp_path / "glider.rle"
+    pattern.write_text("x = 3, y = 3\nbo$2bo$3o!\n")
+    grid = MappedGrid(tmp_path / "grid", (10, 80), packed=packed)
+
+    grid.place_pattern(pattern, (2, 70))
+
+    expected = np.zeros((10, 80), dtype=np.uint8)
+    expected[2:5, 70:73] = [[0, 1, 0], [0, 0, 1], [1, 1, 1]]
+    np.testing.assert_array_equal(grid.read(0, 10), expected)
+    with pytest.raises(ValueError):
+        grid.place_pattern(pattern, (8, 0))
@@ -0,0 +1,102 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from src.conway.commands.generation import generate_grid
+from src.conway.engine.engine import Engine
+from src.conway.engine.rule import CONWAY, Rule, apply_rule, parse_rule
+from src.conway.engine.vectorized import next_generation
+from src.conway.grid.grid import Grid
+
+_HIGHLIFE = parse_rule("B36/S23")
+_DAY_AND_NIGHT = parse_rule("B3678/S34678")
+
+
+def _reference_generation(array: np.ndarray, rule: Rule) -> np.ndarray:
+    padded = np.pad(array != 0, 1)
+    next_array = np.zeros_like(array)
+    for i, j in np.ndindex(*array.shape):
+        neighbors = padded[i : i + 3, j : j + 3].sum() - padded[i + 1, j + 1]
+        alive = padded[i + 1, j + 1]
+        next_array[i, j] = neighbors in (rule.survival if alive else rule.birth)
+    return next_array
+
+
+@pytest.mark.parametrize(
+    "rulestring, birth, survival",
+    [
+        ("B3/S23", {3}, {2, 3}),
+        ("b36s23", {3, 6}, {2, 3}),
+        ("B2/S", {2}, set()),
+        ("S34678/B3678", {3, 6, 7, 8}, {3, 4, 6, 7, 8}),
+        ("23/36", {3, 6}, {2, 3}),
+    ],
+)
+def test_parse_rule(rulestring: str, birth: set[int], survival: set[int]) -> None:
+    rule = parse_rule(rulestring)
+
+    assert rule == Rule(frozenset(birth), frozenset(survival))
+    assert parse_rule(str(rule)) == rule
+
+
+@pytest.mark.parametrize("rulestring", ["B9/S23", "B3S23x", "Conway"])
+def test_parse_invalid_rule(rulestring: str) -> None:
+    with pytest.raises(ValueError):
+        parse_rule(rulestring)
+
+
+def test_rule_tables() -> None:
+    births, survivals = CONWAY.table
+
+    assert [count for count in range(9) if births[count]] == [3]
+    assert [count for count in range(9) if survivals[count]] == [2, 3]
+    assert CONWAY.bits == (1 << 3) | (1 << 11) | (1 << 12)
+
+
+@pytest.mark.parametrize("rule", [CONWAY, _HIGHLIFE, _DAY_AND_NIGHT, parse_rule("B0/S8")])
+def test_apply_rule(rule: Rule) -> None:
+    cells = np.repeat([0, 1], 9).astype(np.uint8)
+    counts = np.tile(np.arange(9), 2).astype(np.uint8)
+
+    expected = [
+        count in (rule.survival if cell else rule.birth) for cell, count in zip(cells, counts)
+    ]
+    assert apply_rule(cells, counts, rule).tolist() == expected
+
+
+@pytest.mark.parametrize("rule", [CONWAY, _HIGHLIFE, _DAY_AND_NIGHT])
+def test_next_generation(rule: Rule) -> None:
+    array = Grid(30).grid_init("random")
+
+    assert np.array_equal(next_generation(array, rule), _reference_generation(array, rule))
+
+
+@pytest.mark.parametrize(
+    "engine, tile_size",
+    [(Engine.SETS, None), (Engine.NUMPY, None), (Engine.NUMPY, 8), (Engine.SHARED, 8)],
+)
+@pytest.mark.parametrize("rule", [_HIGHLIFE, _DAY_AND_NIGHT])
+def test_engines(engine: Engine, tile_size: int, rule: Rule) -> None:
+    array = Grid(30).grid_init("random")
+    expected = [array.copy()]
+    for _ in range(10):
+        expected.append(_reference_generation(expected[-1], rule))
+
+    frames = generate_grid(array.copy(), 2, engine, tile_size=tile_size, rule=rule)
+    for frame, expected_frame in zip(itertools.islice(frames, 11), expected):
+        assert np.array_equal(frame, expected_frame)
+
+
+@pytest.mark.parametrize("engine", [Engine.BITPACKED, Engine.HASHLIFE, Engine.SPARSE])
+def test_unsupported_engines(engine: Engine) -> None:
+    with pytest.raises(ValueError):
+        generate_grid(Grid(10).grid_init("blinker"), 1, engine, rule=_HIGHLIFE)
+
+
+@pytest.mark.parametrize("engine", [Engine.NUMPY, Engine.SHARED])
+def test_birth_on_empty_grid(engine: Engine) -> None:
+    frames = generate_grid(np.zeros((10, 10), dtype=np.uint8), 2, engine, rule=parse_rule("B0/S"))
+
+    populations = [int(np.count_nonzero(frame)) for frame in itertools.islice(frames, 6)]
+    assert populations == [0, 100, 0, 100, 0, 100]
@@ -0,0 +1,32 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from src.conway.engine.shared import _split_rows, generate
+from src.conway.engine.vectorized import next_generation
+from src.conway.grid.grid import Grid
+
+
+@pytest.mark.parametrize(
+    "nb_rows,nb_bands,res_bands",
+    [
+        (10, 1, [(0, 10)]),
+        (10, 3, [(0, 3), (3, 6), (6, 10)]),
+        (2, 4, [(0, 1), (1, 2)]),
+    ],
+)
+def test_split_rows(nb_rows: int, nb_bands: int, res_bands: list[tuple[int, int]]) -> None:
+    assert _split_rows(nb_rows, nb_bands) == res_bands
+
+
+@pytest.mark.parametrize("jobs", [1, 3])
+def test_generate_matches_vectorized_engine(jobs: int) -> None:
+    array = Grid(30).grid_init("random")
+    expected = array.copy()
+
+    generator = generate(array, jobs)
+    for frame in itertools.islice(generator, 10):
+        assert np.array_equal(frame, expected)
+        expected = next_generation(expected)
+    generator.close()
@@ -0,0 +1,74 @@
+import itertools
+import tracemalloc
+
+import numpy as np
+import pytest
+
+from src.conway.engine import vectorized
+from src.conway.engine.rule import CONWAY, Rule, parse_rule
+from src.conway.engine.simulation import Simulation
+from src.conway.grid.grid import Grid
+
+
+@pytest.mark.parametrize("rule", [CONWAY, parse_rule("B36/S23"), parse_rule("B0/S8")])
+@pytest.mark.parametrize("shape", [(1, 1), (5, 1), (33, 47)])
+def test_step_matches_vectorized_engine(rule: Rule, shape: tuple[int, int]) -> None:
+    array = (np.random.default_rng(0).random(shape) < 0.4).astype(np.uint8)
+    simulation = Simulation(array, rule)
+
+    for generations in (1, 2, 7):
+        for _ in range(generations):
+            array = vectorized.next_generation(array, rule)
+        assert np.array_equal(simulation.step(generations), array)
+    assert simulation.generation == 10
+
+
+def test_frames_are_read_only_and_consistent() -> None:
+    simulation = Simulation(Grid(20).grid_init("glider"))
+    frame = simulation.grid
+    expected = frame.copy()
+    with pytest.raises(ValueError):
+        frame[0, 0] = 1
+
+    simulation.step()
+    assert np.array_equal(frame, expected)
+    out = np.zeros((20, 20), dtype=np.int64)
+    assert simulation.copy(out) is out
+    assert np.array_equal(out, simulation.grid)
+    assert simulation.copy().flags.writeable
+
+
+def test_iteration() -> None:
+    array = Grid(10).grid_init("blinker")
+    array[0, 0] = 1
+    frames = [frame.copy() for frame in itertools.islice(Simulation(array), 5)]
+    expected = [frame.copy() for frame in itertools.islice(vectorized.generate(array), 5)]
+    assert len(frames) == 5
+    assert all(np.array_equal(frame, other) for frame, other in zip(frames, expected))
+
+    dying = np.zeros((5, 5), dtype=np.uint8)
+    dying[2, 2] = 1
+    assert len(list(Simulation(dying))) == 1
+
+    frames = itertools.islice(Simulation(np.zeros((5, 5), dtype=np.uint8), parse_rule("B0/S")), 4)
+    assert [int(frame.sum()) for frame in frames] == [0, 25, 0, 25]
+
+
+@pytest.mark.parametrize("rule", [CONWAY, parse_rule("B36/S23")])
+def test_step_does_not_allocate_grids(rule: Rule) -> None:
+    array = (np.random.default_rng(1).random((512, 512)) < 0.3).astype(np.uint8)
+    simulation = Simulation(array, rule)
+    simulation.step()
+
+    tracemalloc.start()
+    try:
+        simulation.step(20)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert peak < array.size // 4
+
+
+def test_simulation_checks_grid() -> None:
+    with pytest.raises(ValueError):
+        Simulation(np.zeros((2, 10, 10)))
@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+
+from src.conway.engine.sparse import decode, encode, from_array, step, to_array
+from src.conway.engine.vectorized import next_generation
+from src.conway.grid.grid import Grid
+
+
+def test_encode_decode() -> None:
+    rows = np.asarray([0, -1, 5, -(2**31), 2**31 - 1])
+    columns = np.asarray([0, 3, -7, 2**31 - 1, -(2**31)])
+    keys = encode(rows, columns)
+
+    res_rows, res_columns = decode(keys)
+    assert np.array_equal(res_rows, rows)
+    assert np.array_equal(res_columns, columns)
+    assert np.array_equal(np.argsort(keys), np.lexsort((columns, rows)))
+
+
+def test_from_array_to_array() -> None:
+    array = np.random.choice([0, 1], size=(10, 12))
+    keys = from_array(array, origin=(-3, 4))
+
+    assert keys.size == array.sum()
+    assert np.array_equal(to_array(keys, (10, 12), origin=(-3, 4)), array)
+    assert np.array_equal(to_array(keys, (10, 12), origin=(-2, 4))[:-1], array[1:])
+
+
+@pytest.mark.parametrize("structure", ["random", "pulsar", "hwss"])
+def test_step_matches_vectorized_engine(structure: str) -> None:
+    array = np.pad(Grid(30).grid_init(structure), 10)
+    keys = from_array(array)
+    for _ in range(8):
+        array = next_generation(array)
+        keys = step(keys)
+        assert np.array_equal(to_array(keys, array.shape), array)
+
+
+def test_step_glider_leaves_the_grid() -> None:
+    glider = Grid(3).grid_init("glider")
+    keys = from_array(glider)
+    for _ in range(400):
+        keys = step(keys)
+
+    assert keys.size == 5
+    assert np.array_equal(to_array(keys, (3, 3), origin=(100, 100)), glider)
+
+
+def test_step_empty() -> None:
+    assert step(np.zeros(0, dtype=np.int64)).size == 0
@@ -0,0 +1,142 @@
+import io
+import itertools
+import json
+
+import numpy as np
+import pytest
+
+from src.conway.engine import bitpacked, shared, tiled, vectorized
+from src.conway.engine.changes import track_changes
+from src.conway.engine.statistics import (
+    Statistics,
+    StatisticsFormat,
+    StatisticsTracker,
+    StatisticsWriter,
+    collect_statistics,
+)
+from src.conway.grid.grid import Grid
+
+
+def _statistics(previous: np.ndarray, array: np.ndarray, generation: int) -> Statistics:
+    rows, columns = np.nonzero(array)
+    bounding_box = None
+    if rows.size:
+        bounding_box = (rows.min(), columns.min(), rows.max(), columns.max())
+    densities = [
+        array[row : row + 8, column : column + 8].mean()
+        for row in range(0, array.shape[0], 8)
+        for column in range(0, array.shape[1], 8)
+    ]
+    return Statistics(
+        generation,
+        int(np.count_nonzero(array)),
+        int(np.count_nonzero((array != 0) & (previous == 0))),
+        int(np.count_nonzero((array == 0) & (previous != 0))),
+        bounding_box,
+        pytest.approx(max(densities)),
+    )
+
+
+def _expected(array: np.ndarray, nb_frames: int) -> list[Statistics]:
+    expected = [_statistics(array, array, 0)]
+    for generation in range(1, nb_frames):
+        previous, array = array, vectorized.next_generation(array)
+        expected.append(_statistics(previous, array, generation))
+    return expected
+
+
+@pytest.mark.parametrize("structure", ["random", "glider", "blinker"])
+def test_track_changes(structure: str) -> None:
+    array = Grid(30).grid_init(structure)
+    expected = _expected(array.copy(), 20)
+    tracker = StatisticsTracker(array.shape, region_size=8)
+
+    frames = itertools.islice(track_changes(vectorized.generate(array), tracker), 20)
+    statistics = [statistics for _, statistics in collect_statistics(frames, tracker)]
+    assert statistics == expected[: len(statistics)]
+
+
+def test_tiled_generate_reports_changes() -> None:
+    array = np.zeros((37, 45), dtype=np.uint8)
+    array[3:8, 3:8] = Grid(5).grid_init("random")
+    array[20:23, 30] = 1
+    expected = _expected(array.copy(), 15)
+    tracker = StatisticsTracker(array.shape, region_size=8)
+
+    frames = itertools.islice(tiled.generate(array, tile_size=8, tracker=tracker), 15)
+    statistics = [statistics for _, statistics in collect_statistics(frames, tracker)]
+    assert statistics == expected[: len(statistics)]
+
+
+@pytest.mark.parametrize(
+    "generate",
+    [
+        lambda array, tracker: vectorized.generate(array, tracker=tracker),
+        lambda array, tracker: bitpacked.generate(array, tracker),
+        lambda array, tracker: shared.generate(array, 2, tracker=tracker),
+        lambda array, tracker: shared.generate(array, 2, tile_size=8, tracker=tracker),
+    ],
+    ids=["numpy", "bitpacked", "shared", "shared-tiled"],
+)
+def test_generate_reports_changes(generate) -> None:
+    array = Grid(37).grid_init("random")
+    expected = _expected(array.copy(), 15)
+    tracker = StatisticsTracker(array.shape, region_size=8)
+
+    frames = itertools.islice(generate(array, tracker), 15)
+    statistics = [statistics for _, statistics in collect_statistics(frames, tracker)]
+    assert statistics == expected[: len(statistics)]
+
+
+def test_max_density_of_emptied_region() -> None:
+    tracker = StatisticsTracker((10, 10), region_size=5)
+    array = np.zeros((10, 10), dtype=np.uint8)
+    array[:5, :5] = 1
+    array[7, 7] = 1
+    tracker.reset(array)
+    assert tracker.collect().max_density == 1.0
+
+    dead = np.ravel_multi_index(np.nonzero(array[:5, :5]), array.shape)
+    tracker.update(np.zeros(0, dtype=np.intp), dead[:5])
+    assert tracker.collect().max_density == pytest.approx(0.8)
+    tracker.update(np.zeros(0, dtype=np.intp), dead[5:])
+    assert tracker.collect().max_density == pytest.approx(0.04)
+
+
+def test_update_cells() -> None:
+    tracker = StatisticsTracker((10, 10), region_size=5)
+    tracker.reset(np.zeros((10, 10), dtype=np.uint8))
+    tracker.update_cells({(2, 3), (8, 9)}, set())
+    tracker.update_cells({(5, 5)}, {(8, 9)})
+
+    assert tracker.collect() == Statistics(2, 2, 3, 1, (2, 3, 5, 5), 0.04)
+    tracker.update_cells(set(), {(2, 3), (5, 5)})
+    assert tracker.collect() == Statistics(3, 0, 0, 2, None, 0.0)
+
+
+@pytest.mark.parametrize("statistics_format", list(StatisticsFormat))
+def test_statistics_writer(statistics_format: StatisticsFormat) -> None:
+    output = io.StringIO()
+    writer = StatisticsWriter(output, statistics_format)
+    writer.write(Statistics(0, 5, 0, 0, (1, 2, 3, 4), 0.5))
+    writer.write(Statistics(1, 0, 0, 5, None, 0.0))
+
+    lines = output.getvalue().splitlines()
+    if statistics_format == StatisticsFormat.CSV:
+        assert lines == [
+            "generation,population,births,deaths,min_row,min_column,max_row,max_column,max_density",
+            "0,5,0,0,1,2,3,4,0.5",
+            "1,0,0,5,,,,,0.0",
+        ]
+    else:
+        assert json.loads(lines[1]) == {
+            "generation": 1,
+            "population": 0,
+            "births": 0,
+            "deaths": 5,
+            "min_row": None,
+            "min_column": None,
+            "max_row": None,
+            "max_column": None,
+            "max_density": 0.0,
+        }
@@ -0,0 +1,66 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from src.conway.engine import shared
+from src.conway.engine.tiled import TiledGrid, dilate, padded_shape
+from src.conway.engine.vectorized import next_generation
+from src.conway.grid.grid import Grid
+
+
+@pytest.mark.parametrize(
+    "shape,tile_size,res_shape",
+    [((64, 64), 8, (66, 66)), ((53, 47), 8, (58, 50)), ((5, 5), 64, (66, 66))],
+)
+def test_padded_shape(shape: tuple[int, int], tile_size: int, res_shape: tuple[int, int]) -> None:
+    assert padded_shape(shape, tile_size) == res_shape
+
+
+def test_dilate() -> None:
+    mask = np.zeros((4, 5), dtype=bool)
+    mask[0, 0] = mask[2, 3] = True
+    res_mask = np.asarray(
+        [
+            [1, 1, 0, 0, 0],
+            [1, 1, 1, 1, 1],
+            [0, 0, 1, 1, 1],
+            [0, 0, 1, 1, 1],
+        ],
+        dtype=bool,
+    )
+    assert np.array_equal(dilate(mask), res_mask)
+
+
+@pytest.mark.parametrize("shape,tile_size", [((50, 50), 8), ((53, 47), 8), ((30, 30), 64)])
+def test_step_matches_vectorized_engine(shape: tuple[int, int], tile_size: int) -> None:
+    array = np.random.choice([0, 1], size=shape)
+    grid = TiledGrid(array, tile_size)
+    for _ in range(30):
+        array = next_generation(array)
+        grid.step()
+        assert np.array_equal(grid.to_array(), array)
+
+
+def test_step_skips_quiescent_tiles() -> None:
+    array = np.zeros((64, 64), dtype=int)
+    array[:13, :13] = Grid(13).grid_init("block")
+    array[40:43, 40:43] = Grid(3).grid_init("blinker")
+    grid = TiledGrid(array, 8)
+    grid.step()
+    grid.step()
+
+    assert grid.active.sum() == 9
+    assert grid.active[4:7, 4:7].all()
+
+
+@pytest.mark.parametrize("jobs", [1, 3])
+def test_shared_generate_with_tiles(jobs: int) -> None:
+    array = np.random.choice([0, 1], size=(45, 37))
+    expected = array.copy()
+
+    generator = shared.generate(array, jobs, tile_size=8)
+    for frame in itertools.islice(generator, 20):
+        assert np.array_equal(frame, expected)
+        expected = next_generation(expected)
+    generator.close()
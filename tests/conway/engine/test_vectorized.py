@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+
+from src.conway.engine.vectorized import count_neighbors, generate, next_generation
+from src.conway.grid.cell import find_living_cells
+from src.conway.grid.grid import Grid, update_grid, update_positions
+
+
+def _sets_next_generation(array: np.ndarray) -> np.ndarray:
+    array = array.copy()
+    living_cells = find_living_cells(array)
+    new_living_cells, prev_living_cells = update_positions(array, living_cells, living_cells.copy())
+    return update_grid(array, new_living_cells, prev_living_cells)
+
+
+@pytest.mark.parametrize(
+    "array,res_counts",
+    [
+        (
+            np.asarray([[0, 1, 0], [0, 1, 0], [0, 1, 0]]),
+            np.asarray([[2, 1, 2], [3, 2, 3], [2, 1, 2]]),
+        ),
+        (
+            np.asarray([[1, 1], [1, 1]]),
+            np.asarray([[3, 3], [3, 3]]),
+        ),
+    ],
+)
+def test_count_neighbors(array: np.ndarray, res_counts: np.ndarray) -> None:
+    assert np.array_equal(count_neighbors(array), res_counts)
+
+
+@pytest.mark.parametrize("structure", ["random", "blinker", "pulsar", "glider", "hwss"])
+def test_next_generation_matches_sets_engine(structure: str) -> None:
+    array = Grid(20).grid_init(structure)
+    for _ in range(10):
+        expected = _sets_next_generation(array)
+        array = next_generation(array)
+        assert np.array_equal(array, expected)
+
+
+def test_generate_stops_when_grid_is_empty() -> None:
+    array = np.zeros((5, 5), dtype=int)
+    array[2, 2] = 1
+    frames = [frame.copy() for frame in generate(array)]
+    assert len(frames) == 1
+    assert not array.any()
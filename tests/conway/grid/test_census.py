@@ -0,0 +1,148 @@
+from collections import Counter
+
+import numpy as np
+import pytest
+
+from src.conway.engine.vectorized import next_generation
+from src.conway.grid import census as census_module
+from src.conway.grid.census import (
+    Catalog,
+    canonical_hash,
+    census,
+    clusters,
+    default_catalog,
+    label_clusters,
+    orientations,
+)
+from src.conway.grid.grid import Grid
+from src.conway.grid.structures import (
+    OscillatingStructures,
+    SpaceshipStructures,
+    StabilizedStructures,
+)
+
+_SHIP = np.asarray([[1, 1, 0], [1, 0, 1], [0, 1, 1]])
+_MOLD = np.asarray(
+    [
+        [0, 0, 0, 1, 1, 0],
+        [0, 0, 1, 0, 0, 1],
+        [1, 0, 0, 1, 0, 1],
+        [0, 0, 0, 0, 1, 0],
+        [1, 0, 1, 1, 0, 0],
+        [0, 1, 0, 0, 0, 0],
+    ]
+)
+
+
+@pytest.mark.parametrize(
+    "structure",
+    [*StabilizedStructures, *OscillatingStructures, *SpaceshipStructures],
+)
+def test_census_recognizes_every_phase(structure) -> None:
+    array = Grid(40).grid_init(structure.value)
+    for _ in range(16):
+        assert census(array) == Counter({structure.value: 1})
+        array = next_generation(array)
+
+
+def test_census_of_several_objects() -> None:
+    beehive = np.asarray([[0, 1, 1, 0], [1, 0, 0, 1], [0, 1, 1, 0]])
+    array = np.zeros((30, 40), dtype=np.uint8)
+    array[2:4, 2:4] = 1
+    array[10, 10:13] = 1
+    array[20:23, 30] = 1
+    array[2:5, 20:24] = beehive
+    array[10:14, 30:33] = beehive.T
+    array[25:28, 5:8] = _SHIP[::-1]
+
+    counts = census(array)
+    assert counts == Counter({"block": 1, "blinker": 2, "beehive": 2, canonical_hash(_SHIP): 1})
+
+
+def test_canonical_hash() -> None:
+    hashes = {canonical_hash(np.pad(array, 2)) for array in orientations(_SHIP[:, ::-1])}
+    assert len(hashes) == 1
+    assert canonical_hash(_SHIP) != canonical_hash(np.asarray([[1, 1], [1, 1]]))
+
+
+@pytest.mark.parametrize("distance", [1, 2])
+def test_census_of_unknown_oscillator(distance: int) -> None:
+    array = np.zeros((20, 20), dtype=np.uint8)
+    array[7:13, 7:13] = _MOLD
+    expected = Counter({canonical_hash(_MOLD): 1})
+    for _ in range(4):
+        # Some phases of the mold are split into several clusters at a distance of 1.
+        assert census(array, distance=distance) == expected
+        assert canonical_hash(array) == canonical_hash(_MOLD)
+        array = next_generation(array)
+
+
+def test_census_only_clusters_phases_of_merged_groups(monkeypatch) -> None:
+    calls = []
+
+    def count_calls(array: np.ndarray, distance: int = 2):
+        calls.append(distance)
+        return label_clusters(array, distance)
+
+    catalog = default_catalog()
+    monkeypatch.setattr(census_module, "label_clusters", count_calls)
+    array = np.zeros((80, 80), dtype=np.uint8)
+    for row in range(0, 80, 10):
+        for column in range(0, 80, 40):
+            array[row : row + 3, column : column + 3] = _SHIP
+    assert census(array, catalog) == Counter({canonical_hash(_SHIP): 16})
+    # Cells are clustered, then unknown clusters are grouped, without computing their phases.
+    assert len(calls) == 2
+
+    calls.clear()
+    array = np.zeros((20, 20), dtype=np.uint8)
+    array[7:13, 7:13] = _MOLD
+    assert census(array, catalog, 1) == Counter({canonical_hash(_MOLD): 1})
+    # The phases of the merged parts are only clustered until one is a single cluster: the second.
+    assert len(calls) == 4
+
+
+def test_catalog_add() -> None:
+    catalog = Catalog()
+    assert catalog.add("ship", _SHIP) == 1
+    assert catalog.add("glider", np.asarray([[0, 1, 0], [0, 0, 1], [1, 1, 1]])) == 2
+    assert len(catalog) == 2
+    assert catalog.lookup(_SHIP.T) == "ship"
+    assert catalog.identify(np.asarray([[1, 1, 1]])) == canonical_hash(np.asarray([[1, 1, 1]]))
+
+    samples: dict = {}
+    array = np.zeros((10, 10), dtype=np.uint8)
+    array[1:4, 1:4] = _SHIP
+    array[6, 5:8] = 1
+    assert census(array, catalog, samples=samples) == Counter(
+        {"ship": 1, canonical_hash(np.asarray([[1, 1, 1]])): 1}
+    )
+    assert [sample.shape for sample in samples.values()] == [(1, 3)]
+    assert len(default_catalog()) == 14
+
+
+@pytest.mark.parametrize("density", [0.01, 0.05])
+@pytest.mark.parametrize("distance", [1, 2, 3])
+def test_label_clusters(density: float, distance: int) -> None:
+    array = (np.random.default_rng(distance).random((80, 90)) < density).astype(np.uint8)
+    rows, columns, labels = label_clusters(array, distance)
+
+    # Connected components of the cells within distance of each other, found by a search.
+    close = (np.abs(rows[:, np.newaxis] - rows) <= distance) & (
+        np.abs(columns[:, np.newaxis] - columns) <= distance
+    )
+    expected = np.full(rows.size, -1)
+    for start in range(rows.size):
+        if expected[start] < 0:
+            expected[start] = start
+            stack = [start]
+            while stack:
+                for neighbor in np.flatnonzero(close[stack.pop()] & (expected < 0)):
+                    expected[neighbor] = start
+                    stack.append(neighbor)
+    assert np.array_equal(labels, expected)
+    assert sum(int(cluster.sum()) for _, cluster in clusters(array, distance)) == rows.size
+
+
+def test_census_empty_grid() -> None:
+    assert census(np.zeros((5, 5), dtype=np.uint8)) == Counter()
@@ -0,0 +1,76 @@
+import io
+import itertools
+import json
+
+import numpy as np
+
+from src.conway.commands.generation import generate_grid
+from src.conway.engine import vectorized
+from src.conway.engine.engine import Engine
+from src.conway.grid.grid import Grid
+from src.conway.profiling.profiler import NullProfiler, Phase, Profiler, profile_frames
+
+
+def test_profile_frames() -> None:
+    array = Grid(20).grid_init("random")
+    expected = [array.copy()]
+    for _ in range(5):
+        expected.append(vectorized.next_generation(expected[-1]))
+
+    records = []
+    profiler = Profiler(callback=records.append)
+    for _ in itertools.islice(profile_frames(vectorized.generate(array), profiler), 6):
+        pass
+
+    assert [record["generation"] for record in records] == list(range(6))
+    assert records[0]["births"] == np.count_nonzero(expected[0])
+    for record, previous, current in zip(records[1:], expected, expected[1:]):
+        assert record["population"] == np.count_nonzero(current)
+        assert record["births"] == np.count_nonzero((current == 1) & (previous == 0))
+        assert record["deaths"] == np.count_nonzero((current == 0) & (previous == 1))
+        assert record["phases"][Phase.STEP.value] >= 0
+    assert profiler.nb_generations == 6
+
+
+def test_profile_frames_with_step() -> None:
+    records = []
+    profiler = Profiler(callback=records.append)
+    frames = generate_grid(Grid(20).grid_init("pulsar"), 1, Engine.HASHLIFE, 3, profiler=profiler)
+    for _ in itertools.islice(frames, 4):
+        pass
+
+    assert [record["generation"] for record in records] == [0, 3, 6, 9]
+    assert len({record["population"] for record in records}) == 1
+
+
+def test_profile_sets_engine() -> None:
+    output = io.StringIO()
+    profiler = Profiler(output=output)
+    frames = generate_grid(Grid(20).grid_init("random"), 2, Engine.SETS, profiler=profiler)
+    for _ in itertools.islice(frames, 4):
+        pass
+
+    records = [json.loads(line) for line in output.getvalue().splitlines()]
+    assert len(records) == 4
+    for record in records[1:]:
+        assert {phase.value for phase in Phase} - set(record["phases"]) == {
+            Phase.STEP.value,
+            Phase.DRAW.value,
+        }
+        assert len(record["workers"]) == 2
+        assert record["imbalance"] >= 1
+    assert "subsets" in profiler.summary()
+
+
+def test_null_profiler() -> None:
+    records = []
+    profiler = NullProfiler(callback=records.append)
+    with profiler.phase(Phase.STEP):
+        pass
+    profiler.add_workers([1.0, 2.0], 3.0)
+    profiler.end_generation(0, 1, 1, 0)
+
+    assert not profiler.enabled
+    assert not records
+    assert profiler.nb_generations == 0
+    assert not profiler.totals
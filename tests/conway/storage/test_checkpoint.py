@@ -0,0 +1,58 @@
+import random
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from src.conway.storage.checkpoint import (
+    Checkpoint,
+    CheckpointWriter,
+    checkpoint_path,
+    latest_checkpoint,
+    list_checkpoints,
+    load_checkpoint,
+    random_state,
+    save_checkpoint,
+    set_random_state,
+)
+
+
+@pytest.mark.parametrize("density", [0.001, 0.5])
+def test_save_load(tmp_path: Path, density: float) -> None:
+    grid = (np.random.default_rng(0).random((100, 80)) < density).astype(np.uint8)
+    checkpoint = Checkpoint(42, grid, {"engine": "numpy", "tile_size": None}, random_state())
+
+    save_checkpoint(tmp_path / "checkpoint.npz", checkpoint)
+    loaded = load_checkpoint(tmp_path / "checkpoint.npz")
+
+    assert loaded.generation == 42
+    assert np.array_equal(loaded.grid, grid)
+    assert loaded.parameters == checkpoint.parameters
+    assert [path.name for path in tmp_path.iterdir()] == ["checkpoint.npz"]
+
+
+def test_random_state() -> None:
+    state = random_state()
+    expected = (random.random(), np.random.random())
+
+    set_random_state(state)
+
+    assert (random.random(), np.random.random()) == expected
+
+
+def test_writer_keeps_latest_checkpoints(tmp_path: Path) -> None:
+    grid = np.zeros((10, 10), dtype=np.uint8)
+    with CheckpointWriter(tmp_path, keep=2) as writer:
+        for generation in range(1, 6):
+            grid[generation, generation] = 1
+            writer.write(generation, grid, {})
+
+    checkpoints = list_checkpoints(tmp_path)
+    assert len(checkpoints) <= 2
+    assert latest_checkpoint(tmp_path) == checkpoint_path(tmp_path, 5)
+    assert np.array_equal(load_checkpoint(checkpoint_path(tmp_path, 5)).grid, grid)
+    assert writer.nb_written + writer.nb_replaced == 5
+
+
+def test_latest_checkpoint_empty(tmp_path: Path) -> None:
+    assert latest_checkpoint(tmp_path) is None
@@ -0,0 +1,91 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from src.conway.engine import vectorized
+from src.conway.grid.grid import Grid
+from src.conway.storage.export import (
+    BackgroundWriter,
+    ExportFormat,
+    GifWriter,
+    RawWriter,
+    downscale,
+    open_writer,
+)
+
+
+def _frames(nb_frames: int) -> list[np.ndarray]:
+    array = Grid(20).grid_init("random")
+    return [frame.copy() for frame, _ in zip(vectorized.generate(array), range(nb_frames))]
+
+
+def test_downscale() -> None:
+    frame = np.array([[1, 1, 0], [1, 0, 0], [0, 0, 1]])
+
+    assert np.array_equal(downscale(frame, 1), frame)
+    assert np.array_equal(downscale(frame, 2), [[3, 0], [0, 1]])
+
+
+@pytest.mark.parametrize("background", [False, True])
+def test_gif_writer(tmp_path: Path, background: bool) -> None:
+    frames = _frames(5)
+    path = tmp_path / "export.gif"
+
+    writer = GifWriter(path, frames[0].shape, fps=20)
+    with BackgroundWriter(writer) if background else writer as exported:
+        for frame in frames:
+            exported.write(frame)
+
+    with Image.open(path) as image:
+        assert image.n_frames == len(frames)
+        assert image.info["duration"] == 50
+        for i, frame in enumerate(frames):
+            image.seek(i)
+            assert np.array_equal(np.array(image.convert("L")), np.where(frame == 1, 0, 255))
+
+
+def test_gif_writer_downscales(tmp_path: Path) -> None:
+    frames = _frames(3)
+    path = tmp_path / "export.gif"
+
+    with GifWriter(path, frames[0].shape, scale=3) as writer:
+        for frame in frames:
+            writer.write(frame)
+
+    with Image.open(path) as image:
+        assert image.size == (7, 7)
+        assert image.n_frames == len(frames)
+        gray = np.array(image.convert("L"))
+        assert np.array_equal(gray == 255, downscale(frames[0], 3) == 0)
+
+
+@pytest.mark.parametrize("scale", [1, 4])
+def test_raw_writer(tmp_path: Path, scale: int) -> None:
+    frames = _frames(4)
+    path = tmp_path / "export.raw"
+
+    with open_writer(path, frames[0].shape, ExportFormat.RAW, scale) as writer:
+        assert isinstance(writer, RawWriter)
+        for frame in frames:
+            writer.write(frame)
+
+    pixels = np.fromfile(path, dtype=np.uint8).reshape(len(frames), *writer.shape)
+    for frame, frame_pixels in zip(frames, pixels):
+        counts = downscale(frame, scale)
+        assert np.array_equal(frame_pixels == 255, counts == 0)
+        assert np.array_equal(frame_pixels == 0, counts == scale * scale)
+
+
+def test_background_writer_reports_errors(tmp_path: Path) -> None:
+    writer = BackgroundWriter(RawWriter(tmp_path / "export.raw", (4, 4)))
+    writer.write(np.zeros((5, 5)))
+
+    with pytest.raises(ValueError):
+        writer.close()
+
+
+def test_writer_checks_scale(tmp_path: Path) -> None:
+    with pytest.raises(ValueError):
+        GifWriter(tmp_path / "export.gif", (10, 10), scale=0)
@@ -0,0 +1,120 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from src.conway.engine import sparse
+from src.conway.grid.grid import Grid
+from src.conway.storage.pattern import (
+    load_cells,
+    load_keys,
+    place_pattern,
+    read_header,
+    read_runs,
+)
+
+_GLIDER = np.array([[0, 1, 0], [0, 0, 1], [1, 1, 1]])
+
+
+def _to_rle(array: np.ndarray) -> str:
+    rows = []
+    for row in array:
+        edges = np.flatnonzero(np.diff(row != 0, prepend=False, append=False))
+        runs, previous = [], 0
+        for start, stop in zip(edges[0::2], edges[1::2]):
+            if start > previous:
+                runs.append(f"{start - previous}b")
+            runs.append(f"{stop - start}o")
+            previous = stop
+        rows.append("".join(runs))
+    body = "$".join(rows) + "!"
+    # Lines of RLE files are at most 70 characters long.
+    lines = [body[i : i + 70] for i in range(0, len(body), 70)]
+    return f"#C random\nx = {array.shape[1]}, y = {array.shape[0]}, rule = B3/S23\n" + "\n".join(
+        lines
+    )
+
+
+def _to_plaintext(array: np.ndarray) -> str:
+    return "!Name: random\n" + "\n".join(
+        "".join("O" if cell else "." for cell in row) for row in array
+    )
+
+
+@pytest.fixture(name="glider_rle")
+def fixture_glider_rle(tmp_path: Path) -> Path:
+    path = tmp_path / "glider.rle"
+    path.write_text("#N Glider\nx = 3, y = 3, rule = B3/S23\nbo$2bo$3o!\n")
+    return path
+
+
+def test_read_header(glider_rle: Path, tmp_path: Path) -> None:
+    assert read_header(glider_rle) == (3, 3, "B3/S23")
+
+    path = tmp_path / "glider.cells"
+    path.write_text(_to_plaintext(_GLIDER))
+    assert read_header(path) == (3, 3, None)
+
+
+def test_place_pattern(glider_rle: Path) -> None:
+    grid_array = np.zeros((6, 8), dtype=int)
+    place_pattern(grid_array, glider_rle, (2, 4))
+
+    expected = np.zeros((6, 8), dtype=int)
+    expected[2:5, 4:7] = _GLIDER
+    assert np.array_equal(grid_array, expected)
+
+
+def test_place_pattern_centered(glider_rle: Path) -> None:
+    grid_array = np.zeros((10, 10), dtype=int)
+    place_pattern(grid_array, glider_rle)
+
+    assert np.array_equal(grid_array, Grid(10).grid_init("glider"))
+
+
+def test_place_pattern_out_of_grid(glider_rle: Path) -> None:
+    with pytest.raises(ValueError):
+        place_pattern(np.zeros((5, 5)), glider_rle, (3, 0))
+
+
+@pytest.mark.parametrize("suffix", [".rle", ".cells"])
+@pytest.mark.parametrize("chunk_size", [5, 64, 1 << 18])
+def test_load_large_pattern(tmp_path: Path, suffix: str, chunk_size: int) -> None:
+    array = (np.random.default_rng(0).random((40, 300)) < 0.4).astype(int)
+    array[:, -1] = 0
+    path = tmp_path / f"random{suffix}"
+    path.write_text(_to_rle(array) if suffix == ".rle" else _to_plaintext(array))
+
+    rows, columns = load_cells(path, (5, -3), chunk_size)
+    expected_rows, expected_columns = np.nonzero(array)
+    assert np.array_equal(rows, expected_rows + 5)
+    assert np.array_equal(columns, expected_columns - 3)
+
+    grid_array = np.zeros(array.shape, dtype=int)
+    place_pattern(grid_array, path, (0, 0), chunk_size)
+    assert np.array_equal(grid_array, array)
+
+
+def test_long_runs(tmp_path: Path) -> None:
+    path = tmp_path / "line.rle"
+    path.write_text("x = 1000012, y = 3\n1000000b12o2$3o!")
+
+    runs = list(read_runs(path))
+    assert [len(chunk.rows) for chunk in runs] == [2]
+    assert runs[0].rows.tolist() == [0, 2]
+    assert runs[0].columns.tolist() == [1000000, 0]
+    assert runs[0].lengths.tolist() == [12, 3]
+
+
+def test_load_keys(glider_rle: Path) -> None:
+    keys = load_keys(glider_rle, (-1, -1))
+
+    assert np.array_equal(keys, sparse.from_array(_GLIDER, (-1, -1)))
+
+
+def test_invalid_header(tmp_path: Path) -> None:
+    path = tmp_path / "invalid.rle"
+    path.write_text("bo$2bo$3o!")
+
+    with pytest.raises(ValueError):
+        read_header(path)
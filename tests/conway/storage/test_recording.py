@@ -0,0 +1,69 @@
+import itertools
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from src.conway.engine import vectorized
+from src.conway.grid.grid import Grid
+from src.conway.storage.recording import RecordingReader, RecordingWriter
+
+
+def _record(path: Path, nb_generations: int, keyframe_interval: int) -> list[np.ndarray]:
+    array = Grid(30).grid_init("random")
+    frames = []
+    with RecordingWriter(path, array.shape, keyframe_interval) as writer:
+        for frame in itertools.islice(vectorized.generate(array), nb_generations):
+            writer.write(frame)
+            frames.append(frame.copy())
+    return frames
+
+
+@pytest.mark.parametrize("keyframe_interval", [1, 7, 100])
+def test_seek(tmp_path: Path, keyframe_interval: int) -> None:
+    frames = _record(tmp_path / "run.cwr", 40, keyframe_interval)
+
+    with RecordingReader(tmp_path / "run.cwr") as reader:
+        assert len(reader) == len(frames)
+        assert reader.shape == (30, 30)
+        for generation in [39, 0, 13, 7, 8, 20]:
+            assert np.array_equal(reader.seek(generation), frames[generation])
+        with pytest.raises(IndexError):
+            reader.seek(40)
+
+
+def test_iter(tmp_path: Path) -> None:
+    frames = _record(tmp_path / "run.cwr", 25, 10)
+
+    with RecordingReader(tmp_path / "run.cwr") as reader:
+        for frame, expected in itertools.zip_longest(reader, frames):
+            assert np.array_equal(frame, expected)
+
+
+def test_write_given_changes(tmp_path: Path) -> None:
+    array = np.zeros((4, 4), dtype=int)
+    with RecordingWriter(tmp_path / "run.cwr", array.shape, 10) as writer:
+        writer.write(array)
+        array[1, 2] = 1
+        writer.write(array, births=np.asarray([6]), deaths=np.asarray([], dtype=int))
+
+    with RecordingReader(tmp_path / "run.cwr") as reader:
+        assert np.array_equal(reader.seek(1), array)
+
+
+def test_read_unclosed_recording(tmp_path: Path) -> None:
+    frames = _record(tmp_path / "run.cwr", 30, 8)
+    data = (tmp_path / "run.cwr").read_bytes()
+    # Drop the index, the footer and part of the last record.
+    index_size = 8 * 2 * 4 + 28
+    (tmp_path / "truncated.cwr").write_bytes(data[: -index_size - 3])
+
+    with RecordingReader(tmp_path / "truncated.cwr") as reader:
+        assert len(reader) == 29
+        assert np.array_equal(reader.seek(28), frames[28])
+
+
+def test_not_a_recording(tmp_path: Path) -> None:
+    (tmp_path / "file.cwr").write_bytes(b"0" * 100)
+    with pytest.raises(ValueError):
+        RecordingReader(tmp_path / "file.cwr")
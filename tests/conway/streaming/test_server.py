@@ -0,0 +1,88 @@
+import asyncio
+import io
+import itertools
+
+import numpy as np
+
+from src.conway.engine import vectorized
+from src.conway.grid.grid import Grid
+from src.conway.streaming.protocol import (
+    encode_delta,
+    encode_end,
+    encode_header,
+    encode_keyframe,
+    read_stream,
+    watch,
+)
+from src.conway.streaming.server import DeltaServer, _Viewer
+
+
+def _frames(array: np.ndarray, nb_frames: int) -> list[np.ndarray]:
+    return [frame.copy() for frame in itertools.islice(vectorized.generate(array), nb_frames)]
+
+
+def test_read_stream() -> None:
+    frames = _frames(Grid(20).grid_init("random"), 5)
+    shape = frames[0].shape
+    messages = [encode_header(shape), encode_keyframe(0, frames[0])]
+    for generation in range(1, len(frames)):
+        births = np.flatnonzero((frames[generation] != 0) & (frames[generation - 1] == 0))
+        deaths = np.flatnonzero((frames[generation] == 0) & (frames[generation - 1] != 0))
+        messages.append(encode_delta(generation, shape, births, deaths))
+    messages.append(encode_end(len(frames) - 1))
+
+    received = [
+        (generation, grid.copy())
+        for generation, grid in read_stream(io.BytesIO(b"".join(messages)))
+    ]
+
+    assert [generation for generation, _ in received] == list(range(len(frames)))
+    for (_, grid), frame in zip(received, frames):
+        assert np.array_equal(grid, frame)
+
+
+def test_serve_viewers() -> None:
+    array = Grid(32).grid_init("random")
+    expected = _frames(array.copy(), 21)
+
+    async def serve() -> list[list[tuple[int, np.ndarray]]]:
+        server = DeltaServer(array.shape, max_pending=1000)
+        await server.start()
+        loop = asyncio.get_running_loop()
+        viewers = [
+            loop.run_in_executor(
+                None,
+                lambda: [
+                    (generation, grid.copy())
+                    for generation, grid in watch("127.0.0.1", server.port)
+                ],
+            )
+            for _ in range(2)
+        ]
+        await server.wait_for_viewers(2)
+        nb_frames = await server.run(vectorized.generate(array), generations=20)
+        assert nb_frames == 21
+        return await asyncio.gather(*viewers)
+
+    for received in asyncio.run(serve()):
+        assert [generation for generation, _ in received] == list(range(21))
+        for (_, grid), frame in zip(received, expected):
+            assert np.array_equal(grid, frame)
+
+
+def test_slow_viewer_skips_to_latest_generation() -> None:
+    frames = _frames(Grid(20).grid_init("random"), 6)
+    server = DeltaServer(frames[0].shape, max_pending=2)
+    viewer = _Viewer(None)
+    server._viewers.add(viewer)
+
+    for generation, frame in enumerate(frames[:3]):
+        server.broadcast(generation, frame, b"delta")
+    # The viewer got a keyframe, then a delta, then fell behind and skipped to generation 2.
+    assert viewer.nb_skips == 1
+    assert viewer.queue.qsize() == 1
+    keyframe = viewer.queue.get_nowait()
+    assert keyframe == encode_keyframe(2, frames[2])
+
+    server.broadcast(3, frames[3], b"delta")
+    assert viewer.queue.get_nowait() == b"delta"
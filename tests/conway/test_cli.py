@@ -0,0 +1,145 @@
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+import pytest
+import typer
+from typer.testing import CliRunner
+
+from src.conway.cli import _run_generations, simulate
+from src.conway.engine.cycle import CycleDetector
+from src.conway.engine.engine import Engine
+from src.conway.engine.vectorized import next_generation
+from src.conway.grid.grid import Grid
+
+
+def _expected_grid(array: np.ndarray, generations: int) -> np.ndarray:
+    for _ in range(generations):
+        array = next_generation(array)
+    return array
+
+
+@pytest.mark.parametrize("engine", [Engine.SETS, Engine.NUMPY, Engine.BITPACKED])
+@pytest.mark.parametrize("generations", [0, 7, 50])
+def test_run_generations(engine: Engine, generations: int) -> None:
+    array = Grid(20).grid_init("random")
+    expected = _expected_grid(array, generations)
+
+    results = list(_run_generations(array, generations, 1, engine))
+    assert [generation for generation, _ in results] == [generations]
+    assert np.array_equal(results[-1][1], expected)
+
+
+@pytest.mark.parametrize("generations", [1000, 1001, 1002])
+def test_run_generations_fast_forwards_cycles(generations: int) -> None:
+    array = Grid(20).grid_init("pulsar")
+    expected = _expected_grid(array, generations % 3)
+
+    detector = CycleDetector(array.shape)
+    results = list(_run_generations(array, generations, 1, Engine.NUMPY, cycle_detector=detector))
+    assert detector.cycle is not None
+    assert results[-1][0] == generations
+    assert np.array_equal(results[-1][1], expected)
+
+
+def test_run_generations_snapshots() -> None:
+    array = Grid(20).grid_init("glider")
+    results = list(_run_generations(array.copy(), 10, 1, Engine.NUMPY, snapshot_every=4))
+
+    assert [generation for generation, _ in results] == [0, 4, 8, 10]
+    assert np.array_equal(results[-1][1], _expected_grid(array, 10))
+
+
+def test_run_generations_hashlife() -> None:
+    array = Grid(30).grid_init("penta_decathlon")
+    results = list(_run_generations(array.copy(), 10**6, 1, Engine.HASHLIFE))
+
+    assert np.array_equal(results[-1][1], _expected_grid(array, 10**6 % 15))
+
+
+@pytest.mark.parametrize("engine", [Engine.SETS, Engine.NUMPY])
+def test_simulate_resume(tmp_path: Path, engine: Engine) -> None:
+    app = typer.Typer()
+    app.command()(simulate)
+    runner = CliRunner()
+    options = ["--grid-size", "30", "--engine", engine.value, "--checkpoint-every", "10"]
+
+    np.random.seed(0)
+    result = runner.invoke(
+        app,
+        options
+        + ["--generations", "35", "--checkpoints", str(tmp_path / "full")]
+        + ["--output", str(tmp_path / "full.npy")],
+    )
+    assert result.exit_code == 0, result.output
+
+    np.random.seed(0)
+    interrupted = options + ["--checkpoints", str(tmp_path / "resumed")]
+    result = runner.invoke(app, interrupted + ["--generations", "20"])
+    assert result.exit_code == 0, result.output
+    result = runner.invoke(
+        app,
+        interrupted
+        + ["--generations", "35", "--resume", "--output", str(tmp_path / "resumed.npy")],
+    )
+    assert result.exit_code == 0, result.output
+    assert "Resuming from generation 20" in result.output
+
+    assert np.array_equal(np.load(tmp_path / "full.npy"), np.load(tmp_path / "resumed.npy"))
+
+
+def test_simulate_resume_between_checkpoints(tmp_path: Path) -> None:
+    app = typer.Typer()
+    app.command()(simulate)
+    runner = CliRunner()
+    options = ["--grid-size", "30", "--engine", "numpy", "--checkpoint-every", "10"]
+    options += ["--checkpoints", str(tmp_path / "checkpoints"), "--snapshot-every", "10"]
+    options += ["--snapshots", str(tmp_path / "snapshots")]
+
+    result = runner.invoke(app, options + ["--generations", "15"])
+    assert result.exit_code == 0, result.output
+    for path in (tmp_path / "snapshots").iterdir():
+        path.unlink()
+    result = runner.invoke(app, options + ["--generations", "45", "--resume"])
+    assert result.exit_code == 0, result.output
+    assert "Resuming from generation 15" in result.output
+
+    # Pending checkpoints may be replaced by newer ones, so that the checkpoint the simulation was
+    # resumed from may be kept; the snapshots show when the frames were taken.
+    checkpoints = sorted(path.name for path in (tmp_path / "checkpoints").iterdir())
+    generations = (15, 20, 30, 40)
+    assert checkpoints[0] in [f"checkpoint_{generation:012d}.npz" for generation in generations]
+    assert checkpoints[1] == "checkpoint_000000000045.npz"
+    snapshots = sorted(path.name for path in (tmp_path / "snapshots").iterdir())
+    assert snapshots == [f"generation_{generation:08d}.npy" for generation in (20, 30, 40)]
+
+
+@pytest.mark.parametrize("engine, jobs", [(Engine.AUTO, 1), (Engine.SHARED, None)])
+def test_run_generations_autotuned(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, engine: Engine, jobs: Optional[int]
+) -> None:
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    array = Grid(20).grid_init("random")
+    expected = _expected_grid(array, 10)
+
+    results = list(_run_generations(array, 10, jobs, engine))
+
+    assert np.array_equal(results[-1][1], expected)
+    if engine == Engine.AUTO:
+        assert (tmp_path / "conway" / "autotune.json").exists()
+
+
+@pytest.mark.parametrize("engine", [Engine.SETS, Engine.NUMPY, Engine.HASHLIFE])
+def test_run_generations_statistics(engine: Engine) -> None:
+    array = Grid(20).grid_init("glider")
+    statistics = []
+    list(_run_generations(array, 8, 1, engine, on_statistics=statistics.append))
+
+    assert [record.generation for record in statistics] == list(range(9))
+    assert all(record.population == 5 for record in statistics)
+    assert statistics[4].bounding_box == (
+        statistics[0].bounding_box[0] + 1,
+        statistics[0].bounding_box[1] + 1,
+        statistics[0].bounding_box[2] + 1,
+        statistics[0].bounding_box[3] + 1,
+    )
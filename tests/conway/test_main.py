@@ -0,0 +1,27 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+_SRC = Path(__file__).parents[2] / "src"
+
+
+@pytest.mark.parametrize("module", ["conway.__main__", "conway.cli"])
+def test_import_is_lazy(module: str) -> None:
+    code = (
+        f"import sys; import {module}; "
+        "print(' '.join(name for name in sys.modules if name.startswith(("
+        "'matplotlib', 'PIL', 'asyncio', 'multiprocessing.pool', 'multiprocessing.shared_memory', "
+        "'conway.display', 'conway.streaming', 'conway.engine.shared', 'conway.engine.hashlife'))))"
+    )
+    process = subprocess.run(
+        [sys.executable, "-c", code],
+        check=True,
+        capture_output=True,
+        text=True,
+        env={**os.environ, "PYTHONPATH": str(_SRC)},
+    )
+
+    assert process.stdout.split() == []